@@ -4,16 +4,61 @@ from .client import Gemini
 from .async_client import GeminiClient
 from .src.modules.openrouter.client import OpenRouter
 from .src.modules.openrouter.async_client import AsyncOpenRouter
+from .src.modules.openrouter.stream import (
+    ChatCompletionStream,
+    AsyncChatCompletionStream,
+)
+from .src.modules.openrouter.router import ModelRouter, AsyncModelRouter
+from .src.modules.failover import (
+    FailoverClient,
+    Provider,
+    ProviderOutput,
+    GeminiProvider,
+    OpenRouterProvider,
+)
 
-from .src.model.image import GeminiImage
+from .src.model.image import GeminiImage, SavedImage, SessionRef
+from .src.model.image_store import ImageStore
+from .src.model.prefetch import ImagePrefetcher
+from .src.model.stream import AsyncContentStream
 from .src.model.output import GeminiCandidate, GeminiModelOutput
+from .src.model.conversation import Conversation
+from .src.model.code import CodeBlock, CodeBlockScanner, extract_code_blocks
+from .src.model.fast import FastGeminiImage, FastGeminiCandidate, FastGeminiModelOutput
 from .src.model.parser.base import BaesParser
+from .src.model.parser.frames import ResponseFrames
+from .src.model.parser.stream import StreamDecoder
+from .src.model.parser.chain import ParserChain
 from .src.model.parser.custom_parser import ParseMethod1, ParseMethod2
 from .src.model.parser.response_parser import ResponseParser
 
 from .src.misc.constants import URLs, Headers
 from .src.misc.decorator import retry, log_method, time_execution, handle_errors
-from .src.misc.exceptions import PackageError, GeminiAPIError, TimeoutError
+from .src.misc.hooks import Hooks, HookEvent, PhaseTimer, HOOK_EVENTS
+from .src.misc.metrics import enable_metrics, render_metrics, start_metrics_server
+from .src.misc.profiler import RequestProfiler
+from .src.misc.hedge import HedgePolicy
+from .src.misc.deadline import Deadline
+from .src.misc.transport import (
+    Transport,
+    TransportResponse,
+    RequestsTransport,
+    HttpxTransport,
+)
+from .src.misc.proxy import ProxyPool
+from .src.misc.stop import (
+    StopCondition,
+    MaxWords,
+    MaxSentences,
+    StopPattern,
+    StopWhen,
+)
+from .src.misc.exceptions import (
+    PackageError,
+    GeminiAPIError,
+    TimeoutError,
+    ProviderError,
+)
 from .src.misc.utils import (
     extract_code,
     upload_image,
@@ -6,10 +6,40 @@ import httpx
 import random
 import string
 import urllib
+import time
 import asyncio
 import requests
-from typing import Optional
-
+import hashlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, List, Optional, Pattern, Tuple, Union
+
+from gemini.client import Gemini
+from gemini.src.misc.hooks import Hooks
+from gemini.src.misc.hedge import HedgePolicy
+from gemini.src.misc.deadline import Deadline
+from gemini.src.misc.stop import StopCondition
+from gemini.src.misc.exceptions import TimeoutError
+from gemini.src.misc.metrics import (
+    REQUESTS,
+    GENERATE_LATENCY,
+    TIME_TO_FIRST_BYTE,
+    NONCE_REFRESHES,
+    RATE_LIMITS,
+    status_label,
+)
+from gemini.src.misc.utils import load_cookies
+from gemini.src.model.output import GeminiModelOutput
+from gemini.src.model.image import (
+    GeminiImage,
+    SavedImage,
+    DEFAULT_IMAGE_CONCURRENCY,
+    bind_session,
+    google_cookies,
+)
+from gemini.src.model.image_store import ImageStore
+from gemini.src.model.prefetch import ImagePrefetcher
+from gemini.src.model.stream import AsyncContentStream
+from gemini.src.model.parser.response_parser import ResponseParser
 from gemini.src.misc.constants import (
     URLs,
     Headers,
@@ -33,6 +63,10 @@ class GeminiClient:
         verify (bool): Flag for SSL certificate verification in HTTP requests.
         latency (int): Latency consideration in operations, defaulting to 10.
         update_cookie_list (List[str]): List of cookies to be updated, if any.
+        hooks (Hooks): Instrumentation callbacks for request_start, first_byte, last_byte, parse_done and error events.
+        account (Optional[str]): The account label attached to hook events.
+        hedge (Optional[HedgePolicy]): The policy for hedged requests, or None to send each request once.
+        hedge_client (Optional[GeminiClient]): The client on the same account that sends hedged requests.
     """
 
     __slots__ = [
@@ -50,6 +84,21 @@ class GeminiClient:
         "running",
         "auto_close",
         "close_delay",
+        "cookie_fp",
+        "close_task",
+        "parser",
+        "hooks",
+        "account",
+        "image_store",
+        "prefetcher",
+        "hedge",
+        "hedge_client",
+        "_nonce",
+        "_sid",
+        "_cid",
+        "_rid",
+        "_rcid",
+        "__weakref__",
     ]
 
     def __init__(
@@ -62,6 +111,12 @@ class GeminiClient:
         proxies: Optional[dict] = {},
         auto_close=True,
         close_delay: int = 60,
+        hooks: Optional[Hooks] = None,
+        account: Optional[str] = None,
+        image_store: Optional[ImageStore] = None,
+        prefetch_images: Union[bool, ImagePrefetcher] = False,
+        hedge: Optional[HedgePolicy] = None,
+        hedge_client: Optional["GeminiClient"] = None,
     ):
         """
         Initializes a new GeminiClient instance with various configurations for HTTP requests and service interactions.
@@ -81,9 +136,21 @@ class GeminiClient:
             update_cookie_list (List[str], optional): A list of cookies that should be updated during session management. Defaults to an empty list.
             auto_close (bool): If True, the session will automatically close after a specified delay. Defaults to True.
             close_delay (int): The delay in seconds before the session is automatically closed, applicable if auto_close is True. Defaults to 60.
+            hooks (Hooks, optional): Instrumentation callbacks. A new registry is created when None.
+            account (str, optional): The account label for hook events. Defaults to a short hash of the __Secure-1PSID cookie.
+            image_store (ImageStore, optional): A content-addressed image cache for `save_images`. Defaults to None.
+            prefetch_images (Union[bool, ImagePrefetcher]): Starts downloading generated images as soon as a response is parsed, so `save_images` does not wait on the network. Defaults to False.
+            hedge (HedgePolicy, optional): Sends a duplicate request when the first byte is later than the policy's latency percentile, within its hedge budget. Defaults to None.
+            hedge_client (GeminiClient, optional): The client for hedged requests, such as one with its own proxy or connection pool. It must be on the same account, since the hedged request continues this client's conversation. Defaults to this client, which sends the duplicate over another pooled connection.
+
+        Raises:
+            ValueError: If `hedge_client` is on another account.
         """
         self._nonce = None
         self._sid = None
+        self._cid = None  # conversation id
+        self._rid = None  # response id
+        self._rcid = None  # response candidate id
         self._reqid = int("".join(random.choices(string.digits, k=4)))
         self.running = False
         self.cookies = cookies
@@ -94,14 +161,34 @@ class GeminiClient:
         self.session = session
         self.auto_close = auto_close
         self.close_delay = close_delay
+        self.close_task = None
+        self.parser = ResponseParser(cookies=self.cookies)
+        self.hooks = hooks or Hooks()
+        self.image_store = image_store
+        self.prefetcher = (
+            prefetch_images
+            if isinstance(prefetch_images, ImagePrefetcher)
+            else ImagePrefetcher(store=image_store) if prefetch_images else None
+        )
+        self.hedge = hedge
+        self.hedge_client = hedge_client
+        psid = (self.cookies or {}).get("__Secure-1PSID")
+        self.account = account or (
+            psid and hashlib.sha1(psid.encode()).hexdigest()[:8] or None
+        )
+        if hedge_client is not None and hedge_client.account != self.account:
+            raise ValueError(
+                "hedge_client must be on the same account, since a conversation belongs to one account."
+            )
 
     async def async_init(
         self,
     ) -> None:
         """
-        Initializes the asynchronous session with optional auto-close functionality.
+        Initializes the asynchronous session with optional auto-close functionality, and retrieves the SNlM0e nonce value.
         """
         self.session = await self._create_async_session()
+        await self._async_set_sid_and_nonce()
 
     async def _create_async_session(self) -> httpx.AsyncClient:
         """
@@ -114,43 +201,28 @@ class GeminiClient:
             ValueError: If the 'cookies' dictionary is empty, indicating that there's insufficient information to properly set up a new session.
         """
         if self.session is not None:
+            self.running = True
             return self.session
-        if self.cookies:
-            self.session.cookies.update(self.cookies)
-        elif self.cookie_fp:
+        if not self.cookies and self.cookie_fp:
             self._load_cookies_from_file(self.cookie_fp)
-        elif not self.cookies:
+        if not self.cookies:
             raise ValueError("Failed to set session. 'cookies' dictionary is empty.")
 
         self.session = httpx.AsyncClient(
             headers=Headers.MAIN,
-            cookies=self.cookies,
+            cookies=google_cookies(self.cookies),
             timeout=self.timeout,
-            auto_close=self.auto_close,
-            close_delay=self.close_delay,
+            follow_redirects=True,
         )
-
-        if hasattr(self, "session"):
-            self.running = True
-        else:
-            self.running = False
+        self.running = True
 
         return self.session
 
     def _load_cookies_from_file(self, file_path: str) -> None:
-        """Loads cookies from a file and updates the session."""
+        """Loads cookies from a file into the client's cookies."""
         try:
-            if file_path.endswith(".json"):
-                with open(file_path, "r") as file:
-                    cookies = json.load(file)
-            else:
-                with open(file_path, "r") as file:
-                    content = file.read()
-                    try:
-                        cookies = eval(content)
-                    except NameError:
-                        cookies = json.loads(content.replace("'", '"'))
-            self.session.cookies.update(cookies)
+            self.cookies = load_cookies(file_path)
+            self.parser.cookies = self.cookies
         except Exception as e:
             print(f"Error loading cookie file: {e}")
 
@@ -173,9 +245,8 @@ class GeminiClient:
         Prints the current session's cookies. Indicates if the session is uninitialized.
         """
         if self.session:
-            cookies_str = "\n".join(
-                f"{key}: {value}" for key, value in self.session.cookies.items()
-            )
+            cookies = {cookie.name: cookie.value for cookie in self.session.cookies.jar}
+            cookies_str = "\n".join(f"{key}: {value}" for key, value in cookies.items())
             print("Session Cookies:\n" + cookies_str)
         else:
             print("Session not initialized.")
@@ -227,6 +298,23 @@ class GeminiClient:
             print("Using existing cookies.")
             return  # Exit the method if cookies already exist
 
+    async def _async_set_sid_and_nonce(self) -> None:
+        """
+        Retrieves the session ID (SID) and a SNlM0e nonce value from the application page with the async session.
+        """
+        NONCE_REFRESHES.inc()
+        response = await self.session.get(f"{URLs.BASE_URL.value}/app")
+        response.raise_for_status()
+
+        sid_match, nonce_match = self.extract_sid_nonce(response.text)
+        if not nonce_match:
+            raise ValueError(
+                "Failed to parse SNlM0e nonce value from the response.\nRefresh the Gemini web page or access Gemini in a new incognito browser to resend cookies."
+            )
+        self._nonce = nonce_match.group(1)
+        if sid_match:
+            self._sid = sid_match.group(1)
+
     @staticmethod
     def extract_sid_nonce(response_text):
         sid_match = re.search(r'"FdrFJe":"([\d-]+)"', response_text)
@@ -271,12 +359,19 @@ class GeminiClient:
                 "Failed to get cookies. Set 'cookies' argument or 'auto_cookies' as True."
             )
 
-    def _construct_params(self, sid: str) -> str:
+    def _next_reqid(self) -> int:
+        """Allocates the request id of a new request. It runs without awaiting, so concurrent calls on the event loop never share an id."""
+        reqid = self._reqid
+        self._reqid += 100000
+        return reqid
+
+    def _construct_params(self, sid: Optional[str], reqid: Optional[int] = None) -> str:
         """
         Constructs URL-encoded parameters for a request.
 
         Parameters:
             sid (str): The session ID.
+            reqid (Optional[int]): The request id. Defaults to the client's current one.
 
         Returns:
             str: URL-encoded string of parameters.
@@ -285,19 +380,22 @@ class GeminiClient:
             {
                 "bl": URLs.BOT_SERVER.value,
                 "hl": os.environ.get("GEMINI_LANGUAGE", "en"),
-                "_reqid": self.get_reqid(),
+                "_reqid": self._reqid if reqid is None else reqid,
                 "rt": "c",
-                "f.sid": sid,
+                **({"f.sid": sid} if sid else {}),
             }
         )
 
-    def _construct_payload(self, prompt: str, nonce: str) -> str:
+    def _construct_payload(
+        self, prompt: str, nonce: str, conversation: Optional[Tuple] = None
+    ) -> str:
         """
         Constructs URL-encoded payload for a request.
 
         Parameters:
             prompt (str): The user prompt to send.
             nonce (str): A one-time token used for request verification.
+            conversation (Optional[Tuple]): The conversation, response and candidate ids to continue. Defaults to the client's own.
 
         Returns:
             str: URL-encoded string of the payload.
@@ -305,39 +403,328 @@ class GeminiClient:
         return urllib.parse.urlencode(
             {
                 "at": nonce,
-                "f.req": json.dumps([None, json.dumps([[prompt], None, None])]),
+                "f.req": json.dumps(
+                    [
+                        None,
+                        json.dumps(
+                            [
+                                [prompt],
+                                None,
+                                list(
+                                    conversation or (self._cid, self._rid, self._rcid)
+                                ),
+                            ]
+                        ),
+                    ]
+                ),
             }
         )
 
+    @asynccontextmanager
+    async def _stream_prompt(
+        self,
+        prompt: str,
+        first_byte: Optional[asyncio.Event] = None,
+        deadline: Optional[Deadline] = None,
+        reqid: Optional[int] = None,
+        conversation: Optional[Tuple] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Opens a StreamGenerate request and yields the response before its body is read.
+
+        Leaving the block closes the stream, also on cancellation, so an unfinished response never holds a pooled connection. Errors raised while reading the body inside the block are reported like request errors.
+        """
+        if reqid is None:
+            reqid = self._next_reqid()
+        if self.session is None:
+            await self.async_init()
+        status_code = None
+        self.hooks.emit("request_start", reqid=reqid, account=self.account)
+        try:
+            data = self._construct_payload(prompt, self._nonce, conversation)
+            params = self._construct_params(self._sid, reqid)
+            sent = time.perf_counter()
+            async with self.session.stream(
+                "POST",
+                URLs.POST_ENDPOINT.value,
+                data=data,
+                params=params,
+                timeout=(
+                    deadline.httpx_timeout("StreamGenerate")
+                    if deadline
+                    else self.timeout
+                ),
+            ) as response:
+                if first_byte is not None:
+                    first_byte.set()
+                self.hooks.emit("first_byte", reqid=reqid, account=self.account)
+                TIME_TO_FIRST_BYTE.observe(time.perf_counter() - sent)
+                status_code = response.status_code
+                if status_code == 429:
+                    RATE_LIMITS.inc(account=self.account)
+                response.raise_for_status()
+                yield response
+        except Exception as e:
+            if deadline is not None and isinstance(e, httpx.TimeoutException):
+                error = deadline.expired("StreamGenerate")
+                self.hooks.emit("error", reqid=reqid, account=self.account, error=error)
+                raise error from e
+            self.hooks.emit("error", reqid=reqid, account=self.account, error=e)
+            raise
+        except (asyncio.CancelledError, GeneratorExit) as e:
+            # Ends the request in the hooks when a hedge loses or a stream is aborted.
+            self.hooks.emit("error", reqid=reqid, account=self.account, error=e)
+            raise
+        finally:
+            REQUESTS.inc(status=status_label(status_code))
+
     async def post_prompt(
         self,
         prompt: str,
-    ) -> dict:
-        data = self._construct_payload(prompt)
-        params = self._construct_params()
+        first_byte: Optional[asyncio.Event] = None,
+        deadline: Optional[Deadline] = None,
+        reqid: Optional[int] = None,
+        conversation: Optional[Tuple] = None,
+    ) -> httpx.Response:
+        """
+        Sends a prompt to the StreamGenerate endpoint and reads the whole response.
 
-        response = await self.session.post(
-            URLs.POST_ENDPOINT.value,
-            data=data,
-            params=params,
-            timeout=self.timeout,
-        )
-        self._reqid += 100000
+        Cancelling the call closes the HTTP stream immediately.
 
+        Args:
+            prompt (str): The user prompt to send.
+            first_byte (asyncio.Event, optional): Set once the response headers arrive.
+            deadline (Deadline, optional): Bounds the connect and first-byte timeouts by the remaining budget.
+            reqid (int, optional): The request id. A new one is allocated if None.
+            conversation (tuple, optional): The conversation, response and candidate ids to continue. Defaults to the client's own.
+
+        Returns:
+            httpx.Response: The response, with its body already read.
+        """
+        if reqid is None:
+            reqid = self._next_reqid()
+        async with self._stream_prompt(
+            prompt, first_byte, deadline, reqid, conversation
+        ) as response:
+            content = await response.aread()
+        self.hooks.emit(
+            "last_byte", reqid=reqid, account=self.account, nbytes=len(content)
+        )
         return response
 
-    async def generate_content(self, prompt: str) -> dict:
+    def stream_content(
+        self,
+        prompt: str,
+        deadline: Union[None, float, Deadline] = None,
+        stop: Union[None, StopCondition, str, Pattern, Callable[[str], bool]] = None,
+    ) -> AsyncContentStream:
+        """
+        Generates content based on the prompt, streaming the text as it arrives.
+
+        Args:
+            prompt (str): The user prompt to send.
+            deadline (Union[None, float, Deadline], optional): A total budget in seconds, or a `Deadline`, for the whole stream. Defaults to None.
+            stop (optional): Ends the generation early: `MaxWords(n)`, `MaxSentences(n)`, a regex that is cut off with everything after it, or a callable that returns True for the text so far. The HTTP stream is aborted as soon as the condition is met and `output` holds the truncated text. Defaults to None.
+
+        Returns:
+            AsyncContentStream: An async iterator of text deltas. Its `output` holds the parsed model output once the stream completes. Request and parse errors are raised while iterating.
+        """
+        return AsyncContentStream(
+            self, prompt, Deadline.coerce(deadline), StopCondition.coerce(stop)
+        )
+
+    async def _hedged_post_prompt(
+        self,
+        prompt: str,
+        deadline: Optional[Deadline] = None,
+        reqid: Optional[int] = None,
+    ) -> Tuple[httpx.Response, "GeminiClient", int]:
+        """
+        Sends a prompt like `post_prompt`, duplicating it through `hedge_client` when the first byte is late.
+
+        The first successful response wins and the other request is cancelled. If one request fails, the other is awaited. The hedge gets a request id of its own and continues this client's conversation.
+
+        Returns:
+            Tuple[httpx.Response, GeminiClient, int]: The winning response, the client that sent it and its request id, so the parse is reported with the request.
+        """
+        policy = self.hedge
+        started = time.perf_counter()
+        first_byte = asyncio.Event()
+        if reqid is None:
+            reqid = self._next_reqid()
+        conversation = (self._cid, self._rid, self._rcid)
+        primary = asyncio.ensure_future(
+            self.post_prompt(prompt, first_byte, deadline, reqid)
+        )
+        running = {primary}
+        senders = {primary: (self, reqid)}
+        waiter = asyncio.ensure_future(first_byte.wait())
+        waiter.add_done_callback(
+            lambda task: task.cancelled()
+            or policy.record(time.perf_counter() - started)
+        )
+        delay = policy.admit()
         try:
-            response = await self.post_prompt(prompt)
-            response_data = await response.json()
-            response_status_code = response.status
+            if delay is not None:
+                await asyncio.wait(
+                    {primary, waiter},
+                    timeout=delay,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not first_byte.is_set() and not primary.done():
+                    policy.hedged()
+                    peer = self.hedge_client or self
+                    hedge_reqid = peer._next_reqid()
+                    hedge = asyncio.ensure_future(
+                        peer.post_prompt(
+                            prompt,
+                            deadline=deadline,
+                            reqid=hedge_reqid,
+                            conversation=conversation,
+                        )
+                    )
+                    running.add(hedge)
+                    senders[hedge] = (peer, hedge_reqid)
+
+            error = None
+            while running:
+                done, running = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return (task.result(), *senders[task])
+                    error = task.exception()
+            raise error
+        finally:
+            waiter.cancel()
+            for task in running:
+                task.cancel()
+            # Wait for the losers to close their streams before returning.
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def generate_content(
+        self, prompt: str, deadline: Union[None, float, Deadline] = None
+    ) -> Optional[GeminiModelOutput]:
+        """
+        Generates content based on the prompt.
+
+        Args:
+            prompt (str): The user prompt to send.
+            deadline (Union[None, float, Deadline], optional): A total budget in seconds, or a `Deadline` with connect and first-byte budgets, shared by session setup, nonce refresh, the request and parsing. Defaults to None.
 
-            if response_status_code != 200:
-                raise ValueError(f"Response status: {response_status_code}")
-            return response_data
+        Returns:
+            Optional[GeminiModelOutput]: The parsed model output, or None if the request or parsing fails.
+
+        Raises:
+            TimeoutError: If the deadline expires.
+        """
+        deadline = Deadline.coerce(deadline)
+        reqid = self._next_reqid()
+        sender = self
+        started = time.perf_counter()
+        try:
+            if self.hedge is None:
+                send = self.post_prompt(prompt, deadline=deadline, reqid=reqid)
+            else:
+                send = self._hedged_post_prompt(prompt, deadline, reqid)
+            response = await (
+                deadline.run(send, "StreamGenerate") if deadline else send
+            )
+            if self.hedge is not None:
+                response, sender, reqid = response
+        except TimeoutError:
+            raise
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            return None
+        try:
+            return self._parse_output(response.text, reqid, started, deadline, sender)
+        except TimeoutError:
+            raise
         except Exception as e:
             print(f"An error occurred: {e}")
-            return {}
+            return None
+
+    def _parse_output(
+        self,
+        response_text: str,
+        reqid: int,
+        started: float,
+        deadline: Optional[Deadline] = None,
+        sender: Optional["GeminiClient"] = None,
+    ) -> GeminiModelOutput:
+        """Parses a complete response into the model output, reporting the outcome to the hooks of the client that sent the request and binding its images to that client."""
+        sender = sender or self
+        try:
+            if deadline is not None:
+                deadline.check("parse")
+            parsed_response = self.parser.parse(response_text)
+            output = self._create_model_output(parsed_response, sender=sender)
+        except Exception as e:
+            sender.hooks.emit("error", reqid=reqid, account=sender.account, error=e)
+            raise
+        sender.hooks.emit("parse_done", reqid=reqid, account=sender.account)
+        GENERATE_LATENCY.observe(time.perf_counter() - started)
+        if self.prefetcher is not None and output.generated_images:
+            self.prefetcher.prefetch(output.generated_images, sender.session)
+        return output
+
+    def _create_model_output(
+        self,
+        parsed_response: dict,
+        advance: bool = True,
+        sender: Optional["GeminiClient"] = None,
+    ) -> GeminiModelOutput:
+        """
+        Creates model output from parsed response and keeps the conversation ids.
+
+        Args:
+            parsed_response (dict): The parsed response data.
+            advance (bool): Whether the conversation continues from this response. False for the output of an aborted stream. Defaults to True.
+            sender (Optional[GeminiClient]): The client that sent the request, whose session downloads the generated images. Defaults to this client.
+
+        Returns:
+            GeminiModelOutput: The model output containing metadata, candidates, and response dictionary.
+        """
+        candidates = Gemini.collect_candidates(parsed_response)
+        bind_session(candidates, sender or self)
+        metadata = parsed_response.get("metadata", [])
+        if advance and len(metadata) > 1:
+            self._cid, self._rid = metadata[0], metadata[1]
+        return GeminiModelOutput(
+            metadata=metadata,
+            candidates=candidates,
+            response_dict=parsed_response,
+        )
+
+    async def save_images(
+        self,
+        images: List[GeminiImage],
+        save_path: str = "cached",
+        max_concurrency: int = DEFAULT_IMAGE_CONCURRENCY,
+    ) -> List[SavedImage]:
+        """
+        Saves images of a response over the client's session, reusing its connections and cookies, through `image_store` if set.
+
+        Args:
+            images (List[GeminiImage]): The web or generated images of a response.
+            save_path (str): The directory path to save the images. Defaults to "cached".
+            max_concurrency (int): The maximum number of simultaneous downloads. Defaults to 8.
+
+        Returns:
+            List[SavedImage]: One entry per image with the saved path or the error.
+        """
+        if self.session is None:
+            await self.async_init()
+        return await GeminiImage.save(
+            images,
+            save_path,
+            client=self.session,
+            max_concurrency=max_concurrency,
+            store=self.image_store,
+            prefetcher=self.prefetcher,
+        )
 
     async def request_share(
         self,
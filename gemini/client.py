@@ -3,16 +3,55 @@ import re
 import json
 import random
 import string
+import hashlib
 import inspect
+import time
+import threading
+import httpx
 import requests
 import urllib.parse
+from pathlib import Path
+from contextlib import nullcontext
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 from typing import Optional, Tuple, Dict, Union, List
 
+from .src.misc.hooks import Hooks
+from .src.misc.profiler import RequestProfiler
+from .src.misc.deadline import Deadline
+from .src.misc.proxy import ProxyPool
+from .src.misc.metrics import (
+    REQUESTS,
+    GENERATE_LATENCY,
+    TIME_TO_FIRST_BYTE,
+    NONCE_REFRESHES,
+    RATE_LIMITS,
+    status_label,
+)
 from .src.misc.utils import upload_image, load_cookies
+from .src.misc.transport import (
+    Transport,
+    TransportResponse,
+    RequestsTransport,
+    HttpxTransport,
+)
 from .src.model.parser.response_parser import ResponseParser
 from .src.model.output import GeminiCandidate, GeminiModelOutput
+from .src.model.conversation import Conversation
+from .src.model.image import (
+    GeminiImage,
+    SavedImage,
+    DEFAULT_IMAGE_CONCURRENCY,
+    create_image_client_sync,
+    bind_session,
+)
+from .src.model.image_store import ImageStore
+from .src.model.prefetch import ImagePrefetcher
+from .src.model.fast import FastGeminiCandidate, FastGeminiModelOutput
+from .src.model.parser.base import BaesParser
 from .src.model.parser.custom_parser import ParseMethod1, ParseMethod2
+from .src.model.parser.chain import ParserChain
+from .src.model.parser.frames import ResponseFrames
 from .src.misc.exceptions import (
     GeminiAPIError,
     PackageError,
@@ -26,10 +65,18 @@ from .src.misc.constants import (
     Headers,
     TARGET_COOKIES,
     WHOLE_COOKIES,
+    GOOGLE_COOKIE_DOMAINS,
     SUPPORTED_BROWSERS,
 )
 
 
+def _image_size(image: Union[bytes, str]) -> int:
+    """Returns the byte size of an image given as bytes or a file path."""
+    if isinstance(image, str):
+        return os.path.getsize(image)
+    return len(image)
+
+
 class Gemini:
     """
     This class facilitates interactions with a web service by managing sessions, cookies, and proxy configurations.
@@ -37,12 +84,20 @@ class Gemini:
     Attributes:
         auto_cookies (bool): If set to True, cookies are managed automatically.
         cookies (dict[str, str]): Stores the cookies used in HTTP requests.
-        proxies (dict[str, str]): Proxy settings for the HTTP requests.
+        proxies (Union[dict[str, str], ProxyPool]): Proxy settings for the HTTP requests, or a pool to pick them from per request.
         timeout (int): Timeout in seconds for HTTP requests.
-        session (requests.Session): The session used for HTTP requests.
+        session (Union[requests.Session, httpx.Client]): The session of `transport`.
+        transport (Transport): The HTTP transport of the nonce fetch, image upload and generation requests.
         base_url (str): The base URL of the web service.
         target_cookies (list): Specific cookies targeted for operations if auto_cookies is enabled.
         verify (bool): If True, the SSL certificate is verified. Defaults to True.
+        fast_models (bool): If True, outputs are built as slotted `FastGeminiModelOutput` objects without pydantic validation.
+        hooks (Hooks): Instrumentation callbacks for request_start, upload_done, first_byte, last_byte, parse_done and error events.
+        account (Optional[str]): The account label attached to hook events.
+        profiler (Optional[RequestProfiler]): Profiles a sampled fraction of generate_content calls, if set.
+        image_store (Optional[ImageStore]): The image cache that `save_images` resolves downloads through, if set.
+        prefetcher (Optional[ImagePrefetcher]): Downloads the generated images of each response in the background, if set.
+        thread_safe (bool): If True, calls without a `conversation` do not share conversation state.
 
     Parameters:
         session (Optional[requests.Session]): An existing session, if any.
@@ -51,7 +106,17 @@ class Gemini:
         auto_cookies (bool): Enables automatic cookie management when True.
         target_cookies (list): List of cookie names to manage if `auto_cookies` is set.
         timeout (int): Request timeout; defaults to 30 seconds.
-        proxies (Optional[dict[str, str]]): Proxy settings, if any.
+        proxies (Optional[Union[dict[str, str], ProxyPool]]): Proxy settings, if any. A `ProxyPool` routes each request by `account` and records the latency and outcome of every proxied request. It requires a transport with per-request proxies, such as the default `RequestsTransport`.
+        fast_models (bool): Skips pydantic validation of parsed outputs when True. Call `to_pydantic()` on the output to get the validated models on demand.
+        hooks (Optional[Hooks]): Instrumentation callbacks, if any. A new registry is created when None.
+        account (Optional[str]): The account label for hook events. Defaults to a short hash of the __Secure-1PSID cookie.
+        profiler (Optional[RequestProfiler]): A sampling profiler for generate_content calls and their parse path, if any.
+        image_store (Optional[ImageStore]): A content-addressed image cache for `save_images`, if any.
+        prefetch_images (Union[bool, ImagePrefetcher]): Starts downloading generated images as soon as a response is parsed, so `save_images` does not wait on the network. True creates a prefetcher that buffers into `image_store` if set, or into memory. Defaults to False.
+        thread_safe (bool): Shares one client across threads. Every call without a `conversation` starts a new conversation instead of continuing the client's. Request ids and nonce refreshes are synchronized in either mode. Defaults to False.
+        pool_connections (int): The number of connection pools of the created session's `HTTPAdapter`. Defaults to 10.
+        pool_maxsize (int): The connections kept per host by the created session. Set it to the number of threads sharing the client. Defaults to 10.
+        transport (Optional[Transport]): An HTTP transport to send requests through, such as an `HttpxTransport` shared with other clients. Takes precedence over `session`. The Gemini cookies are added to its jar for the Google domains only. Defaults to a `RequestsTransport` over `session`.
 
     Raises:
         ConnectionError: If there is a problem with the network connection.
@@ -66,8 +131,18 @@ class Gemini:
         auto_cookies: bool = False,
         target_cookies: List = None,
         timeout: int = 30,
-        proxies: Optional[dict] = None,
+        proxies: Optional[Union[dict, ProxyPool]] = None,
         verify: bool = True,  # Try to use if needed.
+        fast_models: bool = False,
+        hooks: Optional[Hooks] = None,
+        account: Optional[str] = None,
+        profiler: Optional[RequestProfiler] = None,
+        image_store: Optional[ImageStore] = None,
+        prefetch_images: Union[bool, ImagePrefetcher] = False,
+        thread_safe: bool = False,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        transport: Optional[Transport] = None,
     ) -> None:
         """
         Initializes the Gemini object with session, cookies, and other configurations.
@@ -79,16 +154,52 @@ class Gemini:
         self._rid = None  # response id
         self._cid = None  # candidate id
         self._reqid = int("".join(random.choices(string.digits, k=7)))  # request id
+        self._lock = threading.Lock()  # guards _reqid and _request_count
+        self._nonce_lock = threading.Lock()
+        self.thread_safe = thread_safe
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
         self.auto_cookies = auto_cookies
         self.target_cookies = target_cookies
         self.cookie_fp = cookie_fp
         self.cookies = cookies
         self.proxies = proxies or {}
         self.timeout = timeout
-        self.session = session or self._initialize_session()
+        self._cookies_in_jar = session is None or transport is not None
+        if transport is None:
+            transport = RequestsTransport(session or self._initialize_session())
+        else:
+            self._share_cookies(transport.cookies)
+        self.transport = transport
+        self.session = transport.session
+        if isinstance(self.proxies, ProxyPool) and isinstance(
+            transport, HttpxTransport
+        ):
+            print(
+                "HttpxTransport ignores per-request proxies. Configure the proxy on its httpx.Client instead of using a ProxyPool."
+            )
         self.base_url: str = URLs.BASE_URL.value
         self.parser = ResponseParser(cookies=self.cookies)
+        self.custom_parser_chain = ParserChain(
+            [
+                ("ParseMethod1", ParseMethod1().parse_frames),
+                ("ParseMethod2", ParseMethod2().parse_frames),
+            ]
+        )
         self.verify = True  # Default is True
+        self.fast_models = fast_models
+        self.hooks = hooks or Hooks()
+        self.account = account or self._default_account()
+        self.profiler = profiler
+        self.image_store = image_store
+        self.prefetcher = (
+            prefetch_images
+            if isinstance(prefetch_images, ImagePrefetcher)
+            else ImagePrefetcher(store=image_store) if prefetch_images else None
+        )
+        self._image_client = None
+        if session is None:
+            self._set_sid_and_nonce()
 
     @property
     def request_count(self) -> int:
@@ -111,6 +222,13 @@ class Gemini:
     def rcid(self, value: Optional[str]) -> None:
         self._rcid = value
 
+    def _default_account(self) -> Optional[str]:
+        """Returns a short, non-reversible label of the __Secure-1PSID cookie."""
+        psid = (self.cookies or {}).get("__Secure-1PSID")
+        if not psid:
+            return None
+        return hashlib.sha1(psid.encode()).hexdigest()[:8]
+
     def _initialize_session(
         self,
     ) -> requests.Session:
@@ -121,34 +239,63 @@ class Gemini:
             requests.Session: The initialized session.
         """
         session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
         session.headers.update(Headers.MAIN)
-        if self.cookies:
-            session.cookies.update(self.cookies)
-        elif self.cookie_fp:
-            session = self._set_cookies_from_file(session, self.cookie_fp)
-        elif self.auto_cookies == True:
-            self._set_cookies_automatically()
-
-        self._set_sid_and_nonce()
+        self._share_cookies(session.cookies)
 
         return session
 
-    def _set_cookies_from_file(self, session: requests.Session, file_path: str) -> None:
-        """Loads cookies from a file and updates the session."""
+    def _set_cookies_from_file(self, file_path: str) -> None:
+        """Loads cookies from a file."""
         try:
             self.cookies = load_cookies(file_path)
         except Exception as e:
             raise Exception(f"Failed to load cookies from {file_path}: {e}")
 
-        session.cookies.update(self.cookies)
-        return session
+    def _share_cookies(self, jar) -> None:
+        """
+        Loads the cookies if needed and adds them to a `requests` or `httpx` cookie jar.
+
+        The cookies are scoped to the Google domains, so a session or transport that is also used for other hosts, such as OpenRouter, never sends them elsewhere.
+        """
+        if not self.cookies and self.cookie_fp:
+            self._set_cookies_from_file(self.cookie_fp)
+        elif not self.cookies and self.auto_cookies == True:
+            self._set_cookies_automatically()
+        for name, value in (self.cookies or {}).items():
+            for domain in GOOGLE_COOKIE_DOMAINS:
+                jar.set(name, value, domain=domain)
 
-    def _set_sid_and_nonce(self):
+    def _set_sid_and_nonce(self, deadline: Optional[Deadline] = None):
         """
         Retrieves the session ID (SID) and a SNlM0e nonce value from the application page.
+
+        Args:
+            deadline (Optional[Deadline]): The budget of the calling request. Defaults to None, which uses `timeout`.
         """
+        timeout = (
+            deadline.requests_timeout("nonce refresh") if deadline else self.timeout
+        )
         try:
-            response = requests.get(f"{URLs.BASE_URL.value}/app", cookies=self.cookies)
+            NONCE_REFRESHES.inc()
+            proxy = self._choose_proxy()
+            sent = time.perf_counter()
+            try:
+                response = self.transport.request(
+                    "GET",
+                    f"{URLs.BASE_URL.value}/app",
+                    cookies=None if self._cookies_in_jar else self.cookies,
+                    timeout=timeout,
+                    proxies=self._request_proxies(proxy),
+                )
+            except requests.RequestException:
+                self._record_proxy(proxy, sent, error=True)
+                raise
+            self._record_proxy(proxy, sent, response.status_code)
             if response.status_code != 200:
                 raise GeminiAPIError(
                     f"Gemini API Error: Response code {response.status_code}\nDetails:\n{response}\n\nExcessive connections may have temporarily blocked your account/IP, but web UI should remain accessible."
@@ -170,6 +317,10 @@ class Gemini:
                     "Failed to parse SNlM0e nonce value from the response.\nRefresh the Gemini web page or access Gemini in a new incognito browser to resend cookies. \nIf issue continues, export browser cookies, set manually. See auth section 3."
                 )
 
+        except requests.Timeout as e:
+            if deadline is not None:
+                raise deadline.expired("nonce refresh") from e
+            raise ConnectionError(f"Request failed: {e}")
         except requests.RequestException as e:
             raise ConnectionError(f"Request failed: {e}")
         except ValueError as e:
@@ -177,12 +328,63 @@ class Gemini:
         except Exception as e:
             raise RuntimeError(f"An unexpected error occurred: {e}")
 
-    def _construct_params(self, sid: str) -> str:
+    def _choose_proxy(self) -> Optional[str]:
+        """Returns the proxy of the next request if `proxies` is a `ProxyPool`."""
+        if isinstance(self.proxies, ProxyPool):
+            return self.proxies.choose(self.account)
+        return None
+
+    def _request_proxies(self, proxy: Optional[str]) -> dict:
+        """Returns the `requests` proxies mapping of a request."""
+        if proxy is None:
+            return self.proxies
+        return {"http": proxy, "https": proxy}
+
+    def _record_proxy(
+        self,
+        proxy: Optional[str],
+        sent: float,
+        status_code: Optional[int] = None,
+        error: bool = False,
+    ) -> None:
+        """Reports the latency and outcome of a request to the `ProxyPool`, if one was used."""
+        if proxy is None:
+            return
+        if status_code is not None:
+            error = status_code == 429 or status_code >= 500
+        self.proxies.record(proxy, time.perf_counter() - sent, error=error)
+
+    def _next_reqid(self) -> int:
+        """Atomically allocates the request id of a new request."""
+        with self._lock:
+            reqid = self._reqid
+            self._reqid += 100000
+            self._request_count += 1
+        return reqid
+
+    def _conversation_ids(
+        self, conversation: Optional[Conversation] = None
+    ) -> List[Optional[str]]:
+        """Returns the [cid, rid, rcid] triple that a prompt continues."""
+        if conversation is not None:
+            return conversation.ids()
+        if self.thread_safe:
+            return [None, None, None]
+        return [self._cid, self._rid, self._rcid]
+
+    def _refresh_nonce(self, deadline: Optional[Deadline] = None) -> None:
+        """Fetches the nonce if it is missing, once even when threads ask concurrently."""
+        with self._nonce_lock:
+            if self._nonce is None:
+                self._set_sid_and_nonce(deadline)
+
+    def _construct_params(self, sid: str, reqid: Optional[int] = None) -> str:
         """
         Constructs URL-encoded parameters for a request.
 
         Parameters:
             sid (str): The session ID.
+            reqid (Optional[int]): The request id. Defaults to the client's current one.
 
         Returns:
             str: URL-encoded string of parameters.
@@ -191,14 +393,19 @@ class Gemini:
             {
                 "bl": URLs.BOT_SERVER.value,
                 "hl": os.environ.get("GEMINI_LANGUAGE", "en"),
-                "_reqid": self._reqid,
+                "_reqid": self._reqid if reqid is None else reqid,
                 "rt": "c",
                 # "f.sid": sid, # Try to use if needed.
             }
         )
 
     def _construct_payload(
-        self, prompt: str, image: Union[bytes, str], nonce: str
+        self,
+        prompt: str,
+        image: Union[bytes, str],
+        nonce: str,
+        image_url: Optional[str] = None,
+        conversation: Optional[Conversation] = None,
     ) -> str:
         """
         Constructs URL-encoded payload for a request.
@@ -207,10 +414,14 @@ class Gemini:
             prompt (str): The user prompt to send.
             image (Union[bytes, str]): The image data as bytes or file path. Supported formats: webp, jpeg, png.
             nonce (str): A one-time token used for request verification.
+            image_url (Optional[str]): The URL of an image already uploaded with `upload_image`. Takes precedence over `image`.
+            conversation (Optional[Conversation]): The conversation to continue. Defaults to the client's own.
 
         Returns:
             str: URL-encoded string of the payload.
         """
+        if image and not image_url:
+            image_url = upload_image(image, transport=self.transport)
         return urllib.parse.urlencode(
             {
                 "at": nonce,
@@ -219,16 +430,16 @@ class Gemini:
                         None,
                         json.dumps(
                             [
-                                image
+                                image_url
                                 and [
                                     prompt,
                                     int(os.getenv("GEMINI_ULTRA", "0")),
                                     None,
-                                    [[[upload_image(image), 1]]],
+                                    [[[image_url, 1]]],
                                 ]
                                 or [prompt],
                                 None,
-                                [self._cid, self._rid, self._rcid],
+                                self._conversation_ids(conversation),
                             ]
                         ),
                     ]
@@ -237,80 +448,239 @@ class Gemini:
         )
 
     def send_request(
-        self, prompt: str, image: Union[bytes, str] = None
+        self,
+        prompt: str,
+        image: Union[bytes, str] = None,
+        deadline: Optional[Deadline] = None,
+        conversation: Optional[Conversation] = None,
+        reqid: Optional[int] = None,
     ) -> Tuple[str, int]:
-        """Sends a request and returns the response text and status code."""
-        self._request_count += 1
-        params = self._construct_params(self._sid)
-        data = self._construct_payload(prompt, image, self._nonce)
-        response = self.session.post(
-            URLs.POST_ENDPOINT.value,
-            params=params,
-            data=data,
-            timeout=self.timeout,
-            proxies=self.proxies,
-            verify=self.verify,
-        )
-        self._reqid += 100000
-        response.raise_for_status()
+        """
+        Sends a request and returns the response text and status code.
+
+        With a `deadline`, the image upload, a missing nonce and the request share its budget, the response body is read in chunks against it, and running out of budget raises `TimeoutError`.
+        """
+        if reqid is None:
+            reqid = self._next_reqid()
+        status_code = None
+        self.hooks.emit("request_start", reqid=reqid, account=self.account)
+        try:
+            image_url = None
+            if image:
+                image_url = upload_image(
+                    image,
+                    timeout=(
+                        deadline.requests_timeout("upload")
+                        if deadline
+                        else self.timeout
+                    ),
+                    transport=self.transport,
+                )
+                self.hooks.emit(
+                    "upload_done",
+                    reqid=reqid,
+                    account=self.account,
+                    nbytes=_image_size(image),
+                )
+            if self._nonce is None:
+                self._refresh_nonce(deadline)
+            params = self._construct_params(self._sid, reqid)
+            data = self._construct_payload(
+                prompt,
+                None,
+                self._nonce,
+                image_url=image_url,
+                conversation=conversation,
+            )
+            proxy = self._choose_proxy()
+            sent = time.perf_counter()
+            try:
+                response = self.transport.request(
+                    "POST",
+                    URLs.POST_ENDPOINT.value,
+                    params=params,
+                    data=data,
+                    headers=Headers.MAIN,
+                    timeout=(
+                        deadline.requests_timeout("StreamGenerate")
+                        if deadline
+                        else self.timeout
+                    ),
+                    proxies=self._request_proxies(proxy),
+                    verify=self.verify,
+                    stream=True,
+                )
+            except requests.RequestException:
+                self._record_proxy(proxy, sent, error=True)
+                raise
+            self._record_proxy(proxy, sent, response.status_code)
+            self.hooks.emit("first_byte", reqid=reqid, account=self.account)
+            TIME_TO_FIRST_BYTE.observe(time.perf_counter() - sent)
+            status_code = response.status_code
+            if status_code == 429:
+                RATE_LIMITS.inc(account=self.account)
+            response.raise_for_status()
+            if deadline is None:
+                content = response.content
+                text = response.text
+            else:
+                content = self._read_within(response, deadline)
+                text = content.decode(response.encoding or "utf-8", errors="replace")
+            self.hooks.emit(
+                "last_byte", reqid=reqid, account=self.account, nbytes=len(content)
+            )
+        except Exception as e:
+            if deadline is not None and isinstance(e, requests.Timeout):
+                error = deadline.expired("StreamGenerate")
+                self.hooks.emit("error", reqid=reqid, account=self.account, error=error)
+                raise error from e
+            self.hooks.emit("error", reqid=reqid, account=self.account, error=e)
+            raise
+        finally:
+            REQUESTS.inc(status=status_label(status_code))
 
-        return response.text, response.status_code
+        return text, response.status_code
+
+    @staticmethod
+    def _read_within(response: TransportResponse, deadline: Deadline) -> bytes:
+        """Reads a streamed response body, checking the deadline between chunks."""
+        chunks = []
+        try:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                chunks.append(chunk)
+                deadline.check("StreamGenerate")
+        finally:
+            response.close()
+        return b"".join(chunks)
 
     def generate_content(
-        self, prompt: str, image: Union[bytes, str] = None
-    ) -> GeminiModelOutput:
-        """Generates content based on the prompt and returns a GeminiModelOutput object."""
+        self,
+        prompt: str,
+        image: Union[bytes, str] = None,
+        deadline: Union[None, float, Deadline] = None,
+        conversation: Optional[Conversation] = None,
+        reqid: Optional[int] = None,
+    ) -> Union[GeminiModelOutput, FastGeminiModelOutput]:
+        """
+        Generates content based on the prompt and returns a GeminiModelOutput object, or a FastGeminiModelOutput object if `fast_models` is set.
+
+        Args:
+            prompt (str): The user prompt to send.
+            image (Union[bytes, str], optional): The image data as bytes or file path.
+            deadline (Union[None, float, Deadline], optional): A total budget in seconds, or a `Deadline` with connect and first-byte budgets, shared by the upload, request and parsing. Defaults to None.
+            conversation (Conversation, optional): The conversation to continue and advance, instead of the client's own. Use one per thread or user when the client is shared. Defaults to None.
+            reqid (int, optional): A request id allocated with `_next_reqid`, so the caller can match the hook events of this call. A new one is allocated if None.
+
+        Raises:
+            TimeoutError: If the deadline expires. Other failures are reported by the return value as before.
+        """
+        deadline = Deadline.coerce(deadline)
+        if self.profiler is not None:
+            with self.profiler.profile("generate_content"):
+                return self._generate_content(
+                    prompt, image, deadline, conversation, reqid
+                )
+        return self._generate_content(prompt, image, deadline, conversation, reqid)
+
+    def _generate_content(
+        self,
+        prompt: str,
+        image: Union[bytes, str] = None,
+        deadline: Optional[Deadline] = None,
+        conversation: Optional[Conversation] = None,
+        reqid: Optional[int] = None,
+    ) -> Union[GeminiModelOutput, FastGeminiModelOutput]:
+        if reqid is None:
+            reqid = self._next_reqid()
+        response_text = None
+        started = time.perf_counter()
         try:
-            response_text, response_status_code = self.send_request(prompt, image)
+            response_text, response_status_code = self.send_request(
+                prompt, image, deadline, conversation, reqid
+            )
             if response_status_code != 200:
                 print(
                     f"Non-successful response status: {response_status_code}. Check Gemini session status."
                 )
+                self.hooks.emit(
+                    "error",
+                    reqid=reqid,
+                    account=self.account,
+                    error=GeminiAPIError(f"Response status: {response_status_code}"),
+                )
                 return None
-            parser = ResponseParser(cookies=self.cookies)
-            parsed_response = parser.parse(response_text)
-            return self._create_model_output(parsed_response)
+            if deadline is not None:
+                deadline.check("parse")
+            with (
+                self.profiler.trace_allocations("parse")
+                if self.profiler is not None
+                else nullcontext()
+            ):
+                parsed_response = self.parser.parse(response_text)
+                output = self._create_model_output(parsed_response, conversation)
+            self.hooks.emit("parse_done", reqid=reqid, account=self.account)
+            GENERATE_LATENCY.observe(time.perf_counter() - started)
+            if self.prefetcher is not None and output.generated_images:
+                self.prefetcher.prefetch_sync(
+                    output.generated_images, self.image_client
+                )
+            return output
+        except TimeoutError as e:
+            if response_text is not None:
+                self.hooks.emit("error", reqid=reqid, account=self.account, error=e)
+            raise
         except Exception as e:
+            if response_text is not None:  # send_request already reported its errors.
+                self.hooks.emit("error", reqid=reqid, account=self.account, error=e)
             print(
                 f"Failed to generate content due to an error: {e}.\nReturn reponse without parse. If the issue persists, submit it at https://github.com/dsdanielpark/Gemini-API/issues"
             )
             return response_text
 
-    def _create_model_output(self, parsed_response: dict) -> GeminiModelOutput:
+    def _create_model_output(
+        self, parsed_response: dict, conversation: Optional[Conversation] = None
+    ) -> Union[GeminiModelOutput, FastGeminiModelOutput]:
         """
         Creates model output from parsed response.
 
         Args:
             parsed_response (dict): The parsed response data.
+            conversation (Optional[Conversation]): The conversation to advance. Defaults to the client's own, which is left unchanged in thread-safe mode.
 
         Returns:
-            GeminiModelOutput: The model output containing metadata, candidates, and response dictionary.
+            Union[GeminiModelOutput, FastGeminiModelOutput]: The model output containing metadata, candidates, and response dictionary.
         """
-        candidates = self.collect_candidates(parsed_response)
+        candidates = self.collect_candidates(parsed_response, fast=self.fast_models)
+        bind_session(candidates, self)
         metadata = parsed_response.get("metadata", [])
-        try:
+        if conversation is not None:
+            conversation.advance(metadata)
+        elif not self.thread_safe and len(metadata) > 1:
             self._cid = metadata[0]
             self._rid = metadata[1]
             # self._rcid = candidates["candidates"][0]["rcid"]
-        except:
-            pass
-        return GeminiModelOutput(
+        output_cls = FastGeminiModelOutput if self.fast_models else GeminiModelOutput
+        return output_cls(
             metadata=metadata,
             candidates=candidates,
             response_dict=parsed_response,
         )
 
     @staticmethod
-    def collect_candidates(data: dict) -> list:
+    def collect_candidates(data: dict, fast: bool = False) -> list:
         """
         Collects candidate data from parsed response.
 
         Args:
             data: The parsed response data.
+            fast (bool): If True, builds FastGeminiCandidate objects without validation. Defaults to False.
 
         Returns:
-            List: A list of GeminiCandidate objects.
+            List: A list of GeminiCandidate (or FastGeminiCandidate) objects.
         """
+        build = (
+            FastGeminiCandidate.from_dict if fast else lambda d: GeminiCandidate(**d)
+        )
         collected = []
         stack = [data]
 
@@ -319,7 +689,7 @@ class Gemini:
 
             if isinstance(current, dict):
                 if "rcid" in current and "text" in current:
-                    collected.append(GeminiCandidate(**current))
+                    collected.append(build(current))
                 else:
                     stack.extend(current.values())
 
@@ -331,36 +701,107 @@ class Gemini:
     # End of Code. The following codes need improvement or can be additionally used.
 
     def generate_custom_content(self, prompt: str, *custom_parsers) -> str:
-        """Generates content based on the prompt, attempting to parse with ParseMethod1, ParseMethod2, and any additional parsers provided."""
-        response_text, response_status_code = self.send_request(prompt)
-        if response_status_code != 200:
-            raise ValueError(f"Response status: {response_status_code}")
+        """Generates content based on the prompt, attempting to parse with ParseMethod1, ParseMethod2, and any additional parsers provided. The last successful parser is tried first. Plain callables are tried last and are not kept between calls.
 
-        parser1 = ParseMethod1()
-        parser2 = ParseMethod2()
-        parsers = [parser1.parse, parser2.parse]
+        The response is decoded once into `ResponseFrames`, which every parser shares. `BaesParser` classes or instances receive it through `parse_frames`, and plain callables receive it as the raw response text.
+        """
+        reqid = self._next_reqid()
+        response_text, response_status_code = self.send_request(prompt, reqid=reqid)
+        if response_status_code != 200:
+            error = ValueError(f"Response status: {response_status_code}")
+            self.hooks.emit("error", reqid=reqid, account=self.account, error=error)
+            raise error
 
+        names = ["ParseMethod1", "ParseMethod2"]
+        extra = []
         for custom_parser in custom_parsers:
             if inspect.isclass(custom_parser):
-                instance = custom_parser()
-                parsers.append(instance.parse)
+                name = f"{custom_parser.__module__}.{custom_parser.__qualname__}"
+                if name not in self.custom_parser_chain.order:
+                    self.custom_parser_chain.add(name, custom_parser().parse_frames)
+                names.append(name)
+            elif isinstance(custom_parser, BaesParser):
+                parser_type = type(custom_parser)
+                name = f"{parser_type.__module__}.{parser_type.__qualname__}"
+                self.custom_parser_chain.add(name, custom_parser.parse_frames)
+                names.append(name)
             elif callable(custom_parser):
-                parsers.append(custom_parser)
+                # Often a fresh lambda or closure per call, so it is never kept in the chain.
+                name = getattr(custom_parser, "__qualname__", "callable")
+                extra.append((name, custom_parser))
 
-        for parse in parsers:
-            try:
-                return parse(response_text)
-            except Exception as e:
-                continue
-        print("Parsing failed; returning original text. Consider using CustomParser.")
-        return response_text
+        try:
+            output = self.custom_parser_chain.run(
+                ResponseFrames(response_text), names=names, extra=extra
+            )
+            self.hooks.emit("parse_done", reqid=reqid, account=self.account)
+            return output
+        except ValueError as e:
+            self.hooks.emit("error", reqid=reqid, account=self.account, error=e)
+            print(
+                "Parsing failed; returning original text. Consider using CustomParser."
+            )
+            return response_text
+
+    def parser_stats(self) -> Dict[str, Dict]:
+        """
+        Returns the hit rate and latency counters of the parsing strategies.
+
+        Returns:
+            Dict[str, Dict]: The counters of the response body strategies under "response" and of the custom parsers under "custom".
+        """
+        return {
+            "response": self.parser.chain.stats(),
+            "custom": self.custom_parser_chain.stats(),
+        }
+
+    @property
+    def image_client(self) -> httpx.Client:
+        """A pooled HTTP/2 client for image downloads that shares the session's cookie jar, or the client of an `HttpxTransport`."""
+        if isinstance(self.transport, HttpxTransport):
+            return self.transport.client
+        if self._image_client is None:
+            with self._lock:
+                if self._image_client is None:
+                    self._image_client = create_image_client_sync(
+                        cookies=self.session.cookies,
+                        headers={"User-Agent": Headers.MAIN["User-Agent"]},
+                    )
+        return self._image_client
+
+    def save_images(
+        self,
+        images: List[GeminiImage],
+        save_path: str = "cached",
+        max_workers: int = DEFAULT_IMAGE_CONCURRENCY,
+    ) -> List[SavedImage]:
+        """
+        Saves images of a response in parallel over the client's pooled image client and session cookies, through `image_store` if set.
+
+        Args:
+            images (List[GeminiImage]): The web or generated images of a response.
+            save_path (str): The directory path to save the images. Defaults to "cached".
+            max_workers (int): The maximum number of simultaneous downloads. Defaults to 8.
+
+        Returns:
+            List[SavedImage]: One entry per image with the saved path or the error.
+        """
+        return GeminiImage.save_sync(
+            images,
+            save_path,
+            client=self.image_client,
+            max_workers=max_workers,
+            store=self.image_store,
+            prefetcher=self.prefetcher,
+        )
 
     def check_session_cookies(self) -> None:
         """
         Prints the session's cookies. Indicates if the session is uninitialized.
         """
         if self.session:
-            cookies = self.session.cookies.get_dict()
+            jar = self.session.cookies
+            cookies = {cookie.name: cookie.value for cookie in getattr(jar, "jar", jar)}
             cookies_str = "\n".join(f"{key}: {value}" for key, value in cookies.items())
             print(f"Session Cookies:\n{cookies_str}")
         else:
@@ -1,4 +1,16 @@
 from .constants import URLs, Headers
 from .decorator import retry, log_method, time_execution, handle_errors
-from .exceptions import PackageError, GeminiAPIError, TimeoutError
+from .hooks import Hooks, HookEvent, PhaseTimer, HOOK_EVENTS
+from .stats import Histogram, RollingWindow
+from .hedge import HedgePolicy
+from .deadline import Deadline
+from .transport import (
+    Transport,
+    TransportResponse,
+    RequestsTransport,
+    HttpxTransport,
+)
+from .proxy import ProxyPool
+from .stop import StopCondition, MaxWords, MaxSentences, StopPattern, StopWhen
+from .exceptions import PackageError, GeminiAPIError, TimeoutError, ProviderError
 from .utils import extract_code, upload_image, max_token, max_sentence, load_cookies
@@ -34,6 +34,9 @@ TARGET_COOKIES = [
 
 WHOLE_COOKIES = [cookie.name for cookie in CookieNames]
 
+# The domains the Gemini cookies are sent to. Other hosts, such as web image sites, never receive them.
+GOOGLE_COOKIE_DOMAINS = (".google.com", ".googleusercontent.com")
+
 
 class URLs(Enum):
     BASE_URL = "https://gemini.google.com"
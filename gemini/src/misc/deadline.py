@@ -0,0 +1,102 @@
+import time
+import asyncio
+import httpx
+from typing import Awaitable, Optional, Tuple, TypeVar, Union
+from gemini.src.misc.exceptions import TimeoutError
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """
+    A latency budget shared by every step of one `generate_content` call.
+
+    The total budget starts counting when the deadline is created and covers image upload, nonce refresh, `StreamGenerate` and parsing. Each HTTP call gets the smaller of the remaining budget and the connect or first-byte budget as its timeouts. A step that starts with no budget left fails immediately.
+
+    Attributes:
+        total (float): The seconds the whole call may take.
+        connect (Optional[float]): The seconds each connection attempt may take. Defaults to the remaining budget.
+        first_byte (Optional[float]): The seconds each response may take to start, and the longest pause between its chunks. Defaults to the remaining budget.
+
+    Example:
+        >>> gemini.generate_content("Hello", deadline=Deadline(10, connect=2, first_byte=5))
+    """
+
+    def __init__(
+        self,
+        total: float,
+        connect: Optional[float] = None,
+        first_byte: Optional[float] = None,
+    ) -> None:
+        self.total = total
+        self.connect = connect
+        self.first_byte = first_byte
+        self.expires = time.monotonic() + total
+
+    @classmethod
+    def coerce(cls, value: Union[None, float, "Deadline"]) -> Optional["Deadline"]:
+        """Returns a deadline for a number of seconds, or the deadline itself."""
+        if value is None or isinstance(value, Deadline):
+            return value
+        return cls(value)
+
+    def remaining(self) -> float:
+        """Returns the seconds left, or 0 once expired."""
+        return max(self.expires - time.monotonic(), 0.0)
+
+    def expired(self, phase: str) -> TimeoutError:
+        """Returns the error for a phase that ran out of budget."""
+        return TimeoutError(f"The {self.total}s deadline expired during {phase}.")
+
+    def check(self, phase: str) -> float:
+        """
+        Returns the remaining budget before starting a phase.
+
+        Args:
+            phase (str): The phase name used in the error message, e.g. "upload".
+
+        Returns:
+            float: The seconds left.
+
+        Raises:
+            TimeoutError: If no budget is left.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.expired(phase)
+        return remaining
+
+    def requests_timeout(self, phase: str) -> Tuple[float, float]:
+        """Returns the (connect, read) timeout of a `requests` call for a phase."""
+        remaining = self.check(phase)
+        return (
+            min(self.connect or remaining, remaining),
+            min(self.first_byte or remaining, remaining),
+        )
+
+    def httpx_timeout(self, phase: str) -> httpx.Timeout:
+        """Returns the timeout of an `httpx` call for a phase."""
+        remaining = self.check(phase)
+        return httpx.Timeout(
+            remaining,
+            connect=min(self.connect or remaining, remaining),
+            read=min(self.first_byte or remaining, remaining),
+        )
+
+    async def run(self, awaitable: Awaitable[T], phase: str) -> T:
+        """
+        Awaits a phase, cancelling it when the deadline expires.
+
+        Raises:
+            TimeoutError: If the deadline expires first.
+        """
+        try:
+            remaining = self.check(phase)
+        except TimeoutError:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError:
+            raise self.expired(phase) from None
@@ -90,3 +90,26 @@ class ContentGenerationException(Exception):
     """
 
     pass
+
+
+class ProviderError(Exception):
+    """
+    Exception raised when a provider behind `FailoverClient` fails to generate content.
+
+    Attributes:
+        kind (str): The failure class: "timeout", "rate_limit", "auth", "server", "connection", "parse" or "other".
+        provider (str): The name of the provider that failed.
+        cause (Optional[BaseException]): The underlying exception, if any.
+
+    Example:
+        try:
+            output = failover_client.generate_content("Hello")
+        except ProviderError as e:
+            print(f"{e.provider} failed with {e.kind}.")
+    """
+
+    def __init__(self, kind: str, provider: str, cause: BaseException = None):
+        self.kind = kind
+        self.provider = provider
+        self.cause = cause
+        super().__init__(f"{provider} failed ({kind}): {cause}")
@@ -0,0 +1,76 @@
+from typing import Dict, Optional
+from gemini.src.misc.stats import RollingWindow
+
+
+class HedgePolicy:
+    """
+    Decides when `GeminiClient` sends a duplicate request to cut tail latency.
+
+    The first-byte latencies of recent requests are kept in a rolling window. A request that has not received its first byte by the `percentile` of that window is sent again, and the first response wins. Hedging is skipped while the hedged requests would exceed `budget` of all requests, so the extra load stays bounded.
+
+    Attributes:
+        percentile (float): The first-byte latency percentile after which a request is hedged. Defaults to 95.
+        budget (float): The maximum fraction of requests that may be hedged. Defaults to 0.05.
+        window (int): The number of recent first-byte latencies kept. Defaults to 100.
+        min_samples (int): The latencies needed before hedging starts. Defaults to 20.
+        min_delay (float): The lower bound of the hedge delay in seconds. Defaults to 0.05.
+
+    Example:
+        >>> client = GeminiClient(cookies=cookies, hedge=HedgePolicy(percentile=95, budget=0.05), hedge_client=GeminiClient(cookies=cookies))
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        window: int = 100,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+    ) -> None:
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.first_byte = RollingWindow(window)
+        self.requests = 0
+        self.hedges = 0
+
+    def delay(self) -> Optional[float]:
+        """Returns the seconds to wait for a first byte before hedging, or None if uncalibrated."""
+        if len(self.first_byte) < self.min_samples:
+            return None
+        return max(self.first_byte.percentile(self.percentile), self.min_delay)
+
+    def admit(self) -> Optional[float]:
+        """
+        Counts a request and returns its hedge delay.
+
+        Returns:
+            Optional[float]: The hedge delay, or None if the request may not be hedged because the policy is uncalibrated or the budget is spent.
+        """
+        self.requests += 1
+        if self.hedges + 1 > self.budget * self.requests:
+            return None
+        return self.delay()
+
+    def record(self, seconds: float) -> None:
+        """Records the first-byte latency of a request that was not cut short by hedging."""
+        self.first_byte.add(seconds)
+
+    def hedged(self) -> None:
+        """Counts a hedged request."""
+        self.hedges += 1
+
+    def stats(self) -> Dict:
+        """
+        Returns the hedging statistics.
+
+        Returns:
+            Dict: The request and hedge counts, the hedge rate and the current hedge delay in seconds.
+        """
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_rate": self.hedges / self.requests if self.requests else 0.0,
+            "delay": self.delay(),
+        }
@@ -0,0 +1,198 @@
+import time
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from gemini.src.misc.stats import Histogram
+
+HOOK_EVENTS = (
+    "request_start",
+    "upload_done",
+    "first_byte",
+    "last_byte",
+    "parse_done",
+    "error",
+)
+
+
+class HookEvent(NamedTuple):
+    """
+    An instrumentation event emitted by the clients.
+
+    Attributes:
+        name (str): One of `HOOK_EVENTS`.
+        timestamp_ns (int): The `time.perf_counter_ns()` value when the event occurred.
+        reqid (Optional[int]): The `_reqid` of the request.
+        account (Optional[str]): The account label of the client.
+        nbytes (int): The bytes uploaded (upload_done) or received (last_byte). 0 otherwise.
+        error (Optional[BaseException]): The raised exception for "error" events.
+    """
+
+    name: str
+    timestamp_ns: int
+    reqid: Optional[int] = None
+    account: Optional[str] = None
+    nbytes: int = 0
+    error: Optional[BaseException] = None
+
+
+class Hooks:
+    """
+    A registry of instrumentation callbacks keyed by event name.
+
+    Emitting an event without listeners is a single dictionary lookup, so the hooks cost nothing unless used.
+
+    Methods:
+        on(event, callback): Registers a callback for an event, or for every event with "*".
+        off(event, callback): Removes a callback.
+        emit(event, **fields): Calls the callbacks of an event with a `HookEvent`.
+    """
+
+    def __init__(self) -> None:
+        self._callbacks: Dict[str, List[Callable[[HookEvent], Any]]] = {}
+
+    def on(self, event: str, callback: Callable[[HookEvent], Any]) -> None:
+        """
+        Registers a callback.
+
+        Args:
+            event (str): The event name from `HOOK_EVENTS`, or "*" for every event.
+            callback (Callable[[HookEvent], Any]): The function called with each event.
+
+        Raises:
+            ValueError: If the event name is unknown.
+        """
+        events = HOOK_EVENTS if event == "*" else (event,)
+        for name in events:
+            if name not in HOOK_EVENTS:
+                raise ValueError(
+                    f"Unknown hook event '{name}'. Choose from {HOOK_EVENTS}."
+                )
+            # Copy on write so that emit never sees a list being mutated.
+            self._callbacks[name] = [*self._callbacks.get(name, []), callback]
+
+    def off(self, event: str, callback: Callable[[HookEvent], Any]) -> None:
+        """Removes a callback registered with `on`."""
+        events = HOOK_EVENTS if event == "*" else (event,)
+        for name in events:
+            callbacks = [cb for cb in self._callbacks.get(name, []) if cb != callback]
+            if callbacks:
+                self._callbacks[name] = callbacks
+            else:
+                self._callbacks.pop(name, None)
+
+    def __bool__(self) -> bool:
+        return bool(self._callbacks)
+
+    def emit(self, event: str, **fields) -> None:
+        """
+        Calls the callbacks of an event. Exceptions raised by callbacks are printed and ignored.
+
+        Args:
+            event (str): The event name.
+            **fields: The `HookEvent` fields other than name and timestamp.
+        """
+        callbacks = self._callbacks.get(event)
+        if not callbacks:
+            return
+        hook_event = HookEvent(event, time.perf_counter_ns(), **fields)
+        for callback in callbacks:
+            try:
+                callback(hook_event)
+            except Exception as e:
+                print(f"Hook callback for '{event}' failed: {e}")
+
+
+class PhaseTimer:
+    """
+    Aggregates hook events into per-phase latency histograms.
+
+    The phases of a request are:
+        upload: request_start to upload_done (image prompts only).
+        server: request_start or upload_done to first_byte.
+        transfer: first_byte to last_byte.
+        parse: last_byte to parse_done.
+        total: request_start to parse_done.
+
+    Every request ends with a parse_done or error event. An error event for a cancelled request, such as the losing request of a hedge or an aborted stream, ends it without counting as an error. At most `max_pending` unfinished requests are tracked; the oldest are dropped beyond that.
+
+    Example:
+        >>> timer = PhaseTimer()
+        >>> timer.attach(client.hooks)
+        >>> client.generate_content("Hello")
+        >>> timer.report()["server"]["p95"]
+    """
+
+    PHASES = ("upload", "server", "transfer", "parse", "total")
+
+    def __init__(
+        self, buckets: Optional[List[float]] = None, max_pending: int = 10000
+    ) -> None:
+        self.histograms = {phase: Histogram(buckets) for phase in self.PHASES}
+        self.errors = 0
+        self.max_pending = max_pending
+        self._pending: Dict[Any, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, hooks: Hooks) -> "PhaseTimer":
+        """Registers the timer on a client's hooks and returns it."""
+        hooks.on("*", self)
+        return self
+
+    def detach(self, hooks: Hooks) -> None:
+        """Removes the timer from a client's hooks."""
+        hooks.off("*", self)
+
+    def _observe(self, phase: str, start_ns: int, end_ns: int) -> None:
+        self.histograms[phase].observe((end_ns - start_ns) / 1e6)
+
+    def __call__(self, event: HookEvent) -> None:
+        key = (event.account, event.reqid)
+        with self._lock:
+            if event.name == "request_start":
+                self._pending[key] = {"request_start": event.timestamp_ns}
+                while len(self._pending) > self.max_pending:
+                    del self._pending[next(iter(self._pending))]
+                return
+            marks = self._pending.get(key)
+            if marks is None:
+                return
+            if event.name == "error":
+                if not isinstance(event.error, (asyncio.CancelledError, GeneratorExit)):
+                    self.errors += 1
+                del self._pending[key]
+                return
+            marks[event.name] = event.timestamp_ns
+            if event.name != "parse_done":
+                return
+            del self._pending[key]
+
+        start = marks["request_start"]
+        if "upload_done" in marks:
+            self._observe("upload", start, marks["upload_done"])
+        if "first_byte" in marks:
+            sent = marks.get("upload_done", start)
+            self._observe("server", sent, marks["first_byte"])
+            if "last_byte" in marks:
+                self._observe("transfer", marks["first_byte"], marks["last_byte"])
+        if "last_byte" in marks:
+            self._observe("parse", marks["last_byte"], marks["parse_done"])
+        self._observe("total", start, marks["parse_done"])
+
+    def report(self) -> Dict[str, Dict]:
+        """
+        Returns the histogram snapshot of every phase in milliseconds.
+
+        Returns:
+            Dict[str, Dict]: Phase names mapped to count, mean, p50, p95, p99 and bucket counts.
+        """
+        report = {phase: hist.snapshot() for phase, hist in self.histograms.items()}
+        report["errors"] = self.errors
+        return report
+
+    def print_report(self) -> None:
+        """Prints a one-line summary of every phase."""
+        for phase, hist in self.histograms.items():
+            print(
+                f"{phase:<9} n={hist.count:<6} mean={hist.mean:8.1f}ms p50<={hist.percentile(50)}ms p95<={hist.percentile(95)}ms p99<={hist.percentile(99)}ms"
+            )
+        print(f"errors    n={self.errors}")
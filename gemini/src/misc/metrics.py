@@ -0,0 +1,239 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from gemini.src.misc.stats import Histogram as _Histogram
+
+# Bucket upper bounds in seconds.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """
+    Holds the library metrics and renders them in the Prometheus text format.
+
+    Metrics are disabled by default. Until `enable` is called, every `inc` and `observe` returns immediately.
+
+    Attributes:
+        enabled (bool): Whether the metrics record observations.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._metrics: List["_Metric"] = []
+
+    def register(self, metric: "_Metric") -> "_Metric":
+        self._metrics.append(metric)
+        return metric
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        return "".join(metric.render() for metric in self._metrics)
+
+    def reset(self) -> None:
+        """Clears every recorded sample."""
+        for metric in self._metrics:
+            metric.reset()
+
+
+REGISTRY = MetricsRegistry()
+
+
+class _Metric:
+    type = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.registry = registry
+        self._lock = threading.Lock()
+        self.reset()
+        registry.register(self)
+
+    def reset(self) -> None:
+        self._values: Dict[Tuple[Tuple[str, str], ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"Metric '{self.name}' expects labels {self.labelnames}, got {tuple(labels)}."
+            )
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def _header(self) -> str:
+        return (
+            f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.type}\n"
+        )
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter, optionally split by labels."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> str:
+        lines = [self._header()]
+        for key, value in list(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}\n")
+        return "".join(lines)
+
+
+class Histogram(_Metric):
+    """A bucketed histogram, optionally split by labels."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        registry: MetricsRegistry = REGISTRY,
+    ) -> None:
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels) -> None:
+        if not self.registry.enabled:
+            return
+        key = self._key(labels)
+        histogram = self._values.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._values.setdefault(key, _Histogram(self.buckets))
+        histogram.observe(value)
+
+    def render(self) -> str:
+        lines = [self._header()]
+        for key, histogram in list(self._values.items()):
+            bounds = [*histogram.buckets, float("inf")]
+            for bound, count in zip(bounds, histogram.cumulative()):
+                labels = _format_labels(key + (("le", _format_value(bound)),))
+                lines.append(f"{self.name}_bucket{labels} {count}\n")
+            labels = _format_labels(key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(histogram.total)}\n")
+            lines.append(f"{self.name}_count{labels} {histogram.count}\n")
+        return "".join(lines)
+
+
+REQUESTS = Counter(
+    "gemini_requests_total", "StreamGenerate requests by HTTP status.", ("status",)
+)
+GENERATE_LATENCY = Histogram(
+    "gemini_generate_content_seconds", "Latency of generate_content calls."
+)
+TIME_TO_FIRST_BYTE = Histogram(
+    "gemini_time_to_first_byte_seconds",
+    "Time from sending a StreamGenerate request to receiving its response headers.",
+)
+PARSE_FAILURES = Counter(
+    "gemini_parse_failures_total",
+    "Failed parse attempts by parser chain and strategy.",
+    ("chain", "strategy"),
+)
+UPLOAD_BYTES = Counter("gemini_upload_bytes_total", "Bytes uploaded by upload_image.")
+IMAGE_CACHE_REQUESTS = Counter(
+    "gemini_image_cache_requests_total",
+    "Image cache lookups by result (hit or miss).",
+    ("result",),
+)
+NONCE_REFRESHES = Counter(
+    "gemini_nonce_refreshes_total", "SNlM0e nonce retrievals from the app page."
+)
+RATE_LIMITS = Counter(
+    "gemini_rate_limit_events_total",
+    "Responses with HTTP status 429 by account.",
+    ("account",),
+)
+
+
+def enable_metrics() -> None:
+    """Starts recording the library metrics."""
+    REGISTRY.enable()
+
+
+def render_metrics() -> str:
+    """
+    Returns the library metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: The exposition text, suitable as the body of a /metrics response.
+    """
+    return REGISTRY.render()
+
+
+def start_metrics_server(
+    port: int = 9464, addr: str = "127.0.0.1"
+) -> ThreadingHTTPServer:
+    """
+    Enables the metrics and serves them over HTTP from a daemon thread.
+
+    Args:
+        port (int): The port to listen on. Defaults to 9464.
+        addr (str): The address to bind. Defaults to "127.0.0.1".
+
+    Returns:
+        ThreadingHTTPServer: The running server. Call `shutdown()` to stop it.
+    """
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = render_metrics().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    enable_metrics()
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def status_label(status_code: Optional[int]) -> str:
+    """Returns the status label of a request, "error" when no response was received."""
+    return str(status_code) if status_code else "error"
@@ -0,0 +1,173 @@
+import os
+import sys
+import datetime
+import random
+import itertools
+import cProfile
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+PROFILER_MODES = ("cprofile", "stack")
+
+# cProfile and tracemalloc are process-wide, so at most one call is sampled at a time.
+_ACTIVE_SAMPLE = threading.Lock()
+
+
+class RequestProfiler:
+    """
+    Profiles a random fraction of requests and writes one report per sample.
+
+    Modes:
+        cprofile: Deterministic profiling with cProfile. Writes a `.pstats` file, readable with `pstats` or snakeviz.
+        stack: Samples the calling thread's stack every `interval` seconds from a background thread. Writes a `.collapsed` file in the folded format used by flamegraph.pl and speedscope.
+
+    With `trace_memory`, the parse path of a sampled request also writes a `.alloc.txt` file with the top allocation sites from tracemalloc.
+
+    Only one call in the process is sampled at a time, across all profilers. A call drawn for sampling while another is being profiled, for example by a client shared across threads, runs unprofiled.
+
+    Attributes:
+        sample_rate (float): The fraction of calls to profile, between 0 and 1.
+        output_dir (str): The directory where reports are written.
+        mode (str): One of "cprofile" or "stack".
+        trace_memory (bool): Whether to trace allocations of the parse path of sampled calls.
+        interval (float): The stack sampling interval in seconds, for the "stack" mode.
+        top (int): The number of allocation sites in each allocation report.
+    """
+
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        output_dir: str = "profiles",
+        mode: str = "cprofile",
+        trace_memory: bool = True,
+        interval: float = 0.001,
+        top: int = 25,
+    ) -> None:
+        if mode not in PROFILER_MODES:
+            raise ValueError(
+                f"Unknown profiler mode '{mode}'. Choose from {PROFILER_MODES}."
+            )
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1.")
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.mode = mode
+        self.trace_memory = trace_memory
+        self.interval = interval
+        self.top = top
+        self._local = threading.local()
+        self._samples = itertools.count(1)
+
+    def _report_path(self, name: str, extension: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+        return os.path.join(
+            self.output_dir, f"{name}_{stamp}_{self._local.sample}{extension}"
+        )
+
+    @property
+    def sampling(self) -> bool:
+        """Whether the current thread is inside a sampled call."""
+        return getattr(self._local, "sample", None) is not None
+
+    @contextmanager
+    def profile(self, name: str = "generate_content") -> Iterator[bool]:
+        """
+        Profiles the enclosed block with probability `sample_rate`, unless another call is being profiled.
+
+        Args:
+            name (str): The prefix of the report file names.
+
+        Yields:
+            bool: Whether this call is sampled.
+        """
+        if self.sampling or random.random() >= self.sample_rate:
+            yield False
+            return
+        if not _ACTIVE_SAMPLE.acquire(blocking=False):
+            yield False
+            return
+
+        self._local.sample = next(self._samples)
+        try:
+            if self.mode == "cprofile":
+                with self._cprofile(name):
+                    yield True
+            else:
+                with self._stack_sampler(name):
+                    yield True
+        finally:
+            self._local.sample = None
+            _ACTIVE_SAMPLE.release()
+
+    @contextmanager
+    def _cprofile(self, name: str) -> Iterator[None]:
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(self._report_path(name, ".pstats"))
+
+    @contextmanager
+    def _stack_sampler(self, name: str) -> Iterator[None]:
+        target = threading.get_ident()
+        stacks = Counter()
+        done = threading.Event()
+
+        def sample() -> None:
+            while not done.wait(self.interval):
+                frame = sys._current_frames().get(target)
+                names = []
+                while frame is not None:
+                    code = frame.f_code
+                    names.append(
+                        f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                if names:
+                    stacks[";".join(reversed(names))] += 1
+
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        try:
+            yield
+        finally:
+            done.set()
+            sampler.join()
+            with open(self._report_path(name, ".collapsed"), "w") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+
+    @contextmanager
+    def trace_allocations(self, name: str = "parse") -> Iterator[None]:
+        """
+        Traces the allocations of the enclosed block when the current call is sampled.
+
+        Args:
+            name (str): The prefix of the report file name.
+        """
+        if not (self.trace_memory and self.sampling):
+            yield
+            return
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        try:
+            yield
+        finally:
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            if started:
+                tracemalloc.stop()
+            stats = after.compare_to(before, "lineno")
+            with open(self._report_path(name, ".alloc.txt"), "w") as f:
+                f.write(f"traced current={current} B peak={peak} B\n")
+                for stat in stats[: self.top]:
+                    f.write(f"{stat}\n")
@@ -0,0 +1,199 @@
+import time
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence
+from gemini.src.misc.stats import RollingWindow
+
+
+class _ProxyState:
+    """The health record of one proxy in a `ProxyPool`."""
+
+    __slots__ = (
+        "url",
+        "latency",
+        "outcomes",
+        "requests",
+        "errors",
+        "failures",
+        "successes",
+        "ejections",
+        "ejected_until",
+    )
+
+    def __init__(self, url: str, window: int) -> None:
+        self.url = url
+        self.latency = RollingWindow(window)
+        self.outcomes = RollingWindow(window)  # 1.0 for an error, 0.0 for a success
+        self.requests = 0
+        self.errors = 0
+        self.failures = 0  # consecutive errors
+        self.successes = 0  # consecutive successes
+        self.ejections = 0  # the backoff level
+        self.ejected_until = 0.0
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.mean
+
+    @property
+    def score(self) -> float:
+        """The expected seconds per successful request; lower is better."""
+        error_rate = self.error_rate
+        if error_rate >= 1.0:
+            return float("inf")
+        return self.latency.mean / (1.0 - error_rate)
+
+
+class ProxyPool:
+    """
+    Routes requests over a pool of proxies by account, health and recent latency.
+
+    Each account is routed to the same proxy with rendezvous hashing, so it keeps one egress IP while that proxy is healthy. When a proxy is ejected, only the accounts routed to it move, each to its next choice, and they return once the proxy is readmitted. Requests without an account go to the proxy with the lowest score, the mean latency divided by the success rate.
+
+    A proxy is ejected after `max_failures` consecutive errors, or when its error rate over the window exceeds `max_error_rate` after `min_samples` requests. It is readmitted after a backoff that starts at `backoff` seconds and doubles with every ejection up to `max_backoff`, and its window is cleared. The backoff resets after `min_samples` consecutive successes. If every proxy is ejected, the one readmitted first is used.
+
+    Pass the pool as `Gemini(proxies=ProxyPool([...]))`. The client picks a proxy per request by its `account` and records the latency and outcome.
+
+    Attributes:
+        window (int): The number of recent requests scored per proxy. Defaults to 50.
+        max_error_rate (float): The error rate over the window that ejects a proxy. Defaults to 0.5.
+        min_samples (int): The requests needed before the error rate is judged. Defaults to 10.
+        max_failures (int): The consecutive errors that eject a proxy. Defaults to 3.
+        backoff (float): The seconds of the first ejection. Defaults to 30.
+        max_backoff (float): The upper bound of the ejection backoff in seconds. Defaults to 600.
+
+    Example:
+        >>> pool = ProxyPool(["http://10.0.0.1:3128", "http://10.0.0.2:3128"])
+        >>> GeminiClient = Gemini(cookies=cookies, proxies=pool)
+        >>> pool.stats()
+    """
+
+    def __init__(
+        self,
+        proxies: Sequence[str],
+        window: int = 50,
+        max_error_rate: float = 0.5,
+        min_samples: int = 10,
+        max_failures: int = 3,
+        backoff: float = 30.0,
+        max_backoff: float = 600.0,
+    ) -> None:
+        if not proxies:
+            raise ValueError("ProxyPool requires at least one proxy.")
+        self.window = window
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.max_failures = max_failures
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._states: Dict[str, _ProxyState] = {
+            url: _ProxyState(url, window) for url in dict.fromkeys(proxies)
+        }
+        self._lock = threading.Lock()
+
+    @property
+    def proxies(self) -> List[str]:
+        return list(self._states)
+
+    @staticmethod
+    def _weight(key: str, url: str) -> int:
+        digest = hashlib.blake2b(f"{key}\0{url}".encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def _available(self, now: float) -> List[_ProxyState]:
+        states = list(self._states.values())
+        for state in states:
+            if state.ejected_until and state.ejected_until <= now:
+                self._readmit(state)
+        available = [state for state in states if not state.ejected_until]
+        return available or [min(states, key=lambda state: state.ejected_until)]
+
+    def _readmit(self, state: _ProxyState) -> None:
+        state.ejected_until = 0.0
+        state.failures = 0
+        state.successes = 0
+        state.latency = RollingWindow(self.window)
+        state.outcomes = RollingWindow(self.window)
+
+    def choose(self, account: Optional[str] = None) -> str:
+        """
+        Returns the proxy for a request.
+
+        Args:
+            account (Optional[str]): The account that sends the request. Defaults to None, which picks the proxy with the best score.
+
+        Returns:
+            str: The proxy URL.
+        """
+        with self._lock:
+            available = self._available(time.monotonic())
+            if account is None:
+                return min(available, key=lambda state: state.score).url
+            return max(
+                available, key=lambda state: self._weight(account, state.url)
+            ).url
+
+    def proxies_for(self, account: Optional[str] = None) -> Dict[str, str]:
+        """Returns the `requests` proxies mapping of `choose(account)`."""
+        url = self.choose(account)
+        return {"http": url, "https": url}
+
+    def record(self, proxy: str, seconds: float, error: bool = False) -> None:
+        """
+        Records the outcome of a request sent through a proxy.
+
+        Args:
+            proxy (str): The proxy URL returned by `choose`.
+            seconds (float): The latency of the request.
+            error (bool): Whether the request failed in a way the proxy may be to blame for, such as a network error, a timeout, a 429 or a 5xx response. Defaults to False.
+        """
+        with self._lock:
+            state = self._states.get(proxy)
+            if state is None or state.ejected_until:
+                return
+            state.requests += 1
+            state.outcomes.add(1.0 if error else 0.0)
+            if error:
+                state.errors += 1
+                state.failures += 1
+                state.successes = 0
+            else:
+                state.latency.add(seconds)
+                state.failures = 0
+                state.successes += 1
+                if state.successes >= self.min_samples:
+                    state.ejections = 0
+            if state.failures >= self.max_failures or (
+                len(state.outcomes) >= self.min_samples
+                and state.error_rate > self.max_error_rate
+            ):
+                self._eject(state)
+
+    def _eject(self, state: _ProxyState) -> None:
+        backoff = min(self.backoff * 2**state.ejections, self.max_backoff)
+        state.ejections += 1
+        state.ejected_until = time.monotonic() + backoff
+        print(f"Ejected proxy {state.url} for {backoff:g}s.")
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Returns the health of every proxy.
+
+        Returns:
+            Dict[str, Dict]: Per proxy URL, the request and error counts, the error rate and latency percentiles over the window, the score, and the seconds left of an ejection.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return {
+                url: {
+                    "requests": state.requests,
+                    "errors": state.errors,
+                    "error_rate": state.error_rate,
+                    "latency_p50": state.latency.percentile(50),
+                    "latency_p95": state.latency.percentile(95),
+                    "score": state.score,
+                    "ejections": state.ejections,
+                    "ejected_for": max(state.ejected_until - now, 0.0),
+                }
+                for url, state in self._states.items()
+            }
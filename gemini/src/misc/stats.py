@@ -0,0 +1,146 @@
+import math
+import time
+import bisect
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+# Bucket upper bounds in milliseconds.
+DEFAULT_BUCKETS_MS = (
+    1,
+    2.5,
+    5,
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    60000,
+)
+
+
+class Histogram:
+    """
+    A cumulative bucketed histogram with a thread-safe `observe`.
+
+    Attributes:
+        buckets (Sequence[float]): The upper bounds of the buckets, in ascending order. An implicit +Inf bucket follows.
+        count (int): The number of observations.
+        total (float): The sum of the observations.
+    """
+
+    def __init__(self, buckets: Optional[Sequence[float]] = None) -> None:
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS_MS)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Records a single observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def cumulative(self) -> List[int]:
+        """Returns the cumulative count of each bucket, ending with the +Inf bucket."""
+        result, running = [], 0
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimates a percentile as the upper bound of the bucket that contains it.
+
+        Args:
+            q (float): The percentile in the range [0, 100].
+
+        Returns:
+            float: The estimated value, or +Inf if it falls into the last bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        for bound, running in zip(self.buckets, self.cumulative()):
+            if running >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict:
+        """Returns the count, mean, estimated percentiles and bucket counts."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": dict(zip([*self.buckets, float("inf")], self.counts)),
+        }
+
+
+class RollingWindow:
+    """
+    A thread-safe window over the most recent observations, optionally bounded by age.
+
+    Attributes:
+        size (int): The maximum number of observations kept.
+        max_age (Optional[float]): The seconds an observation is kept, or None to keep it until displaced.
+    """
+
+    def __init__(self, size: int = 100, max_age: Optional[float] = None) -> None:
+        self.size = size
+        self.max_age = max_age
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, value: float) -> None:
+        """Records an observation."""
+        with self._lock:
+            self._samples.append((time.monotonic(), value))
+
+    def values(self) -> List[float]:
+        """Returns the observations in the window, oldest first."""
+        with self._lock:
+            if self.max_age is not None:
+                cutoff = time.monotonic() - self.max_age
+                while self._samples and self._samples[0][0] < cutoff:
+                    self._samples.popleft()
+            return [value for _, value in self._samples]
+
+    def __len__(self) -> int:
+        return len(self.values())
+
+    @property
+    def mean(self) -> float:
+        values = self.values()
+        return sum(values) / len(values) if values else 0.0
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Returns the nearest-rank percentile of the window.
+
+        Args:
+            q (float): The percentile in the range [0, 100].
+
+        Returns:
+            Optional[float]: The percentile, or None if the window is empty.
+        """
+        values = sorted(self.values())
+        if not values:
+            return None
+        rank = math.ceil(q / 100 * len(values)) - 1
+        return values[max(0, min(len(values) - 1, rank))]
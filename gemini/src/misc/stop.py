@@ -0,0 +1,118 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, Optional, Pattern, Union
+
+_WORD = re.compile(r"\S+")
+_SENTENCE_END = re.compile(r"[.!?]+(?=\s)")
+
+
+class StopCondition(ABC):
+    """
+    Decides where a streamed text is cut off.
+
+    `feed` is called with the whole text after every delta and returns the index at which the text is truncated once the condition is met. Conditions keep the position they scanned to, so each call only looks at the new text.
+
+    Use `StopCondition.coerce` to accept the shorthand forms of `stop=`: a compiled regex or pattern string, a callable, or a condition.
+    """
+
+    @abstractmethod
+    def feed(self, text: str) -> Optional[int]:
+        """
+        Checks the text generated so far.
+
+        Args:
+            text (str): The whole text generated so far.
+
+        Returns:
+            Optional[int]: The index at which the text is truncated, or None to continue.
+        """
+        pass
+
+    @staticmethod
+    def coerce(
+        stop: Union[None, "StopCondition", str, Pattern, Callable[[str], bool]],
+    ) -> Optional["StopCondition"]:
+        """Returns the condition for a `stop=` argument."""
+        if stop is None or isinstance(stop, StopCondition):
+            return stop
+        if isinstance(stop, (str, re.Pattern)):
+            return StopPattern(stop)
+        if callable(stop):
+            return StopWhen(stop)
+        raise TypeError(
+            f"stop must be a StopCondition, a regex or a callable, not {type(stop).__name__}."
+        )
+
+
+class MaxWords(StopCondition):
+    """
+    Stops after `n` whitespace-separated words, like `utils.max_token`, keeping the original spacing.
+
+    A word counts once whitespace follows it, since the next delta may continue it.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self._count = 0
+        self._pos = 0
+
+    def feed(self, text: str) -> Optional[int]:
+        for match in _WORD.finditer(text, self._pos):
+            if match.end() == len(text):
+                break
+            self._count += 1
+            self._pos = match.end()
+            if self._count >= self.n:
+                return match.end()
+        return None
+
+
+class MaxSentences(StopCondition):
+    """
+    Stops after `n` sentences, like `utils.max_sentence`.
+
+    A sentence ends at ".", "!" or "?" followed by whitespace, so "3.14" does not end one.
+    """
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self._count = 0
+        self._pos = 0
+
+    def feed(self, text: str) -> Optional[int]:
+        for match in _SENTENCE_END.finditer(text, self._pos):
+            self._count += 1
+            self._pos = match.end()
+            if self._count >= self.n:
+                return match.end()
+        return None
+
+
+class StopPattern(StopCondition):
+    """
+    Stops before the first match of a regex, which is not included in the output.
+
+    Args:
+        pattern (Union[str, Pattern]): The regex.
+        lookbehind (int): The characters before the new text that are searched again, so matches spanning deltas are found. Defaults to 256.
+    """
+
+    def __init__(self, pattern: Union[str, Pattern], lookbehind: int = 256) -> None:
+        self.pattern = re.compile(pattern)
+        self.lookbehind = lookbehind
+        self._pos = 0
+
+    def feed(self, text: str) -> Optional[int]:
+        match = self.pattern.search(text, max(self._pos - self.lookbehind, 0))
+        self._pos = len(text)
+        return match.start() if match else None
+
+
+class StopWhen(StopCondition):
+    """Stops once a callable returns True for the text so far, keeping all of it."""
+
+    def __init__(self, predicate: Callable[[str], bool]) -> None:
+        self.predicate = predicate
+
+    def feed(self, text: str) -> Optional[int]:
+        return len(text) if self.predicate(text) else None
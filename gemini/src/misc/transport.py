@@ -0,0 +1,375 @@
+import httpx
+import requests
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+class TransportResponse(ABC):
+    """
+    A response with the subset of the `requests` API used by the library, plus `iter_bytes` from `httpx`.
+
+    Subclasses implement `content`, `text`, `json` and `iter_content` for the response of their library.
+
+    Attributes:
+        raw: The response of the underlying library.
+    """
+
+    def __init__(self, raw: Any) -> None:
+        self.raw = raw
+
+    @property
+    def status_code(self) -> int:
+        return self.raw.status_code
+
+    @property
+    def headers(self):
+        return self.raw.headers
+
+    @property
+    def url(self) -> str:
+        return str(self.raw.url)
+
+    @property
+    def encoding(self) -> Optional[str]:
+        return self.raw.encoding
+
+    @property
+    @abstractmethod
+    def content(self) -> bytes:
+        """The response body, read in full."""
+        pass
+
+    @property
+    @abstractmethod
+    def text(self) -> str:
+        """The response body decoded to text."""
+        pass
+
+    @abstractmethod
+    def json(self) -> Any:
+        """Decodes the response body as JSON."""
+        pass
+
+    @abstractmethod
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        """Iterates over the decoded response body in chunks."""
+        pass
+
+    def iter_bytes(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        return self.iter_content(chunk_size)
+
+    def raise_for_status(self) -> None:
+        """Raises `requests.HTTPError` for 4xx and 5xx responses."""
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self
+            )
+
+    def close(self) -> None:
+        self.raw.close()
+
+    def __enter__(self) -> "TransportResponse":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RequestsResponse(TransportResponse):
+    @property
+    def content(self) -> bytes:
+        return self.raw.content
+
+    @property
+    def text(self) -> str:
+        return self.raw.text
+
+    def json(self) -> Any:
+        return self.raw.json()
+
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        return self.raw.iter_content(chunk_size=chunk_size)
+
+
+def _requests_error(error: httpx.HTTPError) -> requests.RequestException:
+    """Translates an httpx error into the `requests` exception callers handle."""
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.ConnectTimeout(str(error))
+    if isinstance(error, httpx.TimeoutException):
+        return requests.ReadTimeout(str(error))
+    if isinstance(error, (httpx.ConnectError, httpx.NetworkError)):
+        return requests.ConnectionError(str(error))
+    return requests.RequestException(str(error))
+
+
+class HttpxResponse(TransportResponse):
+    @property
+    def content(self) -> bytes:
+        try:
+            return self.raw.read()
+        except httpx.HTTPError as e:
+            raise _requests_error(e) from e
+
+    @property
+    def text(self) -> str:
+        self.content  # Reads the body of a streamed response.
+        return self.raw.text
+
+    def json(self) -> Any:
+        self.content  # Reads the body of a streamed response.
+        return self.raw.json()
+
+    def iter_content(self, chunk_size: Optional[int] = None) -> Iterator[bytes]:
+        try:
+            yield from self.raw.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise _requests_error(e) from e
+
+
+class Transport(ABC):
+    """
+    The HTTP layer shared by `Gemini`, `upload_image`, the sync `GeminiImage` helpers and `OpenRouter`.
+
+    `request` follows the `requests` API and every implementation raises `requests` exceptions, so callers handle one set of errors. `get` and `stream` follow the `httpx.Client` API used by the image helpers. Subclass it and implement `request` to inject a test transport.
+
+    Both implementations advertise brotli (`br`) and zstd response encodings when the `brotli` and `zstandard` packages are installed, e.g. with `pip install python-gemini-api[compression]`, and decode them transparently.
+
+    Attributes:
+        session: The session of the underlying library.
+    """
+
+    session: Any = None
+
+    @property
+    def cookies(self):
+        """The cookie jar sent with every request."""
+        return self.session.cookies
+
+    @property
+    def headers(self):
+        """The headers sent with every request."""
+        return self.session.headers
+
+    @property
+    def accept_encoding(self) -> str:
+        """The response encodings that are advertised and decoded."""
+        return self.headers.get("Accept-Encoding", "")
+
+    @abstractmethod
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Union[dict, str]] = None,
+        data: Optional[Union[dict, str, bytes]] = None,
+        json: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        cookies: Optional[dict] = None,
+        timeout: Timeout = None,
+        proxies: Optional[dict] = None,
+        verify: Optional[bool] = None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+    ) -> TransportResponse:
+        """
+        Sends a request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The URL.
+            params, data, json, headers, cookies: As in `requests.request`.
+            timeout (Union[None, float, Tuple[float, float]]): Seconds, or a (connect, read) tuple. None waits indefinitely.
+            proxies (Optional[dict]): Per-request proxies, where the implementation supports them.
+            verify (Optional[bool]): Per-request certificate verification, where the implementation supports it.
+            stream (bool): If True, returns before the body is read.
+            allow_redirects (bool): Whether redirects are followed. Defaults to True.
+
+        Returns:
+            TransportResponse: The response.
+
+        Raises:
+            requests.RequestException: If the request fails.
+        """
+        pass
+
+    def get(self, url: str, **kwargs) -> TransportResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> TransportResponse:
+        return self.request("POST", url, **kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[TransportResponse]:
+        """Sends a streamed request and closes the response when the block exits."""
+        response = self.request(method, url, stream=True, **kwargs)
+        try:
+            yield response
+        finally:
+            response.close()
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class RequestsTransport(Transport):
+    """
+    A transport over a pooled `requests.Session`.
+
+    Args:
+        session (Optional[requests.Session]): An existing session. A new one is created if None.
+        pool_connections (int): The number of connection pools of a created session. Defaults to 10.
+        pool_maxsize (int): The connections kept per host by a created session. Defaults to 10.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+    ) -> None:
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params=None,
+        data=None,
+        json=None,
+        headers=None,
+        cookies=None,
+        timeout: Timeout = None,
+        proxies=None,
+        verify=None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+    ) -> RequestsResponse:
+        return RequestsResponse(
+            self.session.request(
+                method,
+                url,
+                params=params,
+                data=data,
+                json=json,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                proxies=proxies,
+                verify=verify,
+                stream=stream,
+                allow_redirects=allow_redirects,
+            )
+        )
+
+
+class HttpxTransport(Transport):
+    """
+    A transport over an `httpx.Client`, with HTTP/2 multiplexing by default.
+
+    Requests to the same host share one HTTP/2 connection, so many threads can use the transport with few sockets. Proxies and certificate verification are configured on the client; the per-request `proxies` and `verify` arguments are ignored.
+
+    Args:
+        client (Optional[httpx.Client]): An existing client. A new one is created if None.
+        http2 (bool): Whether a created client negotiates HTTP/2. Defaults to True.
+        max_connections (int): The connection limit of a created client. Defaults to 100.
+        **kwargs: Extra keyword arguments for a created `httpx.Client`, such as `proxy` or `verify`.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.Client] = None,
+        http2: bool = True,
+        max_connections: int = 100,
+        **kwargs,
+    ) -> None:
+        self.session = client or httpx.Client(
+            http2=http2,
+            limits=httpx.Limits(max_connections=max_connections),
+            **kwargs,
+        )
+
+    @property
+    def client(self) -> httpx.Client:
+        return self.session
+
+    @staticmethod
+    def _timeout(timeout: Timeout) -> Optional[httpx.Timeout]:
+        if timeout is None:
+            return None
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params=None,
+        data=None,
+        json=None,
+        headers=None,
+        cookies=None,
+        timeout: Timeout = None,
+        proxies=None,
+        verify=None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+    ) -> HttpxResponse:
+        raw_body = isinstance(data, (str, bytes))
+        try:
+            request = self.session.build_request(
+                method,
+                url,
+                params=params,
+                content=data if raw_body else None,
+                data=None if raw_body else data,
+                json=json,
+                headers=headers,
+                cookies=cookies,
+                timeout=self._timeout(timeout),
+            )
+            response = self.session.send(
+                request, stream=True, follow_redirects=allow_redirects
+            )
+        except httpx.HTTPError as e:
+            raise _requests_error(e) from e
+        wrapped = HttpxResponse(response)
+        if not stream:
+            try:
+                wrapped.content
+            finally:
+                response.close()
+        return wrapped
+
+
+_default_transport: Optional[Transport] = None
+
+
+def default_transport() -> Transport:
+    """Returns the process-wide `RequestsTransport` used when no transport is given."""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = RequestsTransport()
+    return _default_transport
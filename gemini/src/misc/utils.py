@@ -1,7 +1,10 @@
 import json
 import requests
-from typing import Union
+from typing import Optional, Tuple, Union
 from gemini.src.misc.constants import Headers
+from gemini.src.model.code import extract_code_blocks
+from gemini.src.misc.metrics import UPLOAD_BYTES
+from gemini.src.misc.transport import Transport, default_transport
 from typing import Dict, Union
 
 
@@ -53,19 +56,9 @@ def extract_code(text: str) -> str:
         str or list of str: A single code snippet string if only one is found, otherwise a list of all extracted code snippets. Returns the original text if no snippets are found.
     """
 
-    snippets = []
-    start_pattern = "```"
-    end_pattern = "```"
-    start_idx = text.find(start_pattern)
-
-    while start_idx != -1:
-        end_idx = text.find(end_pattern, start_idx + len(start_pattern))
-        if end_idx != -1:
-            snippet = text[start_idx : end_idx + len(end_pattern)].strip()
-            snippets.append(snippet)
-            start_idx = text.find(start_pattern, end_idx + len(end_pattern))
-        else:
-            break
+    snippets = [
+        text[block.start : block.end].strip() for block in extract_code_blocks(text)
+    ]
 
     # Return directly if only one snippet is found
     if len(snippets) == 1:
@@ -77,10 +70,19 @@ def extract_code(text: str) -> str:
         return text
 
 
-def upload_image(file: Union[bytes, str]) -> str:
+def upload_image(
+    file: Union[bytes, str],
+    timeout: Optional[Union[float, Tuple[float, float]]] = None,
+    transport: Optional[Transport] = None,
+) -> str:
     """
     Upload image into bard bucket on Google API, do not need session.
 
+    Args:
+        file (Union[bytes, str]): The image data as bytes or file path.
+        timeout (Optional[Union[float, Tuple[float, float]]]): The `requests` timeout, as seconds or a (connect, read) tuple. Defaults to None.
+        transport (Optional[Transport]): The transport to upload through. Defaults to a process-wide `RequestsTransport`.
+
     Returns:
         str: relative URL of image.
     """
@@ -89,15 +91,18 @@ def upload_image(file: Union[bytes, str]) -> str:
             file_data = f.read()
     else:
         file_data = file
+    UPLOAD_BYTES.inc(len(file_data))
 
-    response = requests.post(
-        url="https://content-push.googleapis.com/upload/",
+    response = (transport or default_transport()).request(
+        "POST",
+        "https://content-push.googleapis.com/upload/",
         headers={
             "Push-ID": Headers.IMG_UPLOAD["push-id"],
             "Content-Type": "application/octet-stream",
         },
         data=file_data,
         allow_redirects=True,
+        timeout=timeout,
     )
     response.raise_for_status()
 
@@ -1,2 +1,7 @@
-from .image import GeminiImage
+from .image import GeminiImage, SavedImage, SessionRef
+from .image_store import ImageStore
+from .prefetch import ImagePrefetcher
 from .output import GeminiCandidate, GeminiModelOutput
+from .conversation import Conversation
+from .fast import FastGeminiImage, FastGeminiCandidate, FastGeminiModelOutput
+from .code import CodeBlock, CodeBlockScanner, extract_code_blocks
@@ -0,0 +1,139 @@
+import re
+from typing import List, NamedTuple, Optional
+from gemini.src.misc.constants import REPLIT_SUPPORT_PROGRAM_LANGUAGES
+
+FENCE = "```"
+_LANGUAGE_PATTERN = re.compile(r"^[\w#+.\-]*$")
+LANGUAGE_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "node": "javascript",
+    "ts": "typescript",
+    "golang": "go",
+    "kt": "kotlin",
+    "cs": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "cxx": "c++",
+    "rb": "ruby",
+    "rs": "rust",
+    "pl": "perl",
+}
+
+
+class CodeBlock(NamedTuple):
+    """
+    A fenced code block found in a response text.
+
+    Attributes:
+        language (str): The language tag of the opening fence, lowercased. Empty if untagged.
+        code (str): The body of the block, without fences.
+        start (int): The offset of the opening fence in the text.
+        end (int): The offset right after the closing fence in the text.
+    """
+
+    language: str
+    code: str
+    start: int
+    end: int
+
+    @property
+    def filename(self) -> Optional[str]:
+        """The Replit filename for the block language, or None if the language is not supported."""
+        language = LANGUAGE_ALIASES.get(self.language, self.language)
+        return REPLIT_SUPPORT_PROGRAM_LANGUAGES.get(language)
+
+
+class CodeBlockScanner:
+    """
+    Scans fenced code blocks from text in a single pass.
+
+    The scanner can be fed incrementally with streamed text. Each call to `feed` returns the blocks whose closing fence has arrived, with offsets relative to the whole text fed so far.
+
+    Methods:
+        feed(chunk: str) -> List[CodeBlock]: Adds text and returns the newly closed blocks.
+        scan(text: str) -> List[CodeBlock]: Returns every closed block of a complete text.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._base = 0  # offset of the buffer in the whole text
+        self._open = None  # buffer offset of a pending opening fence
+
+    def feed(self, chunk: str) -> List[CodeBlock]:
+        """
+        Adds streamed text and returns the code blocks closed by it.
+
+        Args:
+            chunk (str): The next piece of text.
+
+        Returns:
+            List[CodeBlock]: The blocks whose closing fence is in the text fed so far.
+        """
+        self._buffer += chunk
+        blocks = []
+        pos = 0
+        while True:
+            if self._open is None:
+                start = self._buffer.find(FENCE, pos)
+                if start == -1:
+                    # Keep a possible partial fence at the end of the buffer.
+                    pos = max(pos, len(self._buffer) - len(FENCE) + 1)
+                    break
+                self._open = start
+            end = self._buffer.find(FENCE, self._open + len(FENCE))
+            if end == -1:
+                pos = self._open
+                break
+            blocks.append(self._build(self._open, end))
+            pos = end + len(FENCE)
+            self._open = None
+
+        if self._open is not None:
+            self._open -= pos
+        self._buffer = self._buffer[pos:]
+        self._base += pos
+        return blocks
+
+    def _build(self, start: int, end: int) -> CodeBlock:
+        body = self._buffer[start + len(FENCE) : end]
+        language = ""
+        head, newline, rest = body.partition("\n")
+        if newline and _LANGUAGE_PATTERN.match(head.strip()):
+            language = head.strip().lower()
+            body = rest
+        return CodeBlock(
+            language=language,
+            code=body.rstrip("\n"),
+            start=self._base + start,
+            end=self._base + end + len(FENCE),
+        )
+
+    @classmethod
+    def scan(cls, text: str) -> List[CodeBlock]:
+        """
+        Returns every closed code block of a complete text.
+
+        Args:
+            text (str): The text containing fenced code blocks.
+
+        Returns:
+            List[CodeBlock]: The code blocks in order of appearance.
+        """
+        return cls().feed(text)
+
+
+def extract_code_blocks(text: str) -> List[CodeBlock]:
+    """
+    Extracts typed code blocks with language tags and offsets from the given text.
+
+    Args:
+        text (str): The text containing fenced code blocks.
+
+    Returns:
+        List[CodeBlock]: The code blocks in order of appearance.
+    """
+    if not text:
+        return []
+    return CodeBlockScanner.scan(text)
@@ -0,0 +1,47 @@
+import threading
+from typing import List, Optional
+
+
+class Conversation:
+    """
+    The ids that continue a Gemini conversation from one turn to the next.
+
+    By default a `Gemini` client keeps a single conversation for all of its calls. Passing a `Conversation` to `generate_content` reads and advances that conversation instead, so callers sharing a client across threads do not cross each other's turns.
+
+    Attributes:
+        cid (Optional[str]): The conversation id.
+        rid (Optional[str]): The response id of the last turn.
+        rcid (Optional[str]): The response candidate id to continue from, if chosen.
+
+    Example:
+        >>> conversation = Conversation()
+        >>> gemini.generate_content("Hello", conversation=conversation)
+        >>> gemini.generate_content("Tell me more", conversation=conversation)
+    """
+
+    __slots__ = ("cid", "rid", "rcid", "_lock")
+
+    def __init__(
+        self,
+        cid: Optional[str] = None,
+        rid: Optional[str] = None,
+        rcid: Optional[str] = None,
+    ) -> None:
+        self.cid = cid
+        self.rid = rid
+        self.rcid = rcid
+        self._lock = threading.Lock()
+
+    def ids(self) -> List[Optional[str]]:
+        """Returns the [cid, rid, rcid] triple sent with the next prompt."""
+        with self._lock:
+            return [self.cid, self.rid, self.rcid]
+
+    def advance(self, metadata: list) -> None:
+        """Continues the conversation from a response's metadata."""
+        if len(metadata) > 1:
+            with self._lock:
+                self.cid, self.rid = metadata[0], metadata[1]
+
+    def __repr__(self) -> str:
+        return f"Conversation(cid={self.cid!r}, rid={self.rid!r}, rcid={self.rcid!r})"
@@ -0,0 +1,205 @@
+from typing import List, Optional, Dict
+from gemini.src.model.image import GeminiImage, SessionRef
+from gemini.src.model.code import CodeBlock
+from gemini.src.model.output import GeminiCandidate, GeminiModelOutput
+
+
+class FastGeminiImage:
+    """
+    A lightweight, slotted counterpart of `GeminiImage`.
+
+    The URL is kept as a plain string and is not validated, because the data is already trusted from `ResponseParser`. Unknown keys in the parsed image dict are ignored.
+
+    Attributes:
+        url (str): The URL of the image.
+        title (str): The title of the image. Defaults to "[Image]".
+        alt (str): The alt text of the image. Defaults to "".
+        session (Optional[SessionRef]): A weak reference to the generating client, set on generated images.
+    """
+
+    __slots__ = ("url", "title", "alt", "session")
+
+    def __init__(
+        self,
+        url: str,
+        title: str = "[Image]",
+        alt: str = "",
+        session: Optional[SessionRef] = None,
+        **_,
+    ) -> None:
+        self.url = url
+        self.title = title
+        self.alt = alt
+        self.session = session
+
+    def __repr__(self) -> str:
+        return (
+            f"FastGeminiImage(url={self.url!r}, title={self.title!r}, alt={self.alt!r})"
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FastGeminiImage):
+            return NotImplemented
+        return (self.url, self.title, self.alt) == (other.url, other.title, other.alt)
+
+    def to_pydantic(self) -> GeminiImage:
+        """Builds a validated `GeminiImage` from this image."""
+        return GeminiImage(
+            url=self.url, title=self.title, alt=self.alt, session=self.session
+        )
+
+
+class FastGeminiCandidate:
+    """
+    A lightweight, slotted counterpart of `GeminiCandidate`.
+
+    Attributes:
+        rcid (str): The response candidate id.
+        text (str): The text of the candidate.
+        code (Dict): The code snippets extracted from the text.
+        code_blocks (List[CodeBlock]): The fenced code blocks of the text.
+        web_images (List[FastGeminiImage]): Web images of the candidate.
+        generated_images (List[FastGeminiImage]): Generated images of the candidate.
+        response_dict (Dict): The raw candidate dictionary, if any.
+    """
+
+    __slots__ = (
+        "rcid",
+        "text",
+        "code",
+        "code_blocks",
+        "web_images",
+        "generated_images",
+        "response_dict",
+    )
+
+    def __init__(
+        self,
+        rcid: str,
+        text: str,
+        code: Optional[Dict] = None,
+        code_blocks: Optional[List[CodeBlock]] = None,
+        web_images: Optional[List[FastGeminiImage]] = None,
+        generated_images: Optional[List[FastGeminiImage]] = None,
+        response_dict: Optional[Dict] = None,
+    ) -> None:
+        self.rcid = rcid
+        self.text = text
+        self.code = code if code is not None else {}
+        self.code_blocks = code_blocks if code_blocks is not None else []
+        self.web_images = web_images if web_images is not None else []
+        self.generated_images = generated_images if generated_images is not None else []
+        self.response_dict = response_dict if response_dict is not None else {}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FastGeminiCandidate":
+        """
+        Builds a candidate from a parsed candidate dictionary without validation.
+
+        Args:
+            data (Dict): A candidate dictionary produced by `ResponseParser`.
+
+        Returns:
+            FastGeminiCandidate: The candidate object.
+        """
+        return cls(
+            rcid=data["rcid"],
+            text=data["text"],
+            code=data.get("code"),
+            code_blocks=data.get("code_blocks"),
+            web_images=[
+                FastGeminiImage(**image) for image in data.get("web_images") or []
+            ],
+            generated_images=[
+                FastGeminiImage(**image) for image in data.get("generated_images") or []
+            ],
+            response_dict=data.get("response_dict"),
+        )
+
+    def __repr__(self) -> str:
+        return f"FastGeminiCandidate(rcid={self.rcid!r}, text={self.text!r})"
+
+    def to_pydantic(self) -> GeminiCandidate:
+        """Builds a validated `GeminiCandidate` from this candidate."""
+        return GeminiCandidate(
+            rcid=self.rcid,
+            text=self.text,
+            code=self.code,
+            code_blocks=self.code_blocks,
+            web_images=[image.to_pydantic() for image in self.web_images],
+            generated_images=[image.to_pydantic() for image in self.generated_images],
+            response_dict=self.response_dict,
+        )
+
+
+class FastGeminiModelOutput:
+    """
+    A lightweight, slotted counterpart of `GeminiModelOutput` with the same attribute API.
+
+    Attributes:
+        metadata (List[str]): The conversation metadata.
+        candidates (List[FastGeminiCandidate]): The response candidates.
+        chosen (int): The index of the chosen candidate. Defaults to 0.
+        response_dict (Optional[dict]): The parsed response dictionary.
+    """
+
+    __slots__ = ("metadata", "candidates", "chosen", "response_dict")
+
+    def __init__(
+        self,
+        metadata: List[str],
+        candidates: List[FastGeminiCandidate],
+        chosen: int = 0,
+        response_dict: Optional[dict] = None,
+    ) -> None:
+        self.metadata = metadata
+        self.candidates = candidates
+        self.chosen = chosen
+        self.response_dict = response_dict
+
+    def __repr__(self) -> str:
+        return f"FastGeminiModelOutput(metadata={self.metadata!r}, candidates={self.candidates!r}, chosen={self.chosen!r})"
+
+    @property
+    def rcid(self) -> str:
+        """The rcid(response candidate id) of the chosen candidate."""
+        return self.candidates[self.chosen].rcid
+
+    @property
+    def text(self) -> str:
+        """The text of the chosen candidate."""
+        return self.candidates[self.chosen].text
+
+    @property
+    def code(self) -> Optional[Dict]:
+        """The code of the chosen candidate."""
+        return self.candidates[self.chosen].code
+
+    @property
+    def code_blocks(self) -> List[CodeBlock]:
+        """The fenced code blocks of the chosen candidate, with language tags and offsets."""
+        return self.candidates[self.chosen].code_blocks
+
+    @property
+    def web_images(self) -> List[FastGeminiImage]:
+        """A list of web images associated with the chosen candidate."""
+        return self.candidates[self.chosen].web_images
+
+    @property
+    def generated_images(self) -> List[FastGeminiImage]:
+        """A list of generated images associated with the chosen candidate."""
+        return self.candidates[self.chosen].generated_images
+
+    @property
+    def payload(self) -> Optional[Dict]:
+        """The response dictionary associated with the model output."""
+        return self.response_dict
+
+    def to_pydantic(self) -> GeminiModelOutput:
+        """Builds a validated `GeminiModelOutput` from this output."""
+        return GeminiModelOutput(
+            metadata=self.metadata,
+            candidates=[candidate.to_pydantic() for candidate in self.candidates],
+            chosen=self.chosen,
+            response_dict=self.response_dict,
+        )
@@ -2,11 +2,276 @@ import os
 import random
 import httpx
 import asyncio
+import weakref
 import datetime
+import tempfile
+import itertools
+from http.cookiejar import CookieJar
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from loguru import logger
-from typing import List, Optional, Dict
-from pydantic import BaseModel, HttpUrl
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Dict, Union
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl
+from gemini.src.misc.transport import Transport
+from gemini.src.misc.constants import GOOGLE_COOKIE_DOMAINS
+
+if TYPE_CHECKING:
+    from gemini.src.model.image_store import ImageStore
+    from gemini.src.model.prefetch import ImagePrefetcher
+
+DEFAULT_IMAGE_CONCURRENCY = 8
+
+# The sync helpers accept any client with the `httpx.Client` get/stream API, such as a `Transport`.
+SyncClient = Union[httpx.Client, Transport]
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ".jpg"),
+    (b"\x89PNG\r\n\x1a\n", ".png"),
+    (b"GIF87a", ".gif"),
+    (b"GIF89a", ".gif"),
+    (b"BM", ".bmp"),
+)
+
+
+def sniff_image_extension(head: bytes, default: str = ".jpg") -> str:
+    """
+    Detects the image file extension from the first bytes of the file.
+
+    Args:
+        head (bytes): At least the first 12 bytes of the image.
+        default (str): The extension returned for unknown formats. Defaults to ".jpg".
+
+    Returns:
+        str: The file extension, including the dot.
+    """
+    for signature, extension in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return extension
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    if head[4:8] == b"ftyp":
+        brand = head[8:12]
+        if brand in (b"avif", b"avis"):
+            return ".avif"
+        if brand in (b"heic", b"heix", b"mif1"):
+            return ".heic"
+    return default
+
+
+def image_filename(
+    title: str, extension: str = ".jpg", stamp: Optional[str] = None
+) -> str:
+    """Builds a filesystem-safe file name from an image title, suffixed with `stamp` or the current time."""
+    stamp = stamp or datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
+    for char in (" ", "/", "\\", ":"):
+        title = title.replace(char, "_")
+    return f"{title}_{stamp}{extension}"
+
+
+def reserve_image_path(save_path: str, title: str, extension: str = ".jpg") -> Path:
+    """
+    Creates an empty file under a new name built with `image_filename` and returns its path.
+
+    The file is created with O_EXCL, and a counter is appended while the name is taken. Parallel saves of images with the same title in the same microsecond therefore get distinct files, and replacing the reserved file cannot overwrite another image.
+
+    Args:
+        save_path (str): The existing directory to save the image in.
+        title (str): The title of the image.
+        extension (str): The file extension, including the dot. Defaults to ".jpg".
+
+    Returns:
+        Path: The path of the reserved file.
+    """
+    base = image_filename(title, "")
+    for attempt in itertools.count():
+        suffix = f"_{attempt}" if attempt else ""
+        path = Path(save_path) / f"{base}{suffix}{extension}"
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            continue
+        return path
+
+
+class SavedImage(NamedTuple):
+    """
+    An entry of the manifest returned by `GeminiImage.save` and `GeminiImage.save_sync`.
+
+    Attributes:
+        title (str): The title of the image.
+        url (str): The URL the image was downloaded from.
+        path (Optional[Path]): The saved file path, or None if saving failed.
+        error (Optional[str]): The reason saving failed, or None on success.
+    """
+
+    title: str
+    url: str
+    path: Optional[Path] = None
+    error: Optional[str] = None
+
+
+class SessionRef:
+    """
+    A weak reference to the client that generated an image, resolved to its cookies at download time.
+
+    Images keep this reference instead of a copy of the cookies, so outputs stay small and carry no credentials. The reference is dropped when pickled or copied, and it resolves to None once the client is garbage collected.
+
+    Args:
+        owner: The generating client. Its `session.cookies` are used if it has a session, otherwise its `cookies`.
+    """
+
+    __slots__ = ("_ref",)
+
+    def __init__(self, owner: object = None) -> None:
+        self._ref = weakref.ref(owner) if owner is not None else None
+
+    def resolve(self) -> Optional[object]:
+        """Returns the client, or None if it no longer exists."""
+        return self._ref() if self._ref is not None else None
+
+    @property
+    def cookies(self) -> Optional[object]:
+        """The cookie jar or dict of the client, or None if it no longer exists."""
+        owner = self.resolve()
+        if owner is None:
+            return None
+        session = getattr(owner, "session", None)
+        if session is not None and getattr(session, "cookies", None) is not None:
+            return session.cookies
+        return getattr(owner, "cookies", None)
+
+    def __bool__(self) -> bool:
+        return self.resolve() is not None
+
+    def __reduce__(self) -> tuple:
+        # Pickles and copies are detached from the client.
+        return (SessionRef, ())
+
+    def __repr__(self) -> str:
+        owner = self.resolve()
+        return f"SessionRef({type(owner).__name__ if owner is not None else None})"
+
+
+def session_cookies(images: List) -> Optional[object]:
+    """Returns the cookies of the first image whose generating client still exists."""
+    for image in images:
+        session = getattr(image, "session", None)
+        if session:
+            return session.cookies
+    return None
+
+
+def google_cookies(cookies: Optional[object]) -> Optional[httpx.Cookies]:
+    """
+    Returns cookies that are only sent to the Google domains.
+
+    Web images are hosted on third-party sites, so cookies without a domain, which httpx sends to every host, are copied with the domain set. A jar whose cookies all have a domain is shared, not copied.
+
+    Args:
+        cookies (Optional[object]): A dict, a `requests` or `http.cookiejar` jar, or `httpx.Cookies`.
+
+    Returns:
+        Optional[httpx.Cookies]: The scoped cookies, or None if `cookies` is None.
+    """
+    if cookies is None:
+        return None
+    jar = getattr(cookies, "jar", cookies)
+    if isinstance(jar, CookieJar):
+        if all(cookie.domain for cookie in jar):
+            return httpx.Cookies(jar)
+        unscoped = [(cookie.name, cookie.value) for cookie in jar if not cookie.domain]
+        scoped = httpx.Cookies()
+        for cookie in jar:
+            if cookie.domain:
+                scoped.jar.set_cookie(cookie)
+    else:
+        unscoped = list(dict(cookies).items())
+        scoped = httpx.Cookies()
+    for name, value in unscoped:
+        for domain in GOOGLE_COOKIE_DOMAINS:
+            scoped.set(name, value, domain=domain)
+    return scoped
+
+
+def scope_cookies(client: object) -> None:
+    """
+    Restricts the cookies of a download client to the Google domains, in place.
+
+    A client's own cookies are sent with every request and cannot be overridden per request, so a client passed in by the caller, such as a user-supplied session, is scoped before it downloads an image. Cookies that already have a domain are left as they are.
+
+    Args:
+        client (object): An `httpx` client, a `requests` session or a `Transport`.
+    """
+    cookies = getattr(client, "cookies", None)
+    jar = getattr(cookies, "jar", cookies)
+    if not isinstance(jar, CookieJar):
+        return
+    unscoped = [cookie for cookie in jar if not cookie.domain]
+    scoped = httpx.Cookies(jar)
+    for cookie in unscoped:
+        jar.clear(cookie.domain, cookie.path, cookie.name)
+        for domain in GOOGLE_COOKIE_DOMAINS:
+            scoped.set(cookie.name, cookie.value, domain=domain, path=cookie.path)
+
+
+def bind_session(candidates: List, owner: object) -> None:
+    """Binds the generated images of candidates to the client that generated them."""
+    ref = SessionRef(owner)
+    for candidate in candidates:
+        for image in candidate.generated_images:
+            image.session = ref
+
+
+def create_image_client(
+    cookies: Optional[dict] = None,
+    max_connections: int = DEFAULT_IMAGE_CONCURRENCY,
+    **kwargs,
+) -> httpx.AsyncClient:
+    """
+    Creates a pooled, HTTP/2-capable async client for image downloads.
+
+    Args:
+        cookies (Optional[dict]): Cookies to be used for downloading images, sent to the Google domains only. A scoped cookie jar is shared, not copied.
+        max_connections (int): The maximum number of pooled connections. Defaults to 8.
+        **kwargs: Extra keyword arguments for `httpx.AsyncClient`.
+
+    Returns:
+        httpx.AsyncClient: The client. The caller is responsible for closing it.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        follow_redirects=True,
+        cookies=google_cookies(cookies),
+        limits=httpx.Limits(max_connections=max_connections),
+        **kwargs,
+    )
+
+
+def create_image_client_sync(
+    cookies: Optional[dict] = None,
+    max_connections: int = DEFAULT_IMAGE_CONCURRENCY,
+    **kwargs,
+) -> httpx.Client:
+    """
+    Creates a pooled, HTTP/2-capable sync client for image downloads. The client is thread-safe.
+
+    Args:
+        cookies (Optional[dict]): Cookies to be used for downloading images, sent to the Google domains only. A scoped cookie jar is shared, not copied.
+        max_connections (int): The maximum number of pooled connections. Defaults to 8.
+        **kwargs: Extra keyword arguments for `httpx.Client`.
+
+    Returns:
+        httpx.Client: The client. The caller is responsible for closing it.
+    """
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        cookies=google_cookies(cookies),
+        limits=httpx.Limits(max_connections=max_connections),
+        **kwargs,
+    )
 
 
 class GeminiImage(BaseModel):
@@ -17,11 +282,16 @@ class GeminiImage(BaseModel):
         url (HttpUrl): The URL of the image.
         title (str): The title of the image. Defaults to "[Image]".
         alt (str): The alt text of the image. Defaults to "".
+        session (Optional[SessionRef]): A weak reference to the generating client, set on generated images. Excluded from dumps and dropped on pickling.
+
+    All downloads of a batch share one pooled client. Pass `client` to reuse the generating client's session, such as `GeminiClient.session` or `Gemini.image_client`, and its cookies; `cookies` is then ignored. Without either, the cookies are resolved from the images' `session` at download time. `max_concurrency` bounds the number of simultaneous downloads. Pass an `ImageStore` as `store` to resolve downloads through the content-addressed cache, and an `ImagePrefetcher` as `prefetcher` to use images downloaded in the background.
 
     Methods:
         validate_images(cls, images): Validates the input images list.
-        save(cls, images: List["GeminiImage"], save_path: str = "cached", cookies: Optional[dict] = None) -> Optional[Path]:
-            Downloads and saves images asynchronously.
+        save(cls, images: List["GeminiImage"], save_path: str = "cached", cookies: Optional[dict] = None) -> List[SavedImage]:
+            Streams images to disk asynchronously.
+        save_sync(images: List["GeminiImage"], save_path: str = "cached", cookies: Optional[dict] = None) -> List[SavedImage]:
+            Streams images to disk from a thread pool.
         fetch_bytes(url: HttpUrl, cookies: Optional[dict] = None) -> Optional[bytes]:
             Fetches bytes of an image asynchronously.
         fetch_images_dict(cls, images: List["GeminiImage"], cookies: Optional[dict] = None) -> Dict[str, bytes]:
@@ -30,9 +300,12 @@ class GeminiImage(BaseModel):
             Saves images locally.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     url: HttpUrl
     title: str = "[Image]"
     alt: str = ""
+    session: Optional[SessionRef] = Field(default=None, exclude=True, repr=False)
 
     @classmethod
     def validate_images(cls, images):
@@ -57,21 +330,134 @@ class GeminiImage(BaseModel):
         images: List["GeminiImage"],
         save_path: str = "cached",
         cookies: Optional[dict] = None,
-    ) -> Optional[Path]:
+        client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = DEFAULT_IMAGE_CONCURRENCY,
+        store: Optional["ImageStore"] = None,
+        prefetcher: Optional["ImagePrefetcher"] = None,
+    ) -> List[SavedImage]:
         """
-        Downloads and saves images asynchronously.
+        Streams images straight to disk asynchronously.
+
+        Each image is written chunk by chunk to a temporary file in `save_path` and atomically renamed once complete, so at most one chunk per download is held in memory. File I/O runs in a worker thread, and the extension is detected from the image's magic bytes.
 
         Args:
             images (List["GeminiImage"]): The list of GeminiImage objects to download.
             save_path (str): The directory path to save the images. Defaults to "cached".
             cookies (Optional[dict]): Cookies to be used for downloading images. Defaults to None.
+            client (Optional[httpx.AsyncClient]): A shared client to download with. A pooled client is created for the batch if None.
+            max_concurrency (int): The maximum number of simultaneous downloads. Defaults to 8.
+            store (Optional[ImageStore]): An image cache to resolve downloads through. Defaults to None.
+            prefetcher (Optional[ImagePrefetcher]): Background downloads to take the images from first. Defaults to None.
 
         Returns:
-            Optional[Path]: The path to the directory where the images are saved, or None if saving fails.
+            List[SavedImage]: One entry per image, in input order, with the saved path or the error.
         """
         cls.validate_images(images)
-        image_data = await cls.fetch_images_dict(images, cookies)
-        await cls.save_images(image_data, save_path)
+        if client is None:
+            cookies = cookies or session_cookies(images)
+            async with create_image_client(cookies, max_concurrency) as client:
+                return await cls.save(
+                    images,
+                    save_path,
+                    client=client,
+                    max_concurrency=max_concurrency,
+                    store=store,
+                    prefetcher=prefetcher,
+                )
+
+        await asyncio.to_thread(os.makedirs, save_path, exist_ok=True)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def save_one(image: "GeminiImage") -> SavedImage:
+            async with semaphore:
+                try:
+                    data = await prefetcher.take(image.url) if prefetcher else None
+                    if data is not None:
+                        path = await asyncio.to_thread(
+                            cls.write_file, data, image.title, save_path
+                        )
+                    elif store is not None:
+                        path = await store.save(
+                            image.url, image.title, save_path, client
+                        )
+                    else:
+                        path = await cls.stream_to_file(
+                            image.url, image.title, save_path, client
+                        )
+                except Exception as e:
+                    return SavedImage(image.title, str(image.url), error=str(e))
+            return SavedImage(image.title, str(image.url), path)
+
+        return list(await asyncio.gather(*(save_one(image) for image in images)))
+
+    @staticmethod
+    def write_file(data: bytes, title: str, save_path: str) -> Path:
+        """
+        Writes image bytes to a temporary file and atomically renames it to its final path.
+
+        Args:
+            data (bytes): The image bytes.
+            title (str): The title of the image, used for the file name.
+            save_path (str): The existing directory to save the image in.
+
+        Returns:
+            Path: The path of the saved image.
+        """
+        fd, temp_path = tempfile.mkstemp(dir=save_path, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            path = reserve_image_path(
+                save_path, title, sniff_image_extension(data[:16])
+            )
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return path
+
+    @staticmethod
+    async def stream_to_file(
+        url: HttpUrl,
+        title: str,
+        save_path: str,
+        client: httpx.AsyncClient,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Path:
+        """
+        Streams one image to a temporary file and atomically renames it to its final path.
+
+        Args:
+            url (HttpUrl): The URL of the image.
+            title (str): The title of the image, used for the file name.
+            save_path (str): The existing directory to save the image in.
+            client (httpx.AsyncClient): The client to download with.
+            chunk_size (int): The size of the chunks read from the network. Defaults to 64 KiB.
+
+        Returns:
+            Path: The path of the saved image.
+        """
+        scope_cookies(client)
+        async with client.stream("GET", str(url)) as response:
+            response.raise_for_status()
+            fd, temp_path = tempfile.mkstemp(dir=save_path, suffix=".part")
+            file = os.fdopen(fd, "wb")
+            try:
+                head = b""
+                async for chunk in response.aiter_bytes(chunk_size):
+                    if len(head) < 16:
+                        head += chunk[: 16 - len(head)]
+                    await asyncio.to_thread(file.write, chunk)
+                await asyncio.to_thread(file.close)
+                path = await asyncio.to_thread(
+                    reserve_image_path, save_path, title, sniff_image_extension(head)
+                )
+                await asyncio.to_thread(os.replace, temp_path, path)
+            except BaseException:
+                file.close()
+                os.unlink(temp_path)
+                raise
+        return path
 
     # Sync
     @staticmethod
@@ -79,27 +465,106 @@ class GeminiImage(BaseModel):
         images: List["GeminiImage"],
         save_path: str = "cached",
         cookies: Optional[dict] = None,
-    ) -> Optional[Path]:
-        """Synchronously saves the image to the specified path.
+        client: Optional[SyncClient] = None,
+        max_workers: int = DEFAULT_IMAGE_CONCURRENCY,
+        store: Optional["ImageStore"] = None,
+        prefetcher: Optional["ImagePrefetcher"] = None,
+    ) -> List[SavedImage]:
+        """Synchronously streams images to disk from a thread pool.
+
+        The downloads share one pooled client and run in parallel, so a batch takes about as long as its slowest image. Each image is written to a temporary file and atomically renamed once complete.
 
         Args:
-            path (str): The directory where the image will be saved.
-            filename (str, optional): The filename for the saved image. If not provided,
-                a filename is generated based on the image title.
-            cookies (dict, optional): Cookies to be used for downloading the image.
+            images (List[GeminiImage]): The list of GeminiImage objects to download.
+            save_path (str): The directory path to save the images. Defaults to "cached".
+            cookies (dict, optional): Cookies to be used for downloading the images.
+            client (Union[httpx.Client, Transport], optional): A shared client to download with. A pooled client is created for the batch if None.
+            max_workers (int): The maximum number of simultaneous downloads. Defaults to 8.
+            store (Optional[ImageStore]): An image cache to resolve downloads through. Defaults to None.
+            prefetcher (Optional[ImagePrefetcher]): Background downloads to take the images from first. Defaults to None.
 
         Returns:
-            Optional[Path]: The path where the image is saved, or None if saving fails.
+            List[SavedImage]: One entry per image, in input order, with the saved path or the error.
         """
-        image_data = GeminiImage.fetch_images_dict_sync(images, cookies)
-        GeminiImage.validate_images(image_data)
-        GeminiImage.save_images_sync(image_data, save_path)
+        GeminiImage.validate_images(images)
+        if client is None:
+            cookies = cookies or session_cookies(images)
+            with create_image_client_sync(cookies, max_workers) as client:
+                return GeminiImage.save_sync(
+                    images,
+                    save_path,
+                    client=client,
+                    max_workers=max_workers,
+                    store=store,
+                    prefetcher=prefetcher,
+                )
+
+        os.makedirs(save_path, exist_ok=True)
+
+        def save_one(image: "GeminiImage") -> SavedImage:
+            try:
+                data = prefetcher.take_sync(image.url) if prefetcher else None
+                if data is not None:
+                    path = GeminiImage.write_file(data, image.title, save_path)
+                elif store is not None:
+                    path = store.save_sync(image.url, image.title, save_path, client)
+                else:
+                    path = GeminiImage.stream_to_file_sync(
+                        image.url, image.title, save_path, client
+                    )
+            except Exception as e:
+                return SavedImage(image.title, str(image.url), error=str(e))
+            return SavedImage(image.title, str(image.url), path)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(save_one, images))
+
+    @staticmethod
+    def stream_to_file_sync(
+        url: HttpUrl,
+        title: str,
+        save_path: str,
+        client: SyncClient,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    ) -> Path:
+        """Synchronously streams one image to a temporary file and atomically renames it to its final path.
+
+        Args:
+            url (HttpUrl): The URL of the image.
+            title (str): The title of the image, used for the file name.
+            save_path (str): The existing directory to save the image in.
+            client (Union[httpx.Client, Transport]): The client to download with.
+            chunk_size (int): The size of the chunks read from the network. Defaults to 64 KiB.
+
+        Returns:
+            Path: The path of the saved image.
+        """
+        scope_cookies(client)
+        with client.stream("GET", str(url)) as response:
+            response.raise_for_status()
+            fd, temp_path = tempfile.mkstemp(dir=save_path, suffix=".part")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    head = b""
+                    for chunk in response.iter_bytes(chunk_size):
+                        if len(head) < 16:
+                            head += chunk[: 16 - len(head)]
+                        file.write(chunk)
+                path = reserve_image_path(save_path, title, sniff_image_extension(head))
+                os.replace(temp_path, path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        return path
 
     ##### Main functions are above. The code below handles special cases for transmitting byte images.
 
     @staticmethod
     async def fetch_bytes(
-        url: HttpUrl, cookies: Optional[dict] = None, proxies: Optional[dict] = None
+        url: HttpUrl,
+        cookies: Optional[dict] = None,
+        proxies: Optional[dict] = None,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> Optional[bytes]:
         """
         Fetches bytes of an image asynchronously.
@@ -107,93 +572,154 @@ class GeminiImage(BaseModel):
         Args:
             url (HttpUrl): The URL of the image.
             cookies (Optional[dict]): Cookies to be used for fetching the image. Defaults to None.
+            proxies (Optional[dict]): Proxy settings for a newly created client. Defaults to None.
+            client (Optional[httpx.AsyncClient]): A shared client to download with, using its own cookies. A one-off client is created if None.
 
         Returns:
             Optional[bytes]: The bytes of the image, or None if fetching fails.
         """
         try:
-            async with httpx.AsyncClient(
-                follow_redirects=True, cookies=cookies, proxies=proxies
-            ) as client:
+            if client is None:
+                async with httpx.AsyncClient(
+                    follow_redirects=True,
+                    cookies=google_cookies(cookies),
+                    **({"proxies": proxies} if proxies else {}),
+                ) as client:
+                    response = await client.get(str(url))
+            else:
+                scope_cookies(client)
                 response = await client.get(str(url))
-                response.raise_for_status()
-                return response.content
+            response.raise_for_status()
+            return response.content
         except Exception as e:
             print(f"Failed to download {url}: {str(e)}")
             return None
 
     @classmethod
     async def fetch_images_dict(
-        cls, images: List["GeminiImage"], cookies: Optional[dict] = None
+        cls,
+        images: List["GeminiImage"],
+        cookies: Optional[dict] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        max_concurrency: int = DEFAULT_IMAGE_CONCURRENCY,
     ) -> Dict[str, bytes]:
         """
-        Fetches images asynchronously and returns a dictionary of image data.
+        Fetches images asynchronously over one pooled client and returns a dictionary of image data.
 
         Args:
             images (List["GeminiImage"]): The list of GeminiImage objects to fetch.
             cookies (Optional[dict]): Cookies to be used for fetching the images. Defaults to None.
+            client (Optional[httpx.AsyncClient]): A shared client to download with. A pooled client is created for the batch if None.
+            max_concurrency (int): The maximum number of simultaneous downloads. Defaults to 8.
 
         Returns:
             Dict[str, bytes]: A dictionary containing image titles as keys and image bytes as values.
         """
         cls.validate_images(images)
-        tasks = [cls.fetch_bytes(image.url, cookies=cookies) for image in images]
-        results = await asyncio.gather(*tasks)
+        if client is None:
+            cookies = cookies or session_cookies(images)
+            async with create_image_client(cookies, max_concurrency) as client:
+                return await cls.fetch_images_dict(
+                    images, client=client, max_concurrency=max_concurrency
+                )
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(image: "GeminiImage") -> Optional[bytes]:
+            async with semaphore:
+                return await cls.fetch_bytes(image.url, client=client)
+
+        results = await asyncio.gather(*(fetch(image) for image in images))
         return {image.title: result for image, result in zip(images, results) if result}
 
     @staticmethod
     async def save_images(image_data: Dict[str, bytes], save_path: str = "cached"):
         """
-        Saves images locally.
+        Saves images locally. Files are written in a worker thread so the event loop is not blocked.
 
         Args:
             image_data (Dict[str, bytes]): A dictionary containing image titles as keys and image bytes as values.
             save_path (str): The directory path to save the images. Defaults to "cached".
         """
-        os.makedirs(save_path, exist_ok=True)
+        await asyncio.to_thread(os.makedirs, save_path, exist_ok=True)
         for title, data in image_data.items():
-            now = datetime.datetime.now().strftime("%Y%m%d%H%M%S%f")
-            filename = f"{title.replace(' ', '_')}_{now}.jpg"
-            filepath = Path(save_path) / filename
             try:
-                with open(filepath, "wb") as f:
-                    f.write(data)
+                filepath = await asyncio.to_thread(
+                    reserve_image_path,
+                    save_path,
+                    title,
+                    sniff_image_extension(data[:16]),
+                )
+                await asyncio.to_thread(filepath.write_bytes, data)
                 print(f"Saved {title} to {filepath}")
             except Exception as e:
                 print(f"Error saving {title}: {str(e)}")
 
     @staticmethod
     def fetch_bytes_sync(
-        url: HttpUrl, cookies: Optional[dict] = None
+        url: HttpUrl,
+        cookies: Optional[dict] = None,
+        client: Optional[SyncClient] = None,
     ) -> Optional[bytes]:
+        """Synchronously fetches the bytes data of an image from the given URL.
+
+        Args:
+            url (HttpUrl): The URL of the image.
+            cookies (dict, optional): Cookies to be used for downloading the image.
+            client (Union[httpx.Client, Transport], optional): A shared client to download with, using its own cookies. A one-off client is created if None.
+
+        Returns:
+            Optional[bytes]: The bytes data of the image, or None if fetching fails.
+        """
         try:
-            url_str = str(url)
-            with httpx.Client(follow_redirects=True, cookies=cookies) as client:
-                try:
-                    response = client.get(url_str)
-                except:
-                    response = client.get(url)
-                response.raise_for_status()
-                return response.content
+            if client is None:
+                with httpx.Client(
+                    follow_redirects=True, cookies=google_cookies(cookies)
+                ) as client:
+                    response = client.get(str(url))
+            else:
+                scope_cookies(client)
+                response = client.get(str(url))
+            response.raise_for_status()
+            return response.content
         except Exception as e:
             print(f"Failed to download {url}: {str(e)}")
-            pass
+            return None
 
     @staticmethod
     def fetch_images_dict_sync(
-        images: List["GeminiImage"], cookies: Optional[dict] = None
+        images: List["GeminiImage"],
+        cookies: Optional[dict] = None,
+        client: Optional[SyncClient] = None,
+        max_workers: int = DEFAULT_IMAGE_CONCURRENCY,
     ) -> Dict[str, bytes]:
-        """Synchronously fetches the bytes data of an image from the given URL.
+        """Synchronously fetches the bytes data of images in parallel over one pooled client.
 
         Args:
-            url (str): The URL of the image.
+            images (List[GeminiImage]): The list of GeminiImage objects to fetch.
             cookies (dict, optional): Cookies to be used for downloading the image.
+            client (Union[httpx.Client, Transport], optional): A shared client to download with. A pooled client is created for the batch if None.
+            max_workers (int): The maximum number of simultaneous downloads. Defaults to 8.
 
         Returns:
-            Optional[bytes]: The bytes data of the image, or None if fetching fails.
+            Dict[str, bytes]: A dictionary containing image titles as keys and image bytes as values.
         """
         GeminiImage.validate_images(images)
-        results = [GeminiImage.fetch_bytes_sync(image.url, cookies) for image in images]
+        if client is None:
+            cookies = cookies or session_cookies(images)
+            with create_image_client_sync(cookies, max_workers) as client:
+                return GeminiImage.fetch_images_dict_sync(
+                    images, client=client, max_workers=max_workers
+                )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda image: GeminiImage.fetch_bytes_sync(
+                        image.url, client=client
+                    ),
+                    images,
+                )
+            )
         return {images[i].title: result for i, result in enumerate(results) if result}
 
     @staticmethod
@@ -220,6 +746,6 @@ class GeminiImage(BaseModel):
             filepath = Path(save_path) / filename
             try:
                 filepath.write_bytes(data)
-            except:
-                pass
-            print(f"Saved {title} to {save_path}")
+                print(f"Saved {title} to {filepath}")
+            except Exception as e:
+                print(f"Error saving {title}: {str(e)}")
@@ -0,0 +1,334 @@
+import os
+import json
+import time
+import shutil
+import asyncio
+import hashlib
+import tempfile
+import threading
+import httpx
+from pathlib import Path
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional
+
+from gemini.src.misc.metrics import IMAGE_CACHE_REQUESTS
+from gemini.src.model.image import (
+    DOWNLOAD_CHUNK_SIZE,
+    SyncClient,
+    image_filename,
+    scope_cookies,
+    sniff_image_extension,
+)
+
+
+class ImageEntry(NamedTuple):
+    """
+    The index record of a cached URL.
+
+    Attributes:
+        digest (str): The sha256 hex digest of the image bytes.
+        extension (str): The file extension sniffed from the image bytes.
+        size (int): The size of the image in bytes.
+        etag (Optional[str]): The ETag response header, used for revalidation.
+        last_modified (Optional[str]): The Last-Modified response header, used for revalidation.
+        validated_at (float): The time of the last download or successful revalidation.
+    """
+
+    digest: str
+    extension: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    validated_at: float = 0.0
+
+
+class _BlobWriter:
+    """Writes a download to a temporary file while hashing it and keeping its first bytes."""
+
+    def __init__(self, directory: Path) -> None:
+        fd, self.temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        self.file = os.fdopen(fd, "wb")
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.head = b""
+
+    def write(self, chunk: bytes) -> None:
+        if len(self.head) < 16:
+            self.head += chunk[: 16 - len(self.head)]
+        self.sha256.update(chunk)
+        self.size += len(chunk)
+        self.file.write(chunk)
+
+    def discard(self) -> None:
+        self.file.close()
+        if os.path.exists(self.temp_path):
+            os.unlink(self.temp_path)
+
+
+class ImageStore:
+    """
+    A content-addressed on-disk image cache shared by `GeminiImage.save` and `GeminiImage.save_sync`.
+
+    Images are stored once per sha256 digest under `root/objects`, so identical bytes served from different URLs take the disk space of one file. An index maps each URL to its blob and the ETag and Last-Modified headers of the last download. A cached URL older than `max_age` is revalidated with If-None-Match and If-Modified-Since; a 304 response reuses the blob without transferring the body. When the blobs exceed `max_bytes`, the least recently used URLs are evicted.
+
+    Saved files are hard links to the blobs where the filesystem allows it, and copies otherwise. Their names are derived from the title and the digest, so saving the same image again does not create a duplicate.
+
+    Attributes:
+        root (Path): The directory of the store.
+        max_bytes (int): The size cap of the stored blobs. Defaults to 512 MiB.
+        max_age (float): The seconds a cached URL is served without revalidation. Defaults to 3600.
+
+    Example:
+        >>> store = ImageStore("image_cache")
+        >>> GeminiImage.save_sync(response.web_images, "output", store=store)
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(
+        self,
+        root: str = "image_cache",
+        max_bytes: int = 512 * 1024 * 1024,
+        max_age: float = 3600.0,
+    ) -> None:
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._objects = self.root / "objects"
+        self._objects.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, ImageEntry]" = self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: object) -> bool:
+        return str(url) in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """The size of the distinct blobs referenced by the index."""
+        sizes = {entry.digest: entry.size for entry in self._entries.values()}
+        return sum(sizes.values())
+
+    def blob_path(self, entry: ImageEntry) -> Path:
+        """Returns the path of the blob of an index entry."""
+        return self._objects / entry.digest[:2] / f"{entry.digest}{entry.extension}"
+
+    def _load_index(self) -> "OrderedDict[str, ImageEntry]":
+        entries = OrderedDict()
+        try:
+            with open(self.root / self.INDEX_FILE) as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return entries
+        for url, record in records:
+            entry = ImageEntry(*record)
+            if self.blob_path(entry).exists():
+                entries[url] = entry
+        return entries
+
+    def _save_index(self) -> None:
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix=".part")
+        with os.fdopen(fd, "w") as f:
+            json.dump([[url, list(entry)] for url, entry in self._entries.items()], f)
+        os.replace(temp_path, self.root / self.INDEX_FILE)
+
+    def _lookup(self, url: str) -> Optional[ImageEntry]:
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            if not self.blob_path(entry).exists():
+                del self._entries[url]
+                return None
+            self._entries.move_to_end(url)
+            return entry
+
+    def _is_fresh(self, entry: ImageEntry) -> bool:
+        return time.time() - entry.validated_at < self.max_age
+
+    @staticmethod
+    def _conditional_headers(entry: Optional[ImageEntry]) -> Dict[str, str]:
+        headers = {}
+        if entry and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry and entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def _revalidated(self, url: str, entry: ImageEntry) -> Path:
+        with self._lock:
+            self._entries[url] = entry._replace(validated_at=time.time())
+            self._entries.move_to_end(url)
+            self._save_index()
+        IMAGE_CACHE_REQUESTS.inc(result="hit")
+        return self.blob_path(entry)
+
+    def _commit(self, url: str, writer: _BlobWriter, headers: httpx.Headers) -> Path:
+        writer.file.close()
+        entry = ImageEntry(
+            digest=writer.sha256.hexdigest(),
+            extension=sniff_image_extension(writer.head),
+            size=writer.size,
+            etag=headers.get("etag"),
+            last_modified=headers.get("last-modified"),
+            validated_at=time.time(),
+        )
+        blob = self.blob_path(entry)
+        with self._lock:
+            if blob.exists():
+                os.unlink(writer.temp_path)
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                os.replace(writer.temp_path, blob)
+            self._entries[url] = entry
+            self._entries.move_to_end(url)
+            self._evict()
+            self._save_index()
+        IMAGE_CACHE_REQUESTS.inc(result="miss")
+        return blob
+
+    def _evict(self) -> None:
+        references: Dict[str, int] = {}
+        for entry in self._entries.values():
+            references[entry.digest] = references.get(entry.digest, 0) + 1
+        total = self.total_bytes
+        # The most recent entry is kept even if it alone exceeds the cap.
+        while total > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            references[entry.digest] -= 1
+            if not references[entry.digest]:
+                total -= entry.size
+                try:
+                    os.unlink(self.blob_path(entry))
+                except OSError:
+                    pass
+
+    def clear(self) -> None:
+        """Removes every cached image."""
+        with self._lock:
+            self._entries.clear()
+            shutil.rmtree(self._objects, ignore_errors=True)
+            self._objects.mkdir(parents=True, exist_ok=True)
+            self._save_index()
+
+    def materialize(self, blob: Path, title: str, save_path: str) -> Path:
+        """
+        Links or copies a blob into a directory under a name derived from the title and digest.
+
+        Args:
+            blob (Path): The blob path returned by `get` or `get_sync`.
+            title (str): The title of the image.
+            save_path (str): The destination directory.
+
+        Returns:
+            Path: The saved file path.
+
+        Raises:
+            FileNotFoundError: If the blob was evicted in the meantime.
+        """
+        os.makedirs(save_path, exist_ok=True)
+        path = Path(save_path) / image_filename(title, blob.suffix, blob.stem[:16])
+        if path.exists():
+            return path
+        # Under the lock, so a concurrent eviction cannot unlink the blob midway. An open blob keeps its data after an unlink, so the copy runs outside.
+        with self._lock:
+            try:
+                os.link(blob, path)
+                return path
+            except FileExistsError:
+                return path
+            except FileNotFoundError:
+                raise
+            except OSError:
+                source = open(blob, "rb")
+        with source, open(path, "wb") as f:
+            shutil.copyfileobj(source, f)
+        return path
+
+    async def get(self, url: str, client: httpx.AsyncClient) -> Path:
+        """
+        Returns the blob of an image, downloading or revalidating it when needed.
+
+        Args:
+            url (str): The URL of the image.
+            client (httpx.AsyncClient): The client to download with.
+
+        Returns:
+            Path: The blob path.
+        """
+        url = str(url)
+        entry = self._lookup(url)
+        if entry and self._is_fresh(entry):
+            IMAGE_CACHE_REQUESTS.inc(result="hit")
+            return self.blob_path(entry)
+
+        headers = self._conditional_headers(entry)
+        scope_cookies(client)
+        async with client.stream("GET", url, headers=headers) as response:
+            if entry and response.status_code == 304:
+                return await asyncio.to_thread(self._revalidated, url, entry)
+            response.raise_for_status()
+            writer = await asyncio.to_thread(_BlobWriter, self.root)
+            try:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    await asyncio.to_thread(writer.write, chunk)
+                return await asyncio.to_thread(
+                    self._commit, url, writer, response.headers
+                )
+            except BaseException:
+                writer.discard()
+                raise
+
+    def get_sync(self, url: str, client: SyncClient) -> Path:
+        """
+        Synchronously returns the blob of an image, downloading or revalidating it when needed.
+
+        Args:
+            url (str): The URL of the image.
+            client (Union[httpx.Client, Transport]): The client to download with.
+
+        Returns:
+            Path: The blob path.
+        """
+        url = str(url)
+        entry = self._lookup(url)
+        if entry and self._is_fresh(entry):
+            IMAGE_CACHE_REQUESTS.inc(result="hit")
+            return self.blob_path(entry)
+
+        headers = self._conditional_headers(entry)
+        scope_cookies(client)
+        with client.stream("GET", url, headers=headers) as response:
+            if entry and response.status_code == 304:
+                return self._revalidated(url, entry)
+            response.raise_for_status()
+            writer = _BlobWriter(self.root)
+            try:
+                for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    writer.write(chunk)
+                return self._commit(url, writer, response.headers)
+            except BaseException:
+                writer.discard()
+                raise
+
+    async def save(
+        self, url: str, title: str, save_path: str, client: httpx.AsyncClient
+    ) -> Path:
+        """Resolves an image through the store and places it in `save_path`, downloading it again if its blob is evicted before it is placed."""
+        blob = await self.get(url, client)
+        try:
+            return await asyncio.to_thread(self.materialize, blob, title, save_path)
+        except FileNotFoundError:
+            blob = await self.get(url, client)
+            return await asyncio.to_thread(self.materialize, blob, title, save_path)
+
+    def save_sync(
+        self, url: str, title: str, save_path: str, client: SyncClient
+    ) -> Path:
+        """Synchronously resolves an image through the store and places it in `save_path`, downloading it again if its blob is evicted before it is placed."""
+        try:
+            return self.materialize(self.get_sync(url, client), title, save_path)
+        except FileNotFoundError:
+            return self.materialize(self.get_sync(url, client), title, save_path)
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from gemini.src.model.image import GeminiImage
+from gemini.src.model.code import CodeBlock
 
 
 class GeminiCandidate(BaseModel):
@@ -9,6 +10,7 @@ class GeminiCandidate(BaseModel):
     rcid: str
     text: str
     code: Dict = {}
+    code_blocks: List[CodeBlock] = []
     web_images: List[GeminiImage] = []
     generated_images: List[GeminiImage] = []
     response_dict: Dict = {}
@@ -22,12 +24,6 @@ class GeminiModelOutput(BaseModel):
     chosen: int = 0
     response_dict: Optional[dict] = None
 
-    def __setattr__(self, name, value):
-        if name == "chosen":
-            super().__setattr__(name, value)
-        else:
-            super().__setattr__(name, value)
-
     @property
     def rcid(self) -> str:
         """The rcid(response candidate id) of the chosen candidate."""
@@ -43,6 +39,11 @@ class GeminiModelOutput(BaseModel):
         """The text of the chosen candidate."""
         return self.candidates[self.chosen].code
 
+    @property
+    def code_blocks(self) -> List[CodeBlock]:
+        """The fenced code blocks of the chosen candidate, with language tags and offsets."""
+        return self.candidates[self.chosen].code_blocks
+
     @property
     def web_images(self) -> List[GeminiImage]:
         """A list of web images associated with the chosen candidate."""
@@ -1,3 +1,6 @@
 from .base import BaesParser
 from .custom_parser import ParseMethod1, ParseMethod2
 from .response_parser import ResponseParser
+from .chain import ParserChain, StrategyStats
+from .frames import ResponseFrames
+from .stream import StreamDecoder
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from gemini.src.model.parser.frames import ResponseFrames
 
 
 class BaesParser(ABC):
@@ -6,6 +7,8 @@ class BaesParser(ABC):
     An abstract base class for response parsers.
 
     This class provides a structure for parsing responses from various sources. It requires the implementation of a `parse` method for processing response text. Additionally, it allows the dynamic addition of custom methods to parser classes.
+
+    Parsers that override `parse_frames` receive the response already decoded as `ResponseFrames`, so stacking several parsers costs a single decode. Parsers that only implement `parse` opt in to the raw text.
     """
 
     @abstractmethod
@@ -23,6 +26,20 @@ class BaesParser(ABC):
         """
         pass
 
+    def parse_frames(self, frames: ResponseFrames) -> any:
+        """
+        Parses a response already decoded by the core decoder.
+
+        The default implementation passes the raw text to `parse`. Override it to read `frames.items`, `frames.frames` or `frames.bodies` instead of splitting the text again.
+
+        Args:
+            frames (ResponseFrames): The decoded response. It is also the raw response text.
+
+        Returns:
+            The parsed data, format depends on the implementation.
+        """
+        return self.parse(frames)
+
     @classmethod
     def add_custom_method(cls, method_name: str, function: callable):
         """
@@ -35,6 +52,5 @@ class BaesParser(ABC):
             function (callable): The function to be set as a method of the class.
         """
         # Recommend to start from this codes
-        # response_items = response_text.lstrip("')]}\'\n\n").split("\n")[1].split("\\")
-        # response_items = [item for item in response_items if item]
+        # response_items = ResponseFrames.of(response_text).items
         setattr(cls, method_name, function)
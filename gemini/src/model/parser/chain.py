@@ -0,0 +1,174 @@
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from gemini.src.misc.metrics import PARSE_FAILURES
+
+
+class StrategyStats:
+    """
+    Counters of a single parsing strategy, updated under the lock of its `ParserChain`.
+
+    Attributes:
+        hits (int): The number of successful parses.
+        failures (int): The number of failed parses.
+        total_ns (int): The total time spent in the strategy, in nanoseconds.
+    """
+
+    __slots__ = ("hits", "failures", "total_ns")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.failures = 0
+        self.total_ns = 0
+
+    @property
+    def attempts(self) -> int:
+        return self.hits + self.failures
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.attempts if self.attempts else 0.0
+
+    @property
+    def mean_latency_ms(self) -> float:
+        return self.total_ns / self.attempts / 1e6 if self.attempts else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "failures": self.failures,
+            "attempts": self.attempts,
+            "hit_rate": self.hit_rate,
+            "mean_latency_ms": self.mean_latency_ms,
+        }
+
+
+class ParserChain:
+    """
+    Runs named parsing strategies until one succeeds, promoting the winner to the front.
+
+    Each strategy records its hit rate and latency. Because the last successful strategy is tried first, a stable server format costs a single parse attempt per response.
+
+    Attributes:
+        accept (Optional[Callable]): A predicate a result must satisfy to count as a success. Any result counts when None.
+        name (str): The chain label used for the parse failure metric.
+
+    Methods:
+        add(name, strategy): Registers a strategy, or replaces the callable of an existing name.
+        run(*args, names=None, extra=()): Returns the result of the first successful strategy.
+        stats() -> Dict[str, Dict]: Returns the counters of every strategy.
+    """
+
+    def __init__(
+        self,
+        strategies: Optional[Iterable[Tuple[str, Callable]]] = None,
+        accept: Optional[Callable[[Any], bool]] = None,
+        name: str = "custom",
+    ) -> None:
+        self.accept = accept
+        self.name = name
+        self._strategies: Dict[str, Callable] = {}
+        self._stats: Dict[str, StrategyStats] = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+        for name, strategy in strategies or []:
+            self.add(name, strategy)
+
+    @property
+    def order(self) -> List[str]:
+        """The strategy names in the order they are currently tried."""
+        return list(self._order)
+
+    def add(self, name: str, strategy: Callable) -> None:
+        """
+        Registers a strategy at the end of the chain. For an existing name, only the callable is replaced and its position and counters are kept.
+
+        Args:
+            name (str): The unique name of the strategy.
+            strategy (Callable): The parsing function.
+        """
+        with self._lock:
+            if name in self._strategies:
+                self._strategies[name] = strategy
+                return
+            self._strategies[name] = strategy
+            self._stats[name] = StrategyStats()
+            self._order.append(name)
+
+    def run(
+        self,
+        *args,
+        names: Optional[Iterable[str]] = None,
+        extra: Iterable[Tuple[str, Callable]] = (),
+    ) -> Any:
+        """
+        Tries the strategies in their current order and returns the first accepted result.
+
+        Args:
+            *args: The arguments passed to each strategy.
+            names (Optional[Iterable[str]]): Restricts the run to these strategy names. Defaults to all.
+            extra (Iterable[Tuple[str, Callable]]): Named strategies tried after the chain for this run only. They are not kept, counted or promoted. Defaults to none.
+
+        Returns:
+            Any: The result of the first successful strategy.
+
+        Raises:
+            ValueError: If every strategy fails.
+        """
+        allowed = set(names) if names is not None else None
+        last_error = None
+        for name in self.order:
+            if allowed is not None and name not in allowed:
+                continue
+            start = time.perf_counter_ns()
+            try:
+                result = self._strategies[name](*args)
+                ok = self.accept is None or self.accept(result)
+            except Exception as e:
+                ok = False
+                last_error = e
+            elapsed = time.perf_counter_ns() - start
+            with self._lock:
+                stats = self._stats[name]
+                stats.total_ns += elapsed
+                if ok:
+                    stats.hits += 1
+                    self._promote(name)
+                else:
+                    stats.failures += 1
+            if ok:
+                return result
+            PARSE_FAILURES.inc(chain=self.name, strategy=name)
+
+        for name, strategy in extra:
+            try:
+                result = strategy(*args)
+                if self.accept is None or self.accept(result):
+                    return result
+            except Exception as e:
+                last_error = e
+            PARSE_FAILURES.inc(chain=self.name, strategy=name)
+
+        raise ValueError("All parsing strategies failed.") from last_error
+
+    def _promote(self, name: str) -> None:
+        """Moves a strategy to the front. The caller holds the lock."""
+        if self._order[0] != name:
+            self._order.remove(name)
+            self._order.insert(0, name)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the counters of every strategy in the current order.
+
+        Returns:
+            Dict[str, Dict]: Strategy names mapped to hits, failures, attempts, hit rate and mean latency.
+        """
+        with self._lock:
+            return {name: self._stats[name].as_dict() for name in self._order}
+
+    def reset_stats(self) -> None:
+        """Resets the counters of every strategy."""
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = StrategyStats()
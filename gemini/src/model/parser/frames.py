@@ -0,0 +1,94 @@
+import json
+from functools import cached_property
+from typing import Any, List
+
+RESPONSE_PREFIX = "')]}'\n\n"
+ENVELOPE_TAG = "wrb.fr"
+
+
+class ResponseFrames(str):
+    """
+    The raw response text of a StreamGenerate request, decoded once and shared by every parser.
+
+    The object is the response text itself, so parsers written against raw text keep working unchanged. Frame-aware parsers read the lazily decoded views instead of splitting and decoding the text again.
+
+    Attributes:
+        lines (List[str]): The raw lines of the response.
+        stripped_lines (List[str]): The lines after the anti-XSSI prefix is stripped.
+        items (List[str]): The non-empty backslash-separated items of the first frame, as used by `ParseMethod1` and `ParseMethod2`.
+        frames (List[Any]): Every line decoded as JSON, skipping lines that are not JSON arrays.
+        bodies (List[Any]): The decoded body arrays of every `wrb.fr` envelope.
+    """
+
+    @classmethod
+    def of(cls, response_text: str) -> "ResponseFrames":
+        """Wraps a response text, returning it unchanged if it is already decoded."""
+        if isinstance(response_text, cls):
+            return response_text
+        return cls(response_text)
+
+    @property
+    def text(self) -> str:
+        """The raw response text."""
+        return str(self)
+
+    @cached_property
+    def lines(self) -> List[str]:
+        return self.split("\n")
+
+    @cached_property
+    def stripped_lines(self) -> List[str]:
+        return self.lstrip(RESPONSE_PREFIX).split("\n")
+
+    @cached_property
+    def items(self) -> List[str]:
+        return [item for item in self.stripped_lines[1].split("\\") if item]
+
+    @cached_property
+    def _decoded(self) -> dict:
+        return {}
+
+    def decode(self, line: str) -> Any:
+        """
+        Decodes a response line as JSON, caching the result for other parsers.
+
+        Args:
+            line (str): A line of the response.
+
+        Returns:
+            Any: The decoded JSON value.
+        """
+        try:
+            return self._decoded[line]
+        except KeyError:
+            value = self._decoded[line] = json.loads(line)
+            return value
+
+    @cached_property
+    def frames(self) -> List[Any]:
+        frames = []
+        for line in self.lines:
+            if not line.startswith("["):
+                continue
+            try:
+                frames.append(self.decode(line))
+            except ValueError:
+                continue
+        return frames
+
+    @cached_property
+    def bodies(self) -> List[Any]:
+        bodies = []
+        for frame in self.frames:
+            for envelope in frame:
+                if (
+                    isinstance(envelope, list)
+                    and len(envelope) > 2
+                    and envelope[0] == ENVELOPE_TAG
+                    and isinstance(envelope[2], str)
+                ):
+                    try:
+                        bodies.append(json.loads(envelope[2]))
+                    except ValueError:
+                        continue
+        return bodies
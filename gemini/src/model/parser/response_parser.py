@@ -1,6 +1,10 @@
 import json
-from typing import Dict
+from typing import Dict, List, Optional
 from gemini.src.model.parser.base import BaesParser
+from gemini.src.model.parser.chain import ParserChain
+from gemini.src.model.parser.frames import ResponseFrames
+from gemini.src.model.code import extract_code_blocks
+from gemini.src.misc.utils import extract_code
 
 
 class ResponseParser(BaesParser):
@@ -8,18 +12,32 @@ class ResponseParser(BaesParser):
     Parses response text and extracts relevant data.
 
     Attributes:
-        cookies: Cookies used for parsing.
+        cookies: Accepted for backward compatibility and no longer copied into the parsed images. Images are bound to the generating client's session by the client instead.
+        chain (ParserChain): The body extraction strategies, with their hit rate and latency.
 
     Methods:
         parse(response_text: str) -> Dict: Parses the response text and returns a dictionary containing relevant data.
     """
 
-    def __init__(self, cookies: dict) -> None:
+    def __init__(self, cookies: Optional[dict] = None) -> None:
         self.cookies = cookies
+        self.chain = ParserChain(
+            [
+                ("strategy_1", self.__extract_strategy_1),
+                ("strategy_2", self.__extract_strategy_2),
+                ("strategy_3", self.__extract_strategy_3),
+                ("strategy_4", self.__extract_strategy_4),
+            ],
+            accept=bool,  # A strategy returns None or a non-empty body on success.
+            name="response",
+        )
 
     def parse(self, response_text: str) -> Dict:
         return self.parse_response_text(response_text)
 
+    def parse_frames(self, frames: ResponseFrames) -> Dict:
+        return self.parse_response_text(frames)
+
     def parse_response_text(self, response_text: str) -> Dict:
         """
         Parses the response text and extracts relevant data.
@@ -30,8 +48,18 @@ class ResponseParser(BaesParser):
         Returns:
             Dict: A dictionary containing parsed data.
         """
-        body = self._extract_body(response_text)
+        return self.parse_body(self._extract_body(ResponseFrames.of(response_text)))
+
+    def parse_body(self, body: List) -> Dict:
+        """
+        Extracts the relevant data from a decoded response body, such as the latest body of a stream.
+
+        Args:
+            body (List): The body of a `wrb.fr` envelope.
 
+        Returns:
+            Dict: A dictionary containing parsed data.
+        """
         if not body or not body[4]:
             raise ValueError(
                 "Failed to parse response body. Data structure is invalid."
@@ -59,68 +87,44 @@ class ResponseParser(BaesParser):
             "candidates": candidates,
         }
 
-    def _extract_body(self, response_text: str) -> Dict:
+    def _extract_body(self, frames: ResponseFrames) -> Dict:
         """
-        Attempts to extract the body from the response text using three different
+        Attempts to extract the body from the response text using four different
         strategies. It stops and returns the body as soon as one of the strategies
-        succeeds without raising an error.
+        succeeds without raising an error. The last successful strategy is tried first.
 
         Args:
-            response_text (str): The response text to parse.
+            frames (ResponseFrames): The decoded response to parse.
 
         Returns:
             Dict: The extracted body.
         """
-        parsing_strategies = [
-            self.__extract_strategy_1,
-            self.__extract_strategy_2,
-            self.__extract_strategy_3,
-            self.__extract_strategy_4,
-        ]
-
-        for strategy in parsing_strategies:
-            try:
-                body = strategy(response_text)
-                if (
-                    body
-                ):  # Assuming the strategy returns None or a non-empty dict on success.
-                    return body
-            except Exception as e:
-                # print(f"Parsing failed with strategy {strategy.__name__}: {e}")
-                continue
-
-        raise ValueError(
-            "Google PeerSide authentication may have expired. Refresh the cookie manually and retry the test.\nDetails: All parsing strategies failed. Try to use `Gemini.send_request(prompt)` to get original payload"
-        )
+        try:
+            return self.chain.run(frames)
+        except ValueError:
+            raise ValueError(
+                "Google PeerSide authentication may have expired. Refresh the cookie manually and retry the test.\nDetails: All parsing strategies failed. Try to use `Gemini.send_request(prompt)` to get original payload"
+            )
 
-    def __extract_strategy_1(self, response_text: str) -> Dict:
-        body = json.loads(json.loads(response_text.split("\n")[3])[0][2])
+    @staticmethod
+    def __extract_from_line(frames: ResponseFrames, line: str) -> Dict:
+        frame = frames.decode(line)
+        body = json.loads(frame[0][2])
         if not body[4]:
-            body = json.loads(json.loads(response_text.split("\n")[3])[4][2])
+            body = json.loads(frame[4][2])
         return body
 
-    def __extract_strategy_2(self, response_text: str) -> Dict:
-        body = json.loads(json.loads(response_text.split("\n")[2])[0][2])
-        if not body[4]:
-            body = json.loads(json.loads(response_text.split("\n")[2])[4][2])
-        return body
+    def __extract_strategy_1(self, frames: ResponseFrames) -> Dict:
+        return self.__extract_from_line(frames, frames.lines[3])
 
-    def __extract_strategy_3(self, response_text: str) -> Dict:
-        body = json.loads(
-            json.loads(response_text.lstrip("')]}'\n\n").split("\n")[1])[0][2]
-        )
-        if not body[4]:
-            body = json.loads(
-                json.loads(response_text.lstrip("')]}'\n\n").split("\n")[1])[4][2]
-            )
-        return body
+    def __extract_strategy_2(self, frames: ResponseFrames) -> Dict:
+        return self.__extract_from_line(frames, frames.lines[2])
 
-    def __extract_strategy_4(self, response_text: str) -> Dict:
-        max_response = max(response_text.split("\n"), key=len)
-        body = json.loads(json.loads(max_response)[0][2])
-        if not body[4]:
-            body = json.loads(json.loads(max_response)[4][2])
-        return body
+    def __extract_strategy_3(self, frames: ResponseFrames) -> Dict:
+        return self.__extract_from_line(frames, frames.stripped_lines[1])
+
+    def __extract_strategy_4(self, frames: ResponseFrames) -> Dict:
+        return self.__extract_from_line(frames, max(frames.lines, key=len))
 
     def _parse_candidates(self, candidates_data: Dict) -> Dict:
         """
@@ -136,11 +140,13 @@ class ResponseParser(BaesParser):
         for candidate_data in candidates_data:
             web_images = self._parse_web_images(candidate_data[4])
             generated_images = self._parse_generated_images(candidate_data[12])
-            codes = self._parse_code(candidate_data[1][0])
+            code_blocks = extract_code_blocks(candidate_data[1][0])
+            codes = self._parse_code(candidate_data[1][0], code_blocks)
             candidate_dict = {
                 "rcid": candidate_data[0],
                 "text": candidate_data[1][0],
                 "code": codes,
+                "code_blocks": code_blocks,
                 "web_images": web_images,
                 "generated_images": generated_images,
             }
@@ -185,17 +191,17 @@ class ResponseParser(BaesParser):
                 "url": image[0][3][3],
                 "title": f"[GeneratedImage {image[3][6]}]",
                 "alt": image[3][5][i] if len(image[3][5]) > i else image[3][5][0],
-                "cookies": self.cookies,
             }
             for i, image in enumerate(images_data[7][0])
         ]
 
-    def _parse_code(self, text: str) -> Dict:
+    def _parse_code(self, text: str, code_blocks: Optional[List] = None) -> Dict:
         """
         Parses the provided text to extract code snippets and structures them similarly to how generated images are parsed.
 
         Args:
             text (str): The text from which code snippets are to be extracted.
+            code_blocks (Optional[List[CodeBlock]]): Code blocks already scanned from the text, if any.
 
         Returns:
             Dict: A structured dictionary of extracted code snippets, with each key being a unique
@@ -204,52 +210,12 @@ class ResponseParser(BaesParser):
         """
         if not text:
             return {}
-        extracted_code = self.extract_code(text)
-        code_dict = {}
-
-        if isinstance(extracted_code, str) and extracted_code != text:
-            code_dict["snippett_01"] = extracted_code
-        elif isinstance(extracted_code, list):
-            for i, snippet in enumerate(extracted_code):
-                code_dict[f"snippett_0{i+1}"] = snippet
-        else:
-            return {}
+        if code_blocks is None:
+            code_blocks = extract_code_blocks(text)
 
-        return code_dict
-
-    @staticmethod
-    def extract_code(text: str) -> str:
-        """
-        Extracts code snippets from the given text.
-        If only one snippet is found, returns it directly instead of a list.
-        If no snippets are found, returns the original text.
-
-        Args:
-            text (str): The text containing mixed code snippets.
-
-        Returns:
-            str or list of str: A single code snippet string if only one is found, otherwise a list of all extracted code snippets. Returns the original text if no snippets are found.
-        """
+        return {
+            f"snippett_0{i+1}": text[block.start : block.end].strip()
+            for i, block in enumerate(code_blocks)
+        }
 
-        snippets = []
-        start_pattern = "```"
-        end_pattern = "```"
-        start_idx = text.find(start_pattern)
-
-        while start_idx != -1:
-            end_idx = text.find(end_pattern, start_idx + len(start_pattern))
-            if end_idx != -1:
-                snippet = text[start_idx : end_idx + len(end_pattern)].strip()
-                snippets.append(snippet)
-                start_idx = text.find(start_pattern, end_idx + len(end_pattern))
-            else:
-                break
-
-        # Return directly if only one snippet is found
-        if len(snippets) == 1:
-            return snippets[0]
-        elif len(snippets) > 1:
-            return snippets
-        else:
-            # Return the original text if no snippets are found
-            return text
+    extract_code = staticmethod(extract_code)
@@ -0,0 +1,74 @@
+import json
+import codecs
+from typing import Any, List, Optional
+from gemini.src.model.parser.frames import ENVELOPE_TAG
+
+
+class StreamDecoder:
+    """
+    Incrementally decodes a StreamGenerate response as its chunks arrive.
+
+    The response is a sequence of length-prefixed JSON lines. Each `wrb.fr` envelope carries the body generated so far, so the text of the first candidate grows with every frame. `feed` returns the newly generated text, and the raw text is kept so that the complete response can be parsed by `ResponseParser` at the end.
+
+    Attributes:
+        text (str): The text of the first candidate so far.
+        body (Optional[List[Any]]): The most recent body with candidates.
+        nbytes (int): The bytes received.
+    """
+
+    def __init__(self) -> None:
+        self.text = ""
+        self.body: Optional[List[Any]] = None
+        self.nbytes = 0
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._raw: List[str] = []
+        self._pending = ""
+
+    @property
+    def response_text(self) -> str:
+        """The raw response text received so far."""
+        return "".join(self._raw)
+
+    def feed(self, chunk: bytes) -> str:
+        """
+        Decodes a chunk of the response.
+
+        Args:
+            chunk (bytes): The bytes received.
+
+        Returns:
+            str: The text appended to the first candidate, or "" if there is none. A frame that revises earlier text updates `text` without returning a delta.
+        """
+        self.nbytes += len(chunk)
+        decoded = self._decoder.decode(chunk)
+        self._raw.append(decoded)
+        *lines, self._pending = (self._pending + decoded).split("\n")
+        previous = self.text
+        for line in lines:
+            if line.startswith("["):
+                self._read_frame(line)
+        if self.text.startswith(previous):
+            return self.text[len(previous) :]
+        return ""
+
+    def _read_frame(self, line: str) -> None:
+        try:
+            frame = json.loads(line)
+        except ValueError:
+            return
+        for envelope in frame:
+            if not (
+                isinstance(envelope, list)
+                and len(envelope) > 2
+                and envelope[0] == ENVELOPE_TAG
+                and isinstance(envelope[2], str)
+            ):
+                continue
+            try:
+                body = json.loads(envelope[2])
+                text = body[4][0][1][0]
+            except (ValueError, TypeError, IndexError):
+                continue
+            if isinstance(text, str):
+                self.body = body
+                self.text = text
@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import httpx
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+
+from gemini.src.model.image import GeminiImage, SyncClient, scope_cookies
+from gemini.src.model.image_store import ImageStore
+
+_Pending = Union[Future, asyncio.Future]
+
+
+class ImagePrefetcher:
+    """
+    Downloads images in the background so that saving them later does not wait on the network.
+
+    With a `store`, images are downloaded into the `ImageStore` and a later save resolves them from disk. Without one, the bytes are kept in an in-memory buffer capped at `max_bytes`; when the cap is exceeded, the oldest completed downloads are dropped and saved normally later. Failed downloads, and downloads into the store, are dropped as soon as they finish. At most `max_pending` URLs are tracked, and the oldest are dropped beyond that.
+
+    `GeminiImage.save` and `GeminiImage.save_sync` take the prefetcher as `prefetcher`. They wait for an in-flight download instead of starting a second one.
+
+    Attributes:
+        store (Optional[ImageStore]): The image cache to prefetch into.
+        max_bytes (int): The size cap of the in-memory buffer. Defaults to 32 MiB.
+        max_workers (int): The number of download threads of the sync path. Defaults to 4.
+        max_pending (int): The maximum number of tracked URLs, in flight or buffered. Defaults to 256.
+    """
+
+    def __init__(
+        self,
+        store: Optional[ImageStore] = None,
+        max_bytes: int = 32 * 1024 * 1024,
+        max_workers: int = 4,
+        max_pending: int = 256,
+    ) -> None:
+        self.store = store
+        self.max_bytes = max_bytes
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.buffered_bytes = 0
+        self._pending: "OrderedDict[str, _Pending]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        # Reentrant: a future that is already done runs its callback in `_track`.
+        self._lock = threading.RLock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def __contains__(self, url: object) -> bool:
+        return str(url) in self._pending
+
+    def _track(self, url: str, future: _Pending) -> None:
+        self._pending[url] = future
+        while len(self._pending) > self.max_pending:
+            self._discard(next(iter(self._pending)))
+        future.add_done_callback(lambda done: self._completed(url, done))
+
+    def _completed(self, url: str, future: _Pending) -> None:
+        failed = future.cancelled() or future.exception() is not None
+        data = None if failed else future.result()
+        with self._lock:
+            if self._pending.get(url) is not future:
+                return
+            if not isinstance(data, bytes):
+                # Nothing to buffer: the download failed or went into the store.
+                self._discard(url)
+                return
+            self._sizes[url] = len(data)
+            self.buffered_bytes += len(data)
+            for buffered_url in list(self._sizes):
+                if self.buffered_bytes <= self.max_bytes:
+                    break
+                self._discard(buffered_url)
+
+    def _discard(self, url: str) -> Optional[_Pending]:
+        self.buffered_bytes -= self._sizes.pop(url, 0)
+        return self._pending.pop(url, None)
+
+    def _download_sync(self, url: str, client: SyncClient) -> Optional[bytes]:
+        if self.store is not None:
+            self.store.get_sync(url, client)
+            return None
+        scope_cookies(client)
+        response = client.get(url)
+        response.raise_for_status()
+        return response.content
+
+    async def _download(self, url: str, client: httpx.AsyncClient) -> Optional[bytes]:
+        if self.store is not None:
+            await self.store.get(url, client)
+            return None
+        scope_cookies(client)
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+    def prefetch_sync(self, images: List[GeminiImage], client: SyncClient) -> None:
+        """
+        Starts downloading images on background threads.
+
+        Args:
+            images (List[GeminiImage]): The images to download.
+            client (Union[httpx.Client, Transport]): The client to download with.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="image-prefetch"
+                )
+            for image in images:
+                url = str(image.url)
+                if url not in self._pending:
+                    future = self._executor.submit(self._download_sync, url, client)
+                    self._track(url, future)
+
+    def prefetch(self, images: List[GeminiImage], client: httpx.AsyncClient) -> None:
+        """
+        Starts downloading images as tasks on the running event loop.
+
+        Args:
+            images (List[GeminiImage]): The images to download.
+            client (httpx.AsyncClient): The client to download with.
+        """
+        with self._lock:
+            for image in images:
+                url = str(image.url)
+                if url not in self._pending:
+                    task = asyncio.ensure_future(self._download(url, client))
+                    self._track(url, task)
+
+    def take_sync(self, url: str) -> Optional[bytes]:
+        """
+        Waits for the prefetch of a URL started with `prefetch_sync` and removes it from the buffer.
+
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            Optional[bytes]: The image bytes, or None if the URL was not buffered or its download failed. With a store, always None once the download is finished.
+        """
+        with self._lock:
+            future = self._discard(str(url))
+        if future is None or isinstance(future, asyncio.Future):
+            return None
+        try:
+            return future.result()
+        except Exception:
+            return None
+
+    async def take(self, url: str) -> Optional[bytes]:
+        """
+        Waits for the prefetch of a URL and removes it from the buffer.
+
+        Args:
+            url (str): The URL of the image.
+
+        Returns:
+            Optional[bytes]: The image bytes, or None if the URL was not buffered or its download failed. With a store, always None once the download is finished.
+        """
+        with self._lock:
+            future = self._discard(str(url))
+        if future is None:
+            return None
+        if isinstance(future, Future):
+            future = asyncio.wrap_future(future)
+        try:
+            return await future
+        except Exception:
+            return None
+
+    def close(self) -> None:
+        """Cancels pending downloads and drops the buffer."""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+            self._sizes.clear()
+            self.buffered_bytes = 0
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
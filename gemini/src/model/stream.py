@@ -0,0 +1,122 @@
+import copy
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Optional
+from gemini.src.misc.deadline import Deadline
+from gemini.src.misc.stop import StopCondition
+from gemini.src.model.output import GeminiModelOutput
+from gemini.src.model.parser.stream import StreamDecoder
+
+if TYPE_CHECKING:
+    from gemini.async_client import GeminiClient
+
+
+class AsyncContentStream:
+    """
+    Streams the text of a `GeminiClient` generation as it arrives.
+
+    Iterating yields the text appended to the first candidate. Breaking out of the loop, calling `aclose`, or cancelling the consuming task closes the HTTP stream at once. When the response completes, it is parsed into `output` and the client's conversation ids advance. An aborted stream leaves them unchanged, so the next prompt continues from the last completed turn.
+
+    With a `stop` condition, the text is checked after every delta, starting with the first decoded frame. Once it is met, the HTTP stream is aborted and `output` is built from the latest frame with the text truncated. The conversation ids do not advance for a stopped stream.
+
+    Attributes:
+        text (str): The text received so far, truncated once the stop condition is met.
+        output (Optional[GeminiModelOutput]): The parsed output once the stream completes or stops.
+        done (bool): Whether the response was received completely.
+        stopped (bool): Whether the stop condition ended the stream.
+
+    Example:
+        >>> async with client.stream_content("Tell me a story") as stream:
+        ...     async for delta in stream:
+        ...         print(delta, end="")
+    """
+
+    def __init__(
+        self,
+        client: "GeminiClient",
+        prompt: str,
+        deadline: Optional[Deadline] = None,
+        stop: Optional[StopCondition] = None,
+    ) -> None:
+        self.client = client
+        self.prompt = prompt
+        self.deadline = deadline
+        self.stop = stop
+        self.output: Optional[GeminiModelOutput] = None
+        self.done = False
+        self.stopped = False
+        self._cut: Optional[int] = None
+        self._decoder = StreamDecoder()
+        self._iterator: Optional[AsyncIterator[str]] = None
+
+    @property
+    def text(self) -> str:
+        return self._decoder.text[: self._cut]
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        if self._iterator is None:
+            self._iterator = self._iterate()
+        return self._iterator
+
+    async def _iterate(self) -> AsyncIterator[str]:
+        client = self.client
+        reqid = client._next_reqid()
+        started = time.perf_counter()
+        async with client._stream_prompt(
+            self.prompt, deadline=self.deadline, reqid=reqid
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                if self.deadline is not None:
+                    self.deadline.check("StreamGenerate")
+                delta = self._decoder.feed(chunk)
+                # The condition is checked once a frame is decoded, so there is a body to truncate.
+                if self.stop is not None and self._decoder.body is not None:
+                    cut = self.stop.feed(self._decoder.text)
+                    if cut is not None:
+                        rest = self._truncate(cut, delta)
+                        client.hooks.emit(
+                            "parse_done", reqid=reqid, account=client.account
+                        )
+                        if rest:
+                            yield rest
+                        return
+                if delta:
+                    yield delta
+        client.hooks.emit(
+            "last_byte",
+            reqid=reqid,
+            account=client.account,
+            nbytes=self._decoder.nbytes,
+        )
+        self.done = True
+        self.output = client._parse_output(
+            self._decoder.response_text, reqid, started, self.deadline
+        )
+
+    def _truncate(self, cut: int, delta: str) -> str:
+        """Stops the stream at `cut` and returns the part of `delta` before it."""
+        emitted = len(self._decoder.text) - len(delta)
+        self._cut = cut
+        self.stopped = True
+        body = copy.deepcopy(self._decoder.body)
+        body[4][0][1][0] = self.text
+        self.output = self.client._create_model_output(
+            self.client.parser.parse_body(body), advance=False
+        )
+        return self.text[emitted:]
+
+    async def collect(self) -> Optional[GeminiModelOutput]:
+        """Consumes the stream and returns `output`."""
+        async for _ in self:
+            pass
+        return self.output
+
+    async def aclose(self) -> None:
+        """Closes the HTTP stream if the response is not complete."""
+        if self._iterator is not None:
+            await self._iterator.aclose()
+
+    async def __aenter__(self) -> "AsyncContentStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -0,0 +1,318 @@
+import time
+import threading
+import requests
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from gemini.src.misc.exceptions import (
+    GeminiAPIError,
+    PackageError,
+    ProviderError,
+    RateLimitException,
+    TimeoutError,
+)
+from gemini.src.model.image import GeminiImage
+from gemini.src.model.output import GeminiModelOutput
+from gemini.src.model.fast import FastGeminiModelOutput
+
+FAILOVER_KINDS = ("timeout", "rate_limit", "auth", "server", "connection", "parse")
+
+
+class ProviderOutput(NamedTuple):
+    """
+    The normalized output of a provider.
+
+    Attributes:
+        text (str): The generated text.
+        provider (str): The name of the provider that answered.
+        model (Optional[str]): The model that answered, if known.
+        latency (float): The seconds the answering provider took.
+        images (Tuple[GeminiImage, ...]): The web and generated images, for providers that return them.
+        raw (Any): The provider's own output object.
+    """
+
+    text: str
+    provider: str
+    model: Optional[str] = None
+    latency: float = 0.0
+    images: Tuple[GeminiImage, ...] = ()
+    raw: Any = None
+
+
+def classify_error(error: BaseException) -> str:
+    """
+    Maps an exception raised by a provider to a failure class.
+
+    Args:
+        error (BaseException): The exception.
+
+    Returns:
+        str: One of "timeout", "rate_limit", "auth", "server", "connection" or "other".
+    """
+    if isinstance(error, (requests.Timeout, TimeoutError, FutureTimeoutError)):
+        return "timeout"
+    if isinstance(error, RateLimitException):
+        return "rate_limit"
+    if isinstance(error, PackageError):
+        return "auth"
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(error, "status", None)
+    if status == 429:
+        return "rate_limit"
+    if status in (401, 403):
+        return "auth"
+    if isinstance(status, int) and status >= 500:
+        return "server"
+    if isinstance(error, requests.ConnectionError):
+        return "connection"
+    if isinstance(error, GeminiAPIError):
+        return "server"
+    return "other"
+
+
+class Provider(ABC):
+    """
+    The interface of a text generation backend behind `FailoverClient`.
+
+    Subclasses implement `generate`, returning a `ProviderOutput` or raising `ProviderError`.
+
+    Attributes:
+        name (str): The provider name reported in outputs and errors.
+    """
+
+    name = "provider"
+
+    @abstractmethod
+    def generate(self, prompt: str) -> ProviderOutput:
+        """
+        Generates text for a prompt.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            ProviderOutput: The normalized output.
+
+        Raises:
+            ProviderError: If the provider fails.
+        """
+        pass
+
+    def _error(self, kind: str, cause: BaseException = None) -> ProviderError:
+        return ProviderError(kind, self.name, cause)
+
+
+class GeminiProvider(Provider):
+    """
+    Serves prompts with the cookie-based `Gemini` client.
+
+    `Gemini.generate_content` returns None after an HTTP failure and the raw response text after a parse failure. The provider reads the client's "error" hook events to classify the failure instead.
+
+    Args:
+        client (Gemini): The client to generate with.
+        name (str): The provider name. Defaults to "gemini".
+    """
+
+    def __init__(self, client, name: str = "gemini") -> None:
+        self.client = client
+        self.name = name
+
+    def generate(self, prompt: str) -> ProviderOutput:
+        errors = []
+        # Allocated here, since another thread may take the client's next id first.
+        reqid = self.client._next_reqid()
+
+        def on_error(event) -> None:
+            if event.reqid == reqid:
+                errors.append(event.error)
+
+        self.client.hooks.on("error", on_error)
+        try:
+            output = self.client.generate_content(prompt, reqid=reqid)
+        except Exception as e:
+            raise self._error(classify_error(e), e) from e
+        finally:
+            self.client.hooks.off("error", on_error)
+
+        if isinstance(output, (GeminiModelOutput, FastGeminiModelOutput)):
+            return ProviderOutput(
+                text=output.text,
+                provider=self.name,
+                images=(*output.web_images, *output.generated_images),
+                raw=output,
+            )
+        if errors:
+            raise self._error(classify_error(errors[-1]), errors[-1])
+        raise self._error("parse" if output else "server")
+
+
+class OpenRouterProvider(Provider):
+    """
+    Serves prompts with the `OpenRouter` client.
+
+    Args:
+        client (OpenRouter): The client to generate with.
+        model (Optional[str]): The model to use instead of the client's model. Defaults to None.
+        name (str): The provider name. Defaults to "openrouter".
+    """
+
+    def __init__(
+        self, client, model: Optional[str] = None, name: str = "openrouter"
+    ) -> None:
+        self.client = client
+        self.model = model
+        self.name = name
+
+    def generate(self, prompt: str) -> ProviderOutput:
+        try:
+            text = self.client.create_chat_completion(prompt, model=self.model)
+        except (KeyError, IndexError, ValueError) as e:
+            raise self._error("parse", e) from e
+        except Exception as e:
+            raise self._error(classify_error(e), e) from e
+        return ProviderOutput(
+            text=text, provider=self.name, model=self.model or self.client.model
+        )
+
+
+class FailoverClient:
+    """
+    Fronts several providers, switching to the next one on failure within a latency budget.
+
+    Providers are tried in order. Each attempt runs on a thread of its own and gets at most `attempt_timeout` seconds and never more than what is left of `budget`. A timed-out attempt cannot be interrupted and keeps its thread until it returns, so at most `max_threads` attempts run at once; waiting for a free thread counts against the attempt's time. When an attempt times out or fails with a kind in `failover_on`, the next provider is tried at once. A provider that was rate limited or rejected the credentials is skipped for `cooldown` seconds while other providers remain.
+
+    Args:
+        providers (Sequence[Provider]): The providers in order of preference.
+        budget (float): The total seconds a call may take. Defaults to 60.
+        attempt_timeout (Optional[float]): The seconds each provider gets before the next one is tried. Defaults to the remaining budget.
+        failover_on (Sequence[str]): The failure kinds that move on to the next provider. Others are raised. Defaults to every kind except "other".
+        cooldown (float): The seconds a rate-limited or unauthorized provider is skipped. Defaults to 60.
+        max_threads (int): The maximum number of attempts running at once, including abandoned ones. Defaults to 32.
+
+    Example:
+        >>> client = FailoverClient([GeminiProvider(gemini), OpenRouterProvider(openrouter)], budget=20, attempt_timeout=8)
+        >>> output = client.generate_content("Hello")
+        >>> output.provider, output.text
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[Provider],
+        budget: float = 60.0,
+        attempt_timeout: Optional[float] = None,
+        failover_on: Sequence[str] = FAILOVER_KINDS,
+        cooldown: float = 60.0,
+        max_threads: int = 32,
+    ) -> None:
+        if not providers:
+            raise ValueError("At least one provider is required.")
+        self.providers = list(providers)
+        self.budget = budget
+        self.attempt_timeout = attempt_timeout
+        self.failover_on = set(failover_on)
+        self.cooldown = cooldown
+        self.failed_attempts = 0
+        self._cooling: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        # A pool would queue new attempts behind hung ones, so every attempt gets a fresh thread.
+        self._threads = threading.BoundedSemaphore(max_threads)
+        self._closed = False
+
+    def _order(self) -> List[Provider]:
+        now = time.monotonic()
+        with self._lock:
+            ready = [p for p in self.providers if self._cooling.get(p.name, 0) <= now]
+            cooling = [p for p in self.providers if p not in ready]
+        return ready + cooling
+
+    def _failed(self, provider: Provider, kind: str) -> None:
+        with self._lock:
+            self.failed_attempts += 1
+            if kind in ("rate_limit", "auth"):
+                self._cooling[provider.name] = time.monotonic() + self.cooldown
+
+    def _start(self, provider: Provider, prompt: str) -> Future:
+        """Runs an attempt on a new daemon thread, which frees its slot when the attempt returns."""
+        future = Future()
+
+        def run() -> None:
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(provider.generate(prompt))
+                    except BaseException as e:
+                        future.set_exception(e)
+            finally:
+                self._threads.release()
+
+        threading.Thread(
+            target=run, name=f"failover-{provider.name}", daemon=True
+        ).start()
+        return future
+
+    def _attempt(self, provider: Provider, prompt: str, timeout: float) -> Any:
+        """Returns the output of an attempt that finishes within `timeout` seconds."""
+        expires = time.monotonic() + timeout
+        if not self._threads.acquire(timeout=timeout):
+            raise FutureTimeoutError(
+                "Every failover thread is busy with unfinished attempts."
+            )
+        future = self._start(provider, prompt)
+        return future.result(timeout=max(expires - time.monotonic(), 0))
+
+    def generate_content(self, prompt: str) -> ProviderOutput:
+        """
+        Generates content with the first provider that answers within the budget.
+
+        Args:
+            prompt (str): The prompt.
+
+        Returns:
+            ProviderOutput: The normalized output, with the answering provider and its latency.
+
+        Raises:
+            ProviderError: If a provider fails with a kind outside `failover_on`, or if every provider failed.
+            TimeoutError: If the budget ran out before any provider answered.
+        """
+        if self._closed:
+            raise RuntimeError("The FailoverClient is closed.")
+        deadline = time.monotonic() + self.budget
+        error = None
+        for provider in self._order():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            timeout = min(remaining, self.attempt_timeout or remaining)
+            started = time.perf_counter()
+            try:
+                output = self._attempt(provider, prompt, timeout)
+            except FutureTimeoutError as e:
+                error = ProviderError("timeout", provider.name, e)
+            except ProviderError as e:
+                error = e
+            except Exception as e:
+                error = ProviderError(classify_error(e), provider.name, e)
+            else:
+                return output._replace(latency=time.perf_counter() - started)
+
+            if error.kind not in self.failover_on:
+                raise error
+            self._failed(provider, error.kind)
+
+        if error is None or deadline - time.monotonic() <= 0:
+            raise TimeoutError(
+                f"No provider answered within the {self.budget}s budget. Last error: {error}"
+            )
+        raise error
+
+    def close(self) -> None:
+        """Stops accepting calls. Abandoned attempts finish on their daemon threads."""
+        self._closed = True
+
+    def __enter__(self) -> "FailoverClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
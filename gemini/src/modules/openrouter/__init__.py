@@ -1,3 +1,6 @@
 from .client import OpenRouter
 from .async_client import AsyncOpenRouter
 from .const import FreeModel
+from .router import ModelRouter, AsyncModelRouter
+from .sse import SSEEvent, SSEParser
+from .stream import ChatCompletionStream, AsyncChatCompletionStream
@@ -1,7 +1,12 @@
 import aiohttp
 import asyncio
-from .const import FREE_MODELS
-from typing import List, Optional
+from .const import FREE_MODELS, CHAT_COMPLETIONS_URL
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+from .stream import AsyncChatCompletionStream
+from .retry import backoff_delay, is_retryable_status, retry_after
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 3
 
 
 class AsyncOpenRouter:
@@ -9,51 +14,209 @@ class AsyncOpenRouter:
     Manages API interactions with OpenRouter for creating chat completions using AI models asynchronously.
 
     Attributes and methods are analogous to the synchronous version but adapted for async operation.
+
+    Requests share one pooled keep-alive `aiohttp.ClientSession`, created lazily on first use because it must be bound to the running event loop. Call `close()`, or use the instance as an async context manager, to release its connections.
+
+    Parameters:
+        model (str): The model identifier for generating chat completions.
+        api_key (str): The API key for authentication.
+        session (Optional[aiohttp.ClientSession], optional): An existing session to send requests with. A pooled session is created if None.
+        timeout (float): The total request timeout in seconds. Defaults to 60.
+        max_connections (int): The maximum number of simultaneous connections. Defaults to 100.
+        max_connections_per_host (int): The maximum number of simultaneous connections to OpenRouter. 0 means no per-host limit. Defaults to 0.
     """
 
-    def __init__(self, model: str, api_key: str) -> None:
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        timeout: float = 60,
+        max_connections: int = 100,
+        max_connections_per_host: int = 0,
+    ) -> None:
         if not api_key:
             raise ValueError(
                 "API key required. Please visit https://openrouter.ai/keys"
             )
         self.api_key = api_key
         self.model = model
+        self.session = session
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
         self._validate_model(model)
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.max_connections_per_host,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """
+        Closes the pooled session and its connections.
+        """
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+
+    async def __aenter__(self) -> "AsyncOpenRouter":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
     def get_model_list(self) -> List[str]:
-        return self.FREE_MODEL_LIST
+        return sorted(FREE_MODELS)
 
     async def create_chat_completion(
         self,
         message: str,
         site_url: Optional[str] = None,
         app_name: Optional[str] = None,
-    ) -> str:
-        response = await self.generate_content(message, site_url, app_name)
+        stream: bool = False,
+        model: Optional[str] = None,
+    ) -> Union[str, AsyncChatCompletionStream]:
+        """
+        Generates a chat completion for a given message, with `model` if given instead of `self.model`.
+
+        With `stream=True`, returns once the response headers arrive with an `AsyncChatCompletionStream` that yields content deltas and sets `usage` at the end.
+        """
+        if stream:
+            return await self.stream_content(message, site_url, app_name, model)
+        response = await self.generate_content(message, site_url, app_name, model)
         return response["choices"][0]["message"]["content"]
 
     async def create_multi_chat_completions(
         self,
-        messages: List[str],
+        messages: Sequence[str],
         site_url: Optional[str] = None,
         app_name: Optional[str] = None,
-    ) -> List[str]:
-        tasks = [
-            self.create_chat_completion(message, site_url, app_name)
-            for message in messages
-        ]
-        results = await asyncio.gather(*tasks)
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        return_exceptions: bool = False,
+    ) -> List[Union[str, Exception]]:
+        """
+        Generates chat completions for many messages with bounded concurrency.
+
+        At most `max_concurrency` requests are in flight. Each message is retried on 429 and 5xx responses and on connection errors, waiting for `Retry-After` when the server sends it.
+
+        Parameters:
+            messages (Sequence[str]): The messages to complete.
+            site_url (Optional[str], optional): The site URL to be included in the request headers.
+            app_name (Optional[str], optional): The application name to be included in the request headers.
+            max_concurrency (int): The maximum number of requests in flight. Defaults to 8.
+            max_retries (int): The maximum number of retries per message. Defaults to 3.
+            return_exceptions (bool): If True, a failed message yields its exception in place of a completion and the rest of the batch still completes. If False, the first failure is raised. Defaults to False.
+
+        Returns:
+            List[Union[str, Exception]]: The completions, in the order of `messages`.
+        """
+        results: List[Union[str, Exception, None]] = [None] * len(messages)
+        async for index, result in self.as_completed_chat_completions(
+            messages, site_url, app_name, max_concurrency, max_retries
+        ):
+            if isinstance(result, Exception) and not return_exceptions:
+                raise result
+            results[index] = result
         return results
 
+    async def as_completed_chat_completions(
+        self,
+        messages: Sequence[str],
+        site_url: Optional[str] = None,
+        app_name: Optional[str] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+    ) -> AsyncIterator[Tuple[int, Union[str, Exception]]]:
+        """
+        Yields chat completions for many messages as they finish.
+
+        A fixed pool of `max_concurrency` workers pulls messages in order, so large batches do not create one task per message. Leaving the iteration early cancels the outstanding requests.
+
+        Parameters:
+            messages (Sequence[str]): The messages to complete.
+            site_url (Optional[str], optional): The site URL to be included in the request headers.
+            app_name (Optional[str], optional): The application name to be included in the request headers.
+            max_concurrency (int): The maximum number of requests in flight. Defaults to 8.
+            max_retries (int): The maximum number of retries per message. Defaults to 3.
+
+        Yields:
+            Tuple[int, Union[str, Exception]]: The index of the message and its completion, or the exception that ended its retries.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        finished: asyncio.Queue = asyncio.Queue()
+        pending = iter(enumerate(messages))
+
+        async def worker() -> None:
+            for index, message in pending:
+                try:
+                    result = await self._complete_with_retry(
+                        message, site_url, app_name, max_retries
+                    )
+                except Exception as e:
+                    result = e
+                finished.put_nowait((index, result))
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(max_concurrency, len(messages)))
+        ]
+        try:
+            for _ in range(len(messages)):
+                yield await finished.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _complete_with_retry(
+        self,
+        message: str,
+        site_url: Optional[str],
+        app_name: Optional[str],
+        max_retries: int,
+    ) -> str:
+        for attempt in range(max_retries + 1):
+            try:
+                return await self.create_chat_completion(message, site_url, app_name)
+            except aiohttp.ClientResponseError as e:
+                if attempt == max_retries or not is_retryable_status(e.status):
+                    raise
+                delay = retry_after(e.headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == max_retries:
+                    raise
+                delay = None
+            await asyncio.sleep(delay if delay is not None else backoff_delay(attempt))
+
     async def generate_content(
         self,
         message: str,
         site_url: Optional[str] = None,
         app_name: Optional[str] = None,
+        model: Optional[str] = None,
     ) -> dict:
         self._validate_message(message)
-        self._validate_model(self.model)
 
+        session = await self._get_session()
+        async with session.post(
+            CHAT_COMPLETIONS_URL,
+            headers=self._build_headers(site_url, app_name),
+            json=self._build_payload(message, model=model),
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    def _build_headers(
+        self, site_url: Optional[str] = None, app_name: Optional[str] = None
+    ) -> Dict[str, str]:
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -62,22 +225,50 @@ class AsyncOpenRouter:
             headers["HTTP-Referer"] = site_url
         if app_name:
             headers["X-Title"] = app_name
+        return headers
 
-        data = {
-            "model": self.model,
+    async def stream_content(
+        self,
+        message: str,
+        site_url: Optional[str] = None,
+        app_name: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> AsyncChatCompletionStream:
+        """
+        Sends a streaming request and returns the stream once the response headers arrive.
+
+        The total timeout does not apply to streams; `timeout` bounds connecting and each read instead.
+        """
+        self._validate_message(message)
+
+        session = await self._get_session()
+        response = await session.post(
+            CHAT_COMPLETIONS_URL,
+            headers=self._build_headers(site_url, app_name),
+            json=self._build_payload(message, stream=True, model=model),
+            timeout=aiohttp.ClientTimeout(
+                total=None, sock_connect=self.timeout, sock_read=self.timeout
+            ),
+        )
+        try:
+            response.raise_for_status()
+        except aiohttp.ClientResponseError:
+            response.release()
+            raise
+        return AsyncChatCompletionStream(response)
+
+    def _build_payload(
+        self, message: str, stream: bool = False, model: Optional[str] = None
+    ) -> dict:
+        payload = {
+            "model": model or self.model,
             "messages": [
                 {"role": "user", "content": message},
             ],
         }
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers=headers,
-                json=data,
-            ) as response:
-                response.raise_for_status()
-                return await response.json()
+        if stream:
+            payload.update(stream=True, usage={"include": True})
+        return payload
 
     def _validate_message(self, message: str) -> None:
         if not isinstance(message, str):
@@ -1,7 +1,8 @@
 import requests
-from .const import FREE_MODELS
-from typing import List, Optional
-from requests.models import Response
+from .const import FREE_MODELS, CHAT_COMPLETIONS_URL
+from typing import Dict, List, Optional, Union
+from .stream import ChatCompletionStream
+from ...misc.transport import Transport, TransportResponse, RequestsTransport
 
 
 class OpenRouter:
@@ -12,24 +13,42 @@ class OpenRouter:
         FREE_MODEL_LIST (List[str]): A list of free model identifiers available for use.
         api_key (str): The API key for authentication with OpenRouter services.
         model (str): The model identifier to be used for generating completions.
+        session (Union[requests.Session, httpx.Client]): The pooled keep-alive session of `transport`.
+        transport (Transport): The HTTP transport shared by every request.
+        timeout (float): The request timeout in seconds.
 
     Methods:
-        __init__(model, api_key): Initializes the OpenRouter instance with a specified model and API key.
-        create_chat_completion(message, site_url=None, app_name=None): Generates a chat completion for a given message.
-        generate_content(message, site_url=None, app_name=None): Validates and sends a request to generate content.
+        __init__(model, api_key, session=None, timeout=60, pool_connections=10, pool_maxsize=10, transport=None): Initializes the OpenRouter instance with a specified model and API key.
+        close(): Closes the pooled session unless the transport was given. The instance is also a context manager.
+        create_chat_completion(message, site_url=None, app_name=None, stream=False): Generates a chat completion for a given message, or streams its content deltas.
+        generate_content(message, site_url=None, app_name=None, stream=False): Validates and sends a request to generate content.
         get_model_list(): Returns a list of free model identifiers available.
 
     Raises:
         ValueError: If an API key is not provided or if the message format is incorrect.
     """
 
-    def __init__(self, model: str, api_key: str) -> None:
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        session: Optional[requests.Session] = None,
+        timeout: float = 60,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        transport: Optional[Transport] = None,
+    ) -> None:
         """
         Initializes the OpenRouter instance with a specified model and API key.
 
         Parameters:
             model (str): The model identifier for generating chat completions.
             api_key (str): The API key for authentication.
+            session (Optional[requests.Session], optional): An existing session to send requests with. A pooled session is created if None.
+            timeout (float): The request timeout in seconds. Defaults to 60.
+            pool_connections (int): The number of connection pools to cache. Defaults to 10.
+            pool_maxsize (int): The maximum number of connections kept alive per pool. Defaults to 10.
+            transport (Optional[Transport], optional): A transport to send requests through, such as an `HttpxTransport` shared with `Gemini`. Takes precedence over `session` and is left open by `close`.
 
         Raises:
             ValueError: If an API key is not provided.
@@ -40,20 +59,41 @@ class OpenRouter:
                 "API key required. Please visit https://openrouter.ai/keys"
             )
         self.model = model
+        self.timeout = timeout
+        self._owns_transport = transport is None
+        self.transport = transport or RequestsTransport(
+            session, pool_connections, pool_maxsize
+        )
+        self.session = self.transport.session
         self._validate_model(model)
 
+    def close(self) -> None:
+        """
+        Closes the pooled session and its connections, unless the transport was given.
+        """
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self) -> "OpenRouter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def get_model_list(self) -> List[str]:
         """
         Returns a list of free model identifiers available for use.
         """
-        return self.FREE_MODEL_LIST
+        return sorted(FREE_MODELS)
 
     def create_chat_completion(
         self,
         message: str,
         site_url: Optional[str] = None,
         app_name: Optional[str] = None,
-    ) -> str:
+        stream: bool = False,
+        model: Optional[str] = None,
+    ) -> Union[str, ChatCompletionStream]:
         """
         Generates a chat completion for a given message.
 
@@ -61,11 +101,19 @@ class OpenRouter:
             message (str): The message for which to generate a completion.
             site_url (Optional[str], optional): The site URL to be included in the request headers.
             app_name (Optional[str], optional): The application name to be included in the request headers.
+            stream (bool): If True, returns a stream of content deltas instead of waiting for the full completion. Defaults to False.
+            model (Optional[str], optional): A model to use for this request instead of `self.model`.
 
         Returns:
-            str: The content of the first choice of the generated chat completion.
+            Union[str, ChatCompletionStream]: The content of the first choice of the generated chat completion, or a stream that yields its deltas and sets `usage` at the end.
         """
-        response = self.generate_content(message, site_url, app_name)
+        if stream:
+            return ChatCompletionStream(
+                self.generate_content(
+                    message, site_url, app_name, stream=True, model=model
+                )
+            )
+        response = self.generate_content(message, site_url, app_name, model=model)
         return response.json()["choices"][0]["message"]["content"]
 
     def generate_content(
@@ -73,7 +121,9 @@ class OpenRouter:
         message: str,
         site_url: Optional[str] = None,
         app_name: Optional[str] = None,
-    ) -> Response:
+        stream: bool = False,
+        model: Optional[str] = None,
+    ) -> TransportResponse:
         """
         Validates and sends a request to OpenRouter to generate content based on the provided message.
 
@@ -81,13 +131,32 @@ class OpenRouter:
             message (str): The message for which content generation is requested.
             site_url (Optional[str], optional): The site URL to be included in the request headers.
             app_name (Optional[str], optional): The application name to be included in the request headers.
+            stream (bool): If True, requests server-sent events and returns before the body is read. Defaults to False.
+            model (Optional[str], optional): A model to use for this request instead of `self.model`.
 
         Returns:
-            Response: The response object from the API request.
+            TransportResponse: The response object from the API request.
         """
         self._validate_message(message)
-        self._validate_model(self.model)
 
+        response = self.transport.request(
+            "POST",
+            CHAT_COMPLETIONS_URL,
+            headers=self._build_headers(site_url, app_name),
+            json=self._build_payload(message, stream, model),
+            timeout=self.timeout,
+            stream=stream,
+        )
+        response.raise_for_status()
+
+        return response
+
+    def _build_headers(
+        self, site_url: Optional[str] = None, app_name: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Builds the request headers.
+        """
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -96,20 +165,23 @@ class OpenRouter:
             headers["HTTP-Referer"] = site_url
         if app_name:
             headers["X-Title"] = app_name
+        return headers
 
-        data = {
-            "model": self.model,
+    def _build_payload(
+        self, message: str, stream: bool = False, model: Optional[str] = None
+    ) -> dict:
+        """
+        Builds the request body for a single user message. Streaming requests also ask for the usage stats in the final chunk.
+        """
+        payload = {
+            "model": model or self.model,
             "messages": [
                 {"role": "user", "content": message},
             ],
         }
-
-        response = requests.post(
-            "https://openrouter.ai/api/v1/chat/completions", headers=headers, json=data
-        )
-        response.raise_for_status()
-
-        return response
+        if stream:
+            payload.update(stream=True, usage={"include": True})
+        return payload
 
     def _validate_message(self, message: str) -> None:
         """
@@ -1,5 +1,7 @@
 from enum import Enum
 
+CHAT_COMPLETIONS_URL = "https://openrouter.ai/api/v1/chat/completions"
+
 
 class FreeModel(Enum):
     GEMMA_7B = "google/gemma-7b-it:free"
@@ -0,0 +1,49 @@
+import random
+import datetime
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional
+
+
+def is_retryable_status(status: Optional[int]) -> bool:
+    """Returns whether a response status is a rate limit (429) or a server error (5xx)."""
+    return status is not None and (status == 429 or status >= 500)
+
+
+def retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Reads the Retry-After header, given either in seconds or as an HTTP date.
+
+    Args:
+        headers (Optional[Mapping[str, str]]): The response headers.
+
+    Returns:
+        Optional[float]: The seconds to wait, or None if the header is missing or invalid.
+    """
+    value = (headers or {}).get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = datetime.datetime.now(when.tzinfo or datetime.timezone.utc)
+    return max(0.0, (when - now).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Returns an exponential backoff delay with full jitter.
+
+    Args:
+        attempt (int): The zero-based retry attempt.
+        base (float): The delay of the first retry in seconds. Defaults to 1.
+        cap (float): The maximum delay in seconds. Defaults to 60.
+
+    Returns:
+        float: The delay in seconds.
+    """
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -0,0 +1,271 @@
+import time
+import asyncio
+from typing import Dict, List, Optional, Sequence
+from .const import FREE_MODELS
+from .client import OpenRouter
+from .async_client import AsyncOpenRouter
+from gemini.src.misc.stats import RollingWindow
+
+
+class ModelHealth:
+    """
+    The rolling latency and error rate of one model.
+
+    Attributes:
+        latencies (RollingWindow): The latencies of successful requests in seconds.
+        outcomes (RollingWindow): 1 for each failed request and 0 for each successful one.
+    """
+
+    def __init__(self, window: int, max_age: Optional[float]) -> None:
+        self.latencies = RollingWindow(window, max_age)
+        self.outcomes = RollingWindow(window, max_age)
+
+    def record(self, latency: float, ok: bool) -> None:
+        if ok:
+            self.latencies.add(latency)
+        self.outcomes.add(0.0 if ok else 1.0)
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.mean
+
+    def as_dict(self) -> Dict:
+        return {
+            "requests": len(self.outcomes),
+            "error_rate": self.error_rate,
+            "p50": self.latencies.percentile(50),
+            "p95": self.latencies.percentile(95),
+        }
+
+
+class _RouterBase:
+    def __init__(
+        self,
+        models: Sequence[str],
+        window: int = 50,
+        max_age: Optional[float] = 600.0,
+        max_error_rate: float = 0.5,
+        min_samples: int = 5,
+    ) -> None:
+        if not models:
+            raise ValueError("At least one model is required.")
+        for model in models:
+            if model not in FREE_MODELS:
+                print(
+                    f"The model {model} may not be free. Please check the following list for costs.\nUsers are responsible for API costs. Visit https://openrouter.ai/docs#models"
+                )
+        self.models = list(dict.fromkeys(models))
+        self.max_error_rate = max_error_rate
+        self.min_samples = min_samples
+        self.health = {model: ModelHealth(window, max_age) for model in self.models}
+
+    def is_healthy(self, model: str) -> bool:
+        """Returns whether a model's recent error rate is within `max_error_rate`."""
+        health = self.health[model]
+        if len(health.outcomes) < self.min_samples:
+            return True
+        return health.error_rate <= self.max_error_rate
+
+    def ranked(self) -> List[str]:
+        """
+        Returns the models in the order they are tried.
+
+        Healthy models come first, fastest median latency first. Models without latency samples rank ahead of measured ones so that each is explored. Unhealthy models follow as a last resort.
+        """
+
+        def key(model: str):
+            p50 = self.health[model].latencies.percentile(50)
+            return (not self.is_healthy(model), p50 is not None, p50 or 0.0)
+
+        return sorted(self.models, key=key)
+
+    def record(self, model: str, latency: float, ok: bool) -> None:
+        """Records the outcome of a request."""
+        self.health[model].record(latency, ok)
+
+    def stats(self) -> Dict[str, Dict]:
+        """
+        Returns the rolling statistics of every model.
+
+        Returns:
+            Dict[str, Dict]: Model names mapped to request count, error rate, p50 and p95 latency in seconds, and health.
+        """
+        return {
+            model: {**health.as_dict(), "healthy": self.is_healthy(model)}
+            for model, health in self.health.items()
+        }
+
+
+class ModelRouter(_RouterBase):
+    """
+    Routes each OpenRouter request to the fastest healthy model of a set, failing over to the next model on errors.
+
+    The models are validated once here, not on every request.
+
+    Parameters:
+        client (OpenRouter): The client that sends the requests. Its `model` is not used.
+        models (Sequence[str]): The candidate models. Defaults to every free model.
+        window (int): The number of recent requests per model used for the statistics. Defaults to 50.
+        max_age (Optional[float]): The seconds a request counts toward the statistics, so failing models recover. Defaults to 600.
+        max_error_rate (float): The error rate above which a model is tried last. Defaults to 0.5.
+        min_samples (int): The requests a model needs before its error rate is trusted. Defaults to 5.
+
+    Example:
+        >>> router = ModelRouter(OpenRouter(model=FreeModel.GEMMA_7B.value, api_key=key), [m.value for m in FreeModel])
+        >>> router.create_chat_completion("Hello")
+        >>> router.stats()
+    """
+
+    def __init__(
+        self,
+        client: OpenRouter,
+        models: Optional[Sequence[str]] = None,
+        window: int = 50,
+        max_age: Optional[float] = 600.0,
+        max_error_rate: float = 0.5,
+        min_samples: int = 5,
+    ) -> None:
+        super().__init__(
+            models or sorted(FREE_MODELS), window, max_age, max_error_rate, min_samples
+        )
+        self.client = client
+
+    def create_chat_completion(
+        self,
+        message: str,
+        site_url: Optional[str] = None,
+        app_name: Optional[str] = None,
+    ) -> str:
+        """
+        Generates a chat completion, trying the models in `ranked()` order until one succeeds.
+
+        Returns:
+            str: The content of the first choice of the generated chat completion.
+
+        Raises:
+            Exception: The error of the last model if every model fails.
+        """
+        error = None
+        for model in self.ranked():
+            started = time.perf_counter()
+            try:
+                result = self.client.create_chat_completion(
+                    message, site_url, app_name, model=model
+                )
+            except Exception as e:
+                self.record(model, time.perf_counter() - started, False)
+                error = e
+                continue
+            self.record(model, time.perf_counter() - started, True)
+            return result
+        raise error
+
+
+class AsyncModelRouter(_RouterBase):
+    """
+    Routes each request to the fastest healthy model with failover and hedging, for `AsyncOpenRouter`.
+
+    If the first model has not answered by the `hedge_percentile` of its recent latencies, the request is also sent to the next model. The first successful answer wins and the other request is cancelled. A failed request immediately starts the next model.
+
+    Parameters:
+        client (AsyncOpenRouter): The client that sends the requests. Its `model` is not used.
+        models (Sequence[str]): The candidate models. Defaults to every free model.
+        window (int): The number of recent requests per model used for the statistics. Defaults to 50.
+        max_age (Optional[float]): The seconds a request counts toward the statistics, so failing models recover. Defaults to 600.
+        max_error_rate (float): The error rate above which a model is tried last. Defaults to 0.5.
+        min_samples (int): The requests a model needs before its error rate and hedge threshold are trusted. Defaults to 5.
+        hedge_percentile (Optional[float]): The latency percentile of the first model after which a hedged request is sent. None disables hedging. Defaults to 95.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenRouter,
+        models: Optional[Sequence[str]] = None,
+        window: int = 50,
+        max_age: Optional[float] = 600.0,
+        max_error_rate: float = 0.5,
+        min_samples: int = 5,
+        hedge_percentile: Optional[float] = 95.0,
+    ) -> None:
+        super().__init__(
+            models or sorted(FREE_MODELS), window, max_age, max_error_rate, min_samples
+        )
+        self.client = client
+        self.hedge_percentile = hedge_percentile
+        self.hedges = 0
+
+    def hedge_delay(self, model: str) -> Optional[float]:
+        """Returns the seconds to wait for a model before hedging, or None if hedging is off or uncalibrated."""
+        latencies = self.health[model].latencies
+        if self.hedge_percentile is None or len(latencies) < self.min_samples:
+            return None
+        return latencies.percentile(self.hedge_percentile)
+
+    async def _attempt(
+        self,
+        model: str,
+        message: str,
+        site_url: Optional[str],
+        app_name: Optional[str],
+    ) -> str:
+        started = time.perf_counter()
+        try:
+            result = await self.client.create_chat_completion(
+                message, site_url, app_name, model=model
+            )
+        except Exception:
+            self.record(model, time.perf_counter() - started, False)
+            raise
+        self.record(model, time.perf_counter() - started, True)
+        return result
+
+    async def create_chat_completion(
+        self,
+        message: str,
+        site_url: Optional[str] = None,
+        app_name: Optional[str] = None,
+    ) -> str:
+        """
+        Generates a chat completion with failover and hedging across the models.
+
+        Returns:
+            str: The content of the first choice of the first successful completion.
+
+        Raises:
+            Exception: The error of the last model if every model fails.
+        """
+        order = self.ranked()
+        remaining = iter(order)
+        running: Dict[asyncio.Task, str] = {}
+        error = None
+
+        def launch() -> None:
+            model = next(remaining, None)
+            if model is not None:
+                task = asyncio.ensure_future(
+                    self._attempt(model, message, site_url, app_name)
+                )
+                running[task] = model
+
+        launch()
+        hedge_delay = self.hedge_delay(order[0]) if len(order) > 1 else None
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running, timeout=hedge_delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self.hedges += 1
+                    hedge_delay = None
+                    launch()
+                    continue
+                for task in done:
+                    del running[task]
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                    launch()
+            raise error
+        finally:
+            for task in running:
+                task.cancel()
@@ -0,0 +1,87 @@
+import codecs
+from typing import List, NamedTuple, Optional, Union
+
+
+class SSEEvent(NamedTuple):
+    """
+    A server-sent event.
+
+    Attributes:
+        event (str): The event type. Defaults to "message".
+        data (str): The event data, with multi-line data joined by newlines.
+        id (Optional[str]): The last event id, if any.
+    """
+
+    event: str = "message"
+    data: str = ""
+    id: Optional[str] = None
+
+
+class SSEParser:
+    """
+    An incremental parser for the text/event-stream format.
+
+    Chunks may split lines, UTF-8 sequences and CRLF pairs at any byte. Comment lines, such as OpenRouter's ": OPENROUTER PROCESSING" keep-alives, are skipped.
+
+    Example:
+        >>> parser = SSEParser()
+        >>> parser.feed(b'data: {"a"')
+        []
+        >>> parser.feed(b": 1}\\n\\n")
+        [SSEEvent(event='message', data='{"a": 1}', id=None)]
+    """
+
+    def __init__(self) -> None:
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._data: List[str] = []
+        self._event = ""
+        self._id: Optional[str] = None
+        self._skip_lf = False
+
+    def feed(self, chunk: Union[bytes, str]) -> List[SSEEvent]:
+        """
+        Parses a chunk of the stream.
+
+        Args:
+            chunk (Union[bytes, str]): The next bytes or text of the stream.
+
+        Returns:
+            List[SSEEvent]: The events completed by this chunk.
+        """
+        if isinstance(chunk, bytes):
+            chunk = self._decoder.decode(chunk)
+        if not chunk:
+            return []
+        if self._skip_lf and chunk.startswith("\n"):
+            chunk = chunk[1:]
+        # A trailing CR ends a line, but may be the first half of a CRLF pair split across chunks.
+        self._skip_lf = chunk.endswith("\r")
+        text = self._buffer + chunk
+        *lines, self._buffer = (
+            text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        )
+
+        events = []
+        for line in lines:
+            if not line:
+                if self._data:
+                    events.append(
+                        SSEEvent(
+                            self._event or "message", "\n".join(self._data), self._id
+                        )
+                    )
+                self._data, self._event = [], ""
+                continue
+            if line.startswith(":"):
+                continue
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+            if field == "data":
+                self._data.append(value)
+            elif field == "event":
+                self._event = value
+            elif field == "id":
+                self._id = value
+        return events
@@ -0,0 +1,139 @@
+import json
+import aiohttp
+from typing import AsyncIterator, Iterator, List, Optional
+from .sse import SSEEvent, SSEParser
+from gemini.src.misc.exceptions import ContentGenerationException
+from gemini.src.misc.transport import TransportResponse
+
+DONE_SENTINEL = "[DONE]"
+
+
+class _CompletionStreamState:
+    """
+    The state shared by the sync and async chat completion streams.
+
+    Attributes:
+        id (Optional[str]): The generation id reported by OpenRouter.
+        model (Optional[str]): The model that served the request.
+        finish_reason (Optional[str]): Why generation stopped, once known.
+        usage (Optional[dict]): The token usage, set when the stream ends.
+        done (bool): Whether the stream has ended.
+    """
+
+    def __init__(self) -> None:
+        self.id: Optional[str] = None
+        self.model: Optional[str] = None
+        self.finish_reason: Optional[str] = None
+        self.usage: Optional[dict] = None
+        self.done = False
+        self._parser = SSEParser()
+        self._deltas: List[str] = []
+
+    @property
+    def text(self) -> str:
+        """The content received so far."""
+        return "".join(self._deltas)
+
+    def _handle(self, event: SSEEvent) -> Optional[str]:
+        if event.data == DONE_SENTINEL:
+            self.done = True
+            return None
+        chunk = json.loads(event.data)
+        if "error" in chunk:
+            self.done = True
+            error = chunk["error"]
+            message = error.get("message", error) if isinstance(error, dict) else error
+            raise ContentGenerationException(f"OpenRouter stream error: {message}")
+        self.id = chunk.get("id", self.id)
+        self.model = chunk.get("model", self.model)
+        if chunk.get("usage"):
+            self.usage = chunk["usage"]
+        delta = None
+        for choice in chunk.get("choices") or []:
+            if choice.get("finish_reason"):
+                self.finish_reason = choice["finish_reason"]
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                delta = content
+                self._deltas.append(content)
+        return delta
+
+
+class ChatCompletionStream(_CompletionStreamState):
+    """
+    Iterates the content deltas of a streamed OpenRouter chat completion.
+
+    Deltas are parsed from the server-sent events as the bytes arrive. After the iteration ends, `usage` holds the token usage and `text` the full content. The response is closed when the iteration ends or `close()` is called; the object is also a context manager.
+
+    Example:
+        >>> for delta in client.create_chat_completion("Hello", stream=True):
+        ...     print(delta, end="")
+    """
+
+    def __init__(self, response: TransportResponse) -> None:
+        super().__init__()
+        self.response = response
+
+    def __iter__(self) -> Iterator[str]:
+        try:
+            for chunk in self.response.iter_content(chunk_size=None):
+                for event in self._parser.feed(chunk):
+                    delta = self._handle(event)
+                    if delta:
+                        yield delta
+                    if self.done:
+                        return
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Closes the response."""
+        self.response.close()
+
+    def __enter__(self) -> "ChatCompletionStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class AsyncChatCompletionStream(_CompletionStreamState):
+    """
+    Asynchronously iterates the content deltas of a streamed OpenRouter chat completion.
+
+    The async counterpart of `ChatCompletionStream`. It is an async context manager.
+
+    Example:
+        >>> stream = await client.create_chat_completion("Hello", stream=True)
+        >>> async for delta in stream:
+        ...     print(delta, end="")
+    """
+
+    def __init__(self, response: aiohttp.ClientResponse) -> None:
+        super().__init__()
+        self.response = response
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        try:
+            async for chunk in self.response.content.iter_any():
+                for event in self._parser.feed(chunk):
+                    delta = self._handle(event)
+                    if delta:
+                        yield delta
+                    if self.done:
+                        return
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the response, returning its connection to the pool if the stream ended."""
+        if self.done:
+            self.response.release()
+        else:
+            self.response.close()
+
+    async def __aenter__(self) -> "AsyncChatCompletionStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
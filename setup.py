@@ -38,7 +38,11 @@ setup(
             "SpeechRecognition",  # Library for performing speech recognition, with support for several engines and APIs, including Google Speech Recognition
             "openai",  # OpenAI for Text-to-Speech and Speech-to-Text
             "anthropic",  # Anthropic for Text-to-Speech and Speech-to-Text
-        ]
+        ],
+        "compression": [
+            "brotli",  # Decodes br responses in requests and httpx
+            "zstandard",  # Decodes zstd responses in requests and httpx
+        ],
     },
     keywords="Python, API, Gemini, Google Gemini, Large Language Model, Chatbot API, Google API, Chatbot",
     classifiers=[
@@ -0,0 +1,70 @@
+import pytest
+
+from gemini import CodeBlock, CodeBlockScanner, extract_code_blocks
+
+TEXT = (
+    "Intro\n"
+    "```python\nprint(1)\n```\n"
+    "between\n"
+    "```\nplain text\n```\n"
+    "```JS\nconsole.log(2)\n\n```"
+    " trailing ``` unclosed"
+)
+
+
+def test_scan_finds_closed_blocks_with_languages():
+    blocks = CodeBlockScanner.scan(TEXT)
+    assert [(block.language, block.code) for block in blocks] == [
+        ("python", "print(1)"),
+        ("", "plain text"),
+        ("js", "console.log(2)"),
+    ]
+
+
+def test_offsets_span_the_fences():
+    for block in CodeBlockScanner.scan(TEXT):
+        fenced = TEXT[block.start : block.end]
+        assert fenced.startswith("```") and fenced.endswith("```")
+        assert block.code in fenced
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 4, 7, 64])
+def test_streamed_chunks_match_a_single_scan(size):
+    scanner = CodeBlockScanner()
+    blocks = []
+    for i in range(0, len(TEXT), size):
+        blocks.extend(scanner.feed(TEXT[i : i + size]))
+    assert blocks == CodeBlockScanner.scan(TEXT)
+
+
+def test_block_is_returned_once_its_closing_fence_arrives():
+    scanner = CodeBlockScanner()
+    assert scanner.feed("```py\nx = 1\n`") == []
+    assert scanner.feed("`") == []
+    assert scanner.feed("`") == [CodeBlock("py", "x = 1", 0, 15)]
+    assert scanner.feed(" more") == []
+
+
+def test_inline_fence_content_is_not_a_language():
+    (block,) = CodeBlockScanner.scan("```print(1) # not a tag\n```")
+    assert block.language == ""
+    assert block.code == "print(1) # not a tag"
+
+
+def test_single_line_block_has_no_language():
+    (block,) = CodeBlockScanner.scan("```ls```")
+    assert (block.language, block.code) == ("", "ls")
+
+
+@pytest.mark.parametrize(
+    "language, filename",
+    [("python", "main.py"), ("py", "main.py"), ("csharp", "main.cs"), ("", None)],
+)
+def test_filename_resolves_aliases(language, filename):
+    assert CodeBlock(language, "", 0, 0).filename == filename
+
+
+def test_extract_code_blocks_handles_empty_text():
+    assert extract_code_blocks("") == []
+    assert extract_code_blocks(None) == []
+    assert extract_code_blocks("no code") == []
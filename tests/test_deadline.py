@@ -0,0 +1,107 @@
+import asyncio
+import pytest
+
+from gemini import Deadline
+from gemini.src.misc import deadline as deadline_module
+from gemini.src.misc.exceptions import TimeoutError
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 50.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(deadline_module, "time", clock)
+    return clock
+
+
+def test_coerce():
+    deadline = Deadline(1)
+    assert Deadline.coerce(None) is None
+    assert Deadline.coerce(deadline) is deadline
+    assert Deadline.coerce(2.5).total == 2.5
+
+
+def test_remaining_counts_down_to_zero(clock):
+    deadline = Deadline(10)
+    clock.now += 4
+    assert deadline.remaining() == 6
+    clock.now += 10
+    assert deadline.remaining() == 0
+
+
+def test_check_raises_once_expired(clock):
+    deadline = Deadline(3)
+    assert deadline.check("upload") == 3
+    clock.now += 3
+    with pytest.raises(TimeoutError, match="3s deadline expired during upload"):
+        deadline.check("upload")
+
+
+def test_requests_timeout_is_bounded_by_the_remaining_budget(clock):
+    deadline = Deadline(10, connect=2, first_byte=5)
+    assert deadline.requests_timeout("nonce") == (2, 5)
+    clock.now += 7
+    assert deadline.requests_timeout("nonce") == (2, 3)
+    clock.now += 2
+    assert deadline.requests_timeout("nonce") == (1, 1)
+
+
+def test_requests_timeout_defaults_to_the_remaining_budget(clock):
+    deadline = Deadline(10)
+    clock.now += 4
+    assert deadline.requests_timeout("nonce") == (6, 6)
+
+
+def test_httpx_timeout(clock):
+    deadline = Deadline(10, connect=2, first_byte=5)
+    clock.now += 6
+    timeout = deadline.httpx_timeout("StreamGenerate")
+    assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (2, 4, 4, 4)
+    clock.now += 4
+    with pytest.raises(TimeoutError):
+        deadline.httpx_timeout("StreamGenerate")
+
+
+def test_run_returns_the_result():
+    async def work():
+        await asyncio.sleep(0)
+        return "done"
+
+    assert asyncio.run(Deadline(5).run(work(), "parse")) == "done"
+
+
+def test_run_cancels_on_expiry():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError, match="during StreamGenerate"):
+        asyncio.run(Deadline(0.05).run(slow(), "StreamGenerate"))
+    assert cancelled == [True]
+
+
+def test_run_closes_the_coroutine_when_already_expired(clock):
+    started = []
+
+    async def work():
+        started.append(True)
+
+    deadline = Deadline(1)
+    clock.now += 1
+    coroutine = work()
+    with pytest.raises(TimeoutError):
+        asyncio.run(deadline.run(coroutine, "upload"))
+    assert started == []
+    assert coroutine.cr_frame is None
@@ -0,0 +1,83 @@
+import threading
+import pytest
+
+from gemini.src.model.parser.chain import ParserChain
+
+
+def fails(*args):
+    raise ValueError("no")
+
+
+def test_first_success_is_promoted():
+    chain = ParserChain([("a", fails), ("b", lambda x: x * 2), ("c", lambda x: x)])
+    assert chain.run(2) == 4
+    assert chain.order == ["b", "a", "c"]
+    assert chain.run(3) == 6
+    stats = chain.stats()
+    assert list(stats) == ["b", "a", "c"]
+    assert stats["b"]["hits"] == 2
+    assert stats["a"]["failures"] == 1
+    assert stats["c"]["attempts"] == 0
+
+
+def test_accept_rejects_results():
+    chain = ParserChain(
+        [("empty", lambda: {}), ("full", lambda: {"x": 1})], accept=bool
+    )
+    assert chain.run() == {"x": 1}
+    assert chain.stats()["empty"]["failures"] == 1
+
+
+def test_all_failing_raises_with_the_last_error():
+    chain = ParserChain([("a", fails)])
+    with pytest.raises(ValueError, match="All parsing strategies failed") as info:
+        chain.run()
+    assert str(info.value.__cause__) == "no"
+
+
+def test_names_restrict_the_run():
+    chain = ParserChain([("a", lambda: "a"), ("b", lambda: "b")])
+    assert chain.run(names=["b"]) == "b"
+    assert chain.stats()["a"]["attempts"] == 0
+
+
+def test_add_replaces_the_callable_but_keeps_position_and_counters():
+    chain = ParserChain([("a", fails), ("b", lambda: "b")])
+    chain.run()
+    chain.add("a", lambda: "new")
+    assert chain.order == ["b", "a"]
+    assert chain.stats()["a"]["failures"] == 1
+    assert chain.run(names=["a"]) == "new"
+
+
+def test_extra_strategies_run_last_and_are_not_kept():
+    chain = ParserChain([("a", fails)])
+    assert chain.run(extra=[("tmp", lambda: "tmp")]) == "tmp"
+    assert chain.order == ["a"]
+    assert chain.run(extra=[("x", fails), ("y", lambda: "y")]) == "y"
+    with pytest.raises(ValueError):
+        chain.run(extra=[("x", fails)])
+
+
+def test_reset_stats():
+    chain = ParserChain([("a", lambda: 1)])
+    chain.run()
+    chain.reset_stats()
+    assert chain.stats()["a"]["attempts"] == 0
+
+
+def test_counters_are_exact_under_threads():
+    chain = ParserChain([("bad", fails), ("good", lambda x: x)])
+
+    def work():
+        for i in range(2000):
+            chain.run(i)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = chain.stats()
+    assert stats["good"]["hits"] == 16000
+    assert stats["bad"]["attempts"] + stats["good"]["attempts"] >= 16000
@@ -0,0 +1,123 @@
+import pytest
+
+from gemini import ProxyPool
+from gemini.src.misc import proxy as proxy_module
+
+A, B, C = "http://a:1", "http://b:1", "http://c:1"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(proxy_module, "time", clock)
+    return clock
+
+
+def account_on(pool, proxy):
+    """Returns an account that rendezvous hashing routes to `proxy`."""
+    return next(f"acc{i}" for i in range(1000) if pool.choose(f"acc{i}") == proxy)
+
+
+def test_requires_a_proxy():
+    with pytest.raises(ValueError):
+        ProxyPool([])
+
+
+def test_duplicates_are_dropped():
+    assert ProxyPool([A, B, A]).proxies == [A, B]
+
+
+def test_accounts_stick_to_a_proxy(clock):
+    pool = ProxyPool([A, B, C])
+    routes = {f"acc{i}": pool.choose(f"acc{i}") for i in range(100)}
+    assert set(routes.values()) == {A, B, C}
+    assert all(pool.choose(account) == p for account, p in routes.items())
+
+
+def test_no_account_picks_the_best_score(clock):
+    pool = ProxyPool([A, B])
+    pool.record(A, 0.5)
+    pool.record(B, 0.1)
+    assert pool.choose() == B
+    assert pool.proxies_for() == {"http": B, "https": B}
+
+
+def test_consecutive_failures_eject_and_only_move_its_accounts(clock, capsys):
+    pool = ProxyPool([A, B, C], max_failures=3)
+    on_a, on_b = account_on(pool, A), account_on(pool, B)
+    for _ in range(3):
+        pool.record(A, 0.1, error=True)
+    assert "Ejected proxy http://a:1 for 30s." in capsys.readouterr().out
+    assert pool.choose(on_a) != A
+    assert pool.choose(on_b) == B
+    assert pool.stats()[A]["ejected_for"] == 30
+
+
+def test_error_rate_ejects_after_min_samples(clock):
+    pool = ProxyPool([A, B], min_samples=4, max_error_rate=0.5, max_failures=10)
+    for error in (True, False, True):
+        pool.record(A, 0.1, error=error)
+    assert pool.stats()[A]["ejections"] == 0
+    pool.record(A, 0.1, error=True)
+    assert pool.stats()[A]["ejections"] == 1
+
+
+def test_readmission_and_doubling_backoff(clock):
+    pool = ProxyPool([A, B], max_failures=1, backoff=10, max_backoff=25)
+    account = account_on(pool, A)
+    expected = [10, 20, 25, 25]
+    for backoff in expected:
+        pool.record(A, 0.1, error=True)
+        assert pool.stats()[A]["ejected_for"] == backoff
+        clock.now += backoff - 1
+        assert pool.choose(account) == B
+        clock.now += 1
+        assert pool.choose(account) == A
+    assert pool.stats()[A]["requests"] == 4
+
+
+def test_readmission_clears_the_window(clock):
+    pool = ProxyPool([A, B], max_failures=2, backoff=5)
+    pool.record(A, 0.1)
+    pool.record(A, 0.1, error=True)
+    pool.record(A, 0.1, error=True)
+    clock.now += 5
+    pool.choose()
+    stats = pool.stats()[A]
+    assert stats["error_rate"] == 0.0 and stats["ejected_for"] == 0
+
+
+def test_successes_reset_the_backoff(clock):
+    pool = ProxyPool([A, B], max_failures=1, min_samples=3, backoff=10)
+    pool.record(A, 0.1, error=True)
+    clock.now += 10
+    pool.choose()
+    for _ in range(3):
+        pool.record(A, 0.1)
+    pool.record(A, 0.1, error=True)
+    assert pool.stats()[A]["ejected_for"] == 10
+
+
+def test_records_of_an_ejected_proxy_are_ignored(clock):
+    pool = ProxyPool([A, B], max_failures=1)
+    pool.record(A, 0.1, error=True)
+    pool.record(A, 0.1)
+    pool.record("http://unknown:1", 0.1)
+    assert pool.stats()[A]["requests"] == 1
+
+
+def test_all_ejected_uses_the_one_readmitted_first(clock):
+    pool = ProxyPool([A, B], max_failures=1, backoff=10)
+    pool.record(B, 0.1, error=True)
+    clock.now += 5
+    pool.record(A, 0.1, error=True)
+    assert pool.choose() == B
+    assert pool.choose("any") == B
@@ -0,0 +1,143 @@
+import json
+import pytest
+
+from gemini.src.misc.exceptions import ContentGenerationException
+from gemini.src.misc.transport import TransportResponse
+from gemini.src.modules.openrouter import ChatCompletionStream, SSEEvent, SSEParser
+
+
+def feed_all(chunks):
+    parser = SSEParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+
+def split_every(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_single_event():
+    assert feed_all([b"data: hello\n\n"]) == [SSEEvent(data="hello")]
+
+
+def test_event_is_emitted_only_once_complete():
+    parser = SSEParser()
+    assert parser.feed(b'data: {"a"') == []
+    assert parser.feed(b": 1}\n") == []
+    assert parser.feed(b"\n") == [SSEEvent(data='{"a": 1}')]
+
+
+@pytest.mark.parametrize("newline", [b"\n", b"\r\n", b"\r"])
+def test_line_endings(newline):
+    stream = b"data: a" + newline + b"data: b" + newline + newline
+    assert feed_all([stream]) == [SSEEvent(data="a\nb")]
+
+
+def test_crlf_split_between_chunks():
+    events = feed_all([b"data: a\r", b"\ndata: b\r", b"\n\r", b"\n"])
+    assert events == [SSEEvent(data="a\nb")]
+
+
+def test_lone_cr_at_chunk_end_is_a_line_break():
+    events = feed_all([b"data: a\r", b"\r"])
+    assert events == [SSEEvent(data="a")]
+
+
+def test_utf8_split_mid_sequence():
+    stream = "data: Ünïcode ✓ 日本\n\n".encode()
+    for size in range(1, 8):
+        assert feed_all(split_every(stream, size)) == [
+            SSEEvent(data="Ünïcode ✓ 日本")
+        ], size
+
+
+def test_comment_lines_are_skipped():
+    stream = b": OPENROUTER PROCESSING\n\n: keep-alive\ndata: x\n\n"
+    assert feed_all([stream]) == [SSEEvent(data="x")]
+
+
+def test_event_type_and_id():
+    stream = b"event: update\nid: 7\ndata: x\n\ndata: y\n\n"
+    assert feed_all([stream]) == [
+        SSEEvent(event="update", data="x", id="7"),
+        SSEEvent(event="message", data="y", id="7"),
+    ]
+
+
+def test_value_without_space_and_unknown_fields():
+    assert feed_all([b"data:x\nretry: 100\nfoo\n\n"]) == [SSEEvent(data="x")]
+
+
+def test_blank_lines_without_data_emit_nothing():
+    assert feed_all([b"\n\n\nevent: ping\n\n"]) == []
+
+
+def test_accepts_text_chunks():
+    assert feed_all(["data: a", "\n\n"]) == [SSEEvent(data="a")]
+
+
+class FakeResponse(TransportResponse):
+    def __init__(self, chunks):
+        super().__init__(None)
+        self.chunks = chunks
+        self.closed = False
+
+    @property
+    def content(self) -> bytes:
+        return b"".join(self.chunks)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode()
+
+    def json(self):
+        return json.loads(self.text)
+
+    def iter_content(self, chunk_size=None):
+        return iter(self.chunks)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def sse(payload) -> bytes:
+    data = payload if isinstance(payload, str) else json.dumps(payload)
+    return f"data: {data}\n\n".encode()
+
+
+def chunk(content=None, finish_reason=None, **extra):
+    choice = {"delta": {"content": content} if content else {}}
+    if finish_reason:
+        choice["finish_reason"] = finish_reason
+    return {"id": "gen-1", "model": "m", "choices": [choice], **extra}
+
+
+def test_completion_stream_yields_deltas_split_across_chunks():
+    body = b"".join(
+        [
+            b": OPENROUTER PROCESSING\n\n",
+            sse(chunk("Hel")),
+            sse(chunk("lo")),
+            sse(chunk(finish_reason="stop", usage={"total_tokens": 3})),
+            sse("[DONE]"),
+            sse(chunk("ignored")),
+        ]
+    )
+    response = FakeResponse(split_every(body, 5))
+    stream = ChatCompletionStream(response)
+    assert list(stream) == ["Hel", "lo"]
+    assert stream.text == "Hello"
+    assert stream.id == "gen-1" and stream.model == "m"
+    assert stream.finish_reason == "stop"
+    assert stream.usage == {"total_tokens": 3}
+    assert stream.done and response.closed
+
+
+def test_completion_stream_raises_stream_errors():
+    response = FakeResponse([sse(chunk("a")), sse({"error": {"message": "boom"}})])
+    stream = ChatCompletionStream(response)
+    with pytest.raises(ContentGenerationException, match="boom"):
+        list(stream)
+    assert response.closed
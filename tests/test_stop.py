@@ -0,0 +1,82 @@
+import re
+import pytest
+
+from gemini import MaxSentences, MaxWords, StopCondition, StopPattern, StopWhen
+
+
+def run(condition, deltas):
+    """Feeds the growing text like a stream and returns the truncated text, or None."""
+    text = ""
+    for delta in deltas:
+        text += delta
+        index = condition.feed(text)
+        if index is not None:
+            return text[:index]
+    return None
+
+
+def test_max_words_keeps_original_spacing():
+    assert run(MaxWords(3), ["one  two\tthree four"]) == "one  two\tthree"
+
+
+def test_max_words_waits_for_a_word_to_end():
+    condition = MaxWords(2)
+    assert condition.feed("one tw") is None
+    assert condition.feed("one two") is None
+    assert condition.feed("one two ") == len("one two")
+
+
+def test_max_words_counts_words_split_across_deltas():
+    assert run(MaxWords(2), ["al", "pha be", "ta gam", "ma"]) == "alpha beta"
+
+
+def test_max_words_not_reached():
+    assert run(MaxWords(5), ["a b c"]) is None
+
+
+def test_max_sentences():
+    deltas = ["Pi is 3.", "14. It is ", "irrational! Really? Yes."]
+    assert run(MaxSentences(2), deltas) == "Pi is 3.14. It is irrational!"
+
+
+def test_max_sentences_needs_whitespace_after_the_end():
+    condition = MaxSentences(1)
+    assert condition.feed("Done.") is None
+    assert condition.feed("Done...") is None
+    assert condition.feed("Done... ") == len("Done...")
+
+
+def test_stop_pattern_cuts_before_the_match():
+    assert run(StopPattern(r"\n\n"), ["para one\n", "\npara two"]) == "para one"
+
+
+def test_stop_pattern_finds_matches_spanning_deltas():
+    assert run(StopPattern("STOP"), ["go ST", "O", "P now"]) == "go "
+
+
+def test_stop_pattern_lookbehind_bounds_the_rescan():
+    condition = StopPattern("ab", lookbehind=1)
+    assert condition.feed("xxa") is None
+    assert condition.feed("xxab") == 2
+
+
+def test_stop_when_keeps_all_text():
+    assert run(StopWhen(lambda text: text.count("!") >= 2), ["a!", "b", "c!d"]) == (
+        "a!bc!d"
+    )
+
+
+def test_coerce():
+    condition = MaxWords(1)
+    assert StopCondition.coerce(None) is None
+    assert StopCondition.coerce(condition) is condition
+    assert isinstance(StopCondition.coerce("x+"), StopPattern)
+    assert isinstance(StopCondition.coerce(re.compile("x")), StopPattern)
+    assert isinstance(StopCondition.coerce(len), StopWhen)
+    with pytest.raises(TypeError):
+        StopCondition.coerce(3)
+
+
+def test_stop_condition_is_abstract():
+    with pytest.raises(TypeError):
+        StopCondition()